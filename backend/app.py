@@ -1,4 +1,7 @@
+import asyncio
 import sys
+import time
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
 import chainlit as cl
@@ -6,12 +9,14 @@ import chainlit as cl
 from models.chatgpt_clone import ChatAssistant
 from models.jobs_finder import JobsFinderAssistant
 from models.jobs_finder_agent import JobsFinderAgent
+from models.resume_summarizer_chain import resume_summarizer_version
 
 # Needed for the import of config
 sys.path.append(str(Path(__file__).parent.parent))
 
 from config import settings  # noqa: E402
-from utils import extract_text_from_pdf  # noqa: E402
+from resume_cache import file_hash, get_resume_cache, resume_version  # noqa: E402
+from utils import aextract_text_from_pdf  # noqa: E402
 
 
 @cl.set_chat_profiles
@@ -57,20 +62,75 @@ async def on_chat_start():
 
         if files:
             file = files[0]
-            resume = extract_text_from_pdf(open(file.path, "rb"))
+            # The text and summary of a resume uploaded before are served
+            # by the resume cache
+            resume_cache = get_resume_cache()
+            cached = None
+            if resume_cache is not None:
+                pdf_hash = await asyncio.to_thread(file_hash, file.path)
+                version = resume_version(resume_summarizer_version())
+                cached = await asyncio.to_thread(resume_cache.get, pdf_hash, version)
 
+            if cached is not None:
+                resume, resume_summary = cached
+            else:
+                resume_summary = None
+                # Extracted by the PDF worker processes, off the event loop
+                try:
+                    resume = await aextract_text_from_pdf(file.path)
+                except asyncio.TimeoutError:
+                    await cl.Message(
+                        content="Reading your resume took too long, please upload a smaller PDF."
+                    ).send()
+                    return
+                except BrokenProcessPool:
+                    # The PDF workers were replaced twice meanwhile, because
+                    # of other uploads that took too long
+                    await cl.Message(
+                        content="Reading your resume failed, please upload it again."
+                    ).send()
+                    return
+
+            # Built on a worker thread: loading the retriever (vector store,
+            # embeddings, lexical index) would otherwise block other sessions
             if chat_profile == "Jobs finder Assistant":
-                model = JobsFinderAssistant(
+                model = await asyncio.to_thread(
+                    JobsFinderAssistant,
                     resume=resume,
                     llm_model=llm_model,
                     api_key=api_key,
+                    resume_summary=resume_summary,
                 )
+                job_finder = model
             else:
-                model = JobsFinderAgent(
+                model = await asyncio.to_thread(
+                    JobsFinderAgent,
                     resume=resume,
                     llm_model=llm_model,
                     api_key=api_key,
+                    resume_summary=resume_summary,
                 )
+                job_finder = model.job_finder
+
+            # The resume is summarized in the background: cache it once done.
+            # The callback may run on the event loop, so the SQLite write is
+            # handed to the loop's default executor, like the lookup
+            if resume_cache is not None and cached is None:
+                loop = asyncio.get_running_loop()
+
+                def cache_resume(summary_future):
+                    if summary_future.exception() is None:
+                        loop.call_soon_threadsafe(
+                            loop.run_in_executor,
+                            None,
+                            resume_cache.put,
+                            pdf_hash,
+                            version,
+                            resume,
+                            summary_future.result(),
+                        )
+
+                job_finder.resume_summary_future.add_done_callback(cache_resume)
 
             cl.user_session.set("model", model)
             await cl.Message(content="Now, what kind of jobs are you looking for?").send()
@@ -83,12 +143,20 @@ async def main(message: cl.Message):
         await cl.Message(content="Please select an assistant first!").send()
         return
 
-    result = model.predict(message.content)
-    
-    # Handle different return types from different models
-    if isinstance(result, dict):
-        # JobsFinderAssistant and JobsFinderAgent return dicts
-        result = result.get("output") or result.get("text", str(result))
-    # ChatAssistant returns a string directly
-    
-    await cl.Message(content=result).send()
\ No newline at end of file
+    # Forward the tokens as they arrive, awaited so other sessions are
+    # served while the LLM answers
+    response = cl.Message(content="")
+    start = time.perf_counter()
+    first_token_seconds = None
+    async for token in model.astream(message.content):
+        if first_token_seconds is None:
+            first_token_seconds = time.perf_counter() - start
+        await response.stream_token(token)
+    await response.send()
+
+    # Time to first token, the latency the user perceives
+    if first_token_seconds is not None:
+        print(
+            f"{type(model).__name__}: first token after {first_token_seconds:.2f}s, "
+            f"answer after {time.perf_counter() - start:.2f}s"
+        )
\ No newline at end of file
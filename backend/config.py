@@ -29,6 +29,59 @@ class Settings(BaseSettings):
     CHROMA_DB_PATH: Optional[str] = f"{root}/chroma"
     CHROMA_COLLECTION: Optional[str] = "jobs"
     EMBEDDINGS_MODEL: Optional[str] = "paraphrase-MiniLM-L6-v2"
+    # Persistent embedding cache shared by the ETL and the retriever,
+    # disabled unless a path is set
+    EMBEDDING_CACHE_PATH: Optional[str] = None
+    EMBEDDING_CACHE_MAX_MB: int = 1024
+    # Columnar snapshot of the cleaned dataset written by the ETL and read
+    # by later runs and the job lookups, disabled unless a path is set
+    JOBS_SNAPSHOT_PATH: Optional[str] = None
+    # In-memory LRU cache of query embeddings in the retriever; entries
+    # never expire unless a TTL is set
+    QUERY_CACHE_SIZE: int = 1024
+    QUERY_CACHE_TTL_SECONDS: Optional[float] = None
+    # Chunks fetched per wanted job by job-level search, before grouping
+    # the chunks of each posting
+    JOB_SEARCH_FETCH_FACTOR: int = 5
+    # Candidates taken from each of the lexical and vector passes of hybrid
+    # search, and the weight of the lexical ranking when fusing them
+    HYBRID_CANDIDATES: int = 50
+    HYBRID_LEXICAL_WEIGHT: float = 0.5
+    # Whether the ETL builds the BM25 index of hybrid search, and the
+    # chunks whose postings it keeps in memory before spilling them to disk
+    LEXICAL_INDEX_ENABLED: bool = True
+    LEXICAL_INDEX_SEGMENT_CHUNKS: int = 20000
+    # Vector store searched by the retriever: the Chroma collection, or an
+    # in-memory NumPy copy of it exported by the ETL
+    VECTOR_BACKEND: Literal["chroma", "numpy"] = "chroma"
+    NUMPY_STORE_DTYPE: Literal["float32", "float16"] = "float32"
+    NUMPY_STORE_MMAP: bool = True
+    # Quantized copy of the NumPy store embeddings searched in memory
+    # ("none", "int8" or "pq"), and the chunks re-scored in full precision
+    NUMPY_STORE_QUANTIZATION: Literal["none", "int8", "pq"] = "none"
+    NUMPY_STORE_PQ_SUBVECTORS: int = 48
+    NUMPY_STORE_SHORTLIST: int = 100
+    # Threads running the async searches of every session, and the time a
+    # search may take (queueing included) before it is abandoned
+    SEARCH_WORKERS: int = 4
+    SEARCH_TIMEOUT_SECONDS: Optional[float] = 10
+    # Share of the resume summary embedding, against the question
+    # embedding, in the vector searched by the jobs assistant
+    RESUME_EMBEDDING_WEIGHT: float = 0.5
+    # Threads summarizing and embedding the resumes in the background,
+    # while the sessions start
+    RESUME_SUMMARY_WORKERS: int = 8
+    # Processes extracting the text of uploaded PDFs, pages per parallel
+    # extraction task, and limits of an extraction
+    PDF_WORKERS: int = 2
+    PDF_PAGES_PER_TASK: int = 8
+    PDF_MAX_PAGES: Optional[int] = 50
+    PDF_MAX_CHARS: Optional[int] = 100_000
+    PDF_TIMEOUT_SECONDS: Optional[float] = 30
+    # Persistent cache of the text and summary of uploaded resumes, keyed
+    # by PDF content, disabled unless a path is set
+    RESUME_CACHE_PATH: Optional[str] = None
+    RESUME_CACHE_MAX_ENTRIES: int = 10000
 
     # Email settings
     SENDER_EMAIL_ADDRESS: Optional[str] = ""
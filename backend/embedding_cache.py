@@ -0,0 +1,250 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# SQLite limits the number of parameters of a single statement
+_MAX_SQL_PARAMS = 500
+
+
+def normalize_text(text: str) -> str:
+    """Collapses whitespace so cosmetic differences share a cache entry."""
+    return " ".join(text.split())
+
+
+def text_hash(text: str) -> str:
+    """Hash of the normalised text, used as cache key."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Persistent store of embeddings in a SQLite file, keyed by model name and
+    normalised text hash. When the stored vectors exceed `max_bytes`, the
+    least recently used entries are evicted.
+
+    The file can be shared by several threads and processes, e.g. the ETL
+    embedding workers and the application.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        """
+        Opens (and creates if needed) the cache file.
+
+        Parameters
+        ----------
+        path : str
+            Path to the SQLite file, e.g. "cache/embeddings.sqlite".
+
+        max_bytes : int
+            Maximum total size of the stored vectors, in bytes.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_access "
+            "ON embeddings (last_access)"
+        )
+        self._approx_bytes = self._size_bytes()
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Looks up the embeddings of several texts.
+
+        Parameters
+        ----------
+        model : str
+            Name of the embedding model.
+
+        texts : List[str]
+            Texts to look up.
+
+        Returns
+        -------
+        List[Optional[List[float]]]
+            One embedding per text, or None where it is not cached.
+        """
+        hashes = [text_hash(text) for text in texts]
+        found = {}
+        with self._lock:
+            for i in range(0, len(hashes), _MAX_SQL_PARAMS):
+                block = hashes[i: i + _MAX_SQL_PARAMS]
+                placeholders = ",".join("?" * len(block))
+                rows = self._connection.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *block],
+                ).fetchall()
+                found.update(rows)
+                if rows:
+                    self._connection.execute(
+                        f"UPDATE embeddings SET last_access = ? "
+                        f"WHERE model = ? AND text_hash IN "
+                        f"({','.join('?' * len(rows))})",
+                        [time.time(), model, *(key for key, _ in rows)],
+                    )
+        return [
+            np.frombuffer(found[key], dtype=np.float32).tolist()
+            if key in found
+            else None
+            for key in hashes
+        ]
+
+    def put_many(
+        self, model: str, texts: List[str], embeddings: List[List[float]]
+    ) -> None:
+        """
+        Stores the embeddings of several texts, then evicts the least
+        recently used entries if the cache grew beyond `max_bytes`.
+
+        Parameters
+        ----------
+        model : str
+            Name of the embedding model.
+
+        texts : List[str]
+            Embedded texts.
+
+        embeddings : List[List[float]]
+            One embedding per text.
+        """
+        now = time.time()
+        rows = [
+            (
+                model,
+                text_hash(text),
+                np.asarray(embedding, dtype=np.float32).tobytes(),
+                now,
+            )
+            for text, embedding in zip(texts, embeddings)
+        ]
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)", rows
+            )
+            self._approx_bytes += sum(len(row[2]) for row in rows)
+            self._evict()
+
+    def size_bytes(self) -> int:
+        """Total size of the stored vectors, in bytes."""
+        with self._lock:
+            return self._size_bytes()
+
+    def _size_bytes(self) -> int:
+        (size,) = self._connection.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()
+        return size
+
+    def _evict(self) -> None:
+        # The running estimate avoids summing the table on every insert; it
+        # is corrected whenever it crosses the limit
+        if self._approx_bytes <= self.max_bytes:
+            return
+        excess = self._size_bytes() - self.max_bytes
+        if excess > 0:
+            # Free an extra 10% so eviction doesn't run on every insert
+            self._connection.execute(
+                """
+                DELETE FROM embeddings WHERE rowid IN (
+                    SELECT rowid FROM (
+                        SELECT rowid, LENGTH(vector) AS size, SUM(LENGTH(vector))
+                            OVER (ORDER BY last_access, rowid) AS freed
+                        FROM embeddings
+                    ) WHERE freed - size < ?
+                )
+                """,
+                (excess + self.max_bytes // 10,),
+            )
+        self._approx_bytes = self._size_bytes()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves document and query embeddings from an
+    `EmbeddingCache`, only calling the wrapped model for cache misses.
+    """
+
+    def __init__(
+        self, embeddings: Embeddings, cache: EmbeddingCache, model_name: str
+    ):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_name = model_name
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.cache.get_many(self.model_name, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            computed = self.embeddings.embed_documents(missing_texts)
+            self.cache.put_many(self.model_name, missing_texts, computed)
+            for i, vector in zip(missing, computed):
+                vectors[i] = list(vector)
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        (vector,) = self.cache.get_many(self.model_name, [text])
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self.cache.put_many(self.model_name, [text], [vector])
+        return vector
+
+
+def with_embedding_cache(
+    embeddings: Embeddings,
+    model_name: str,
+    cache_path: Optional[str],
+    max_mb: int,
+) -> Embeddings:
+    """
+    Puts a persistent `EmbeddingCache` in front of an embedding model.
+
+    Parameters
+    ----------
+    embeddings : Embeddings
+        The embedding model, e.g. a SentenceTransformerEmbeddings instance.
+
+    model_name : str
+        Name of the embedding model, part of the cache key.
+
+    cache_path : str, optional
+        Path to the SQLite cache file. If None, `embeddings` is returned
+        unchanged.
+
+    max_mb : int
+        Maximum size of the cached vectors, in megabytes.
+
+    Returns
+    -------
+    Embeddings
+        `embeddings`, wrapped in a CachedEmbeddings if a cache path is set.
+    """
+    if not cache_path:
+        return embeddings
+    cache = EmbeddingCache(cache_path, max_bytes=max_mb * 1024 * 1024)
+    return CachedEmbeddings(embeddings, cache, model_name)
@@ -1,15 +1,321 @@
-from typing import List, Optional
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import pandas as pd
+import pyarrow as pa
 from langchain.docstore.document import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.embeddings.sentence_transformer import (
     SentenceTransformerEmbeddings,
 )
 from langchain_community.vectorstores.chroma import Chroma
+from langchain_core.embeddings import Embeddings
 from tqdm import tqdm
 
 from backend.config import settings
+from backend.embedding_cache import with_embedding_cache
+from backend.job_store import (
+    SnapshotWriter,
+    open_snapshot,
+    snapshot_fingerprint,
+    snapshot_frame,
+)
+from backend.lexical_index import LEXICAL_INDEX_DIR, LexicalIndexBuilder
+from backend.metadata_index import METADATA_INDEX_FILE, MetadataIndex
+from backend.numpy_store import NUMPY_STORE_DIR, export_collection
+
+# Documents sent to a splitting worker at once
+SPLIT_SHARD_SIZE = 64
+
+# Bytes hashed at each end of the dataset to fingerprint it
+FINGERPRINT_BLOCK_SIZE = 1024 * 1024
+
+JOB_COLUMNS = [
+    "description",
+    "Employment type",
+    "Seniority level",
+    "company",
+    "location",
+    "post_url",
+    "title",
+]
+
+# Document metadata field -> dataset column
+METADATA_COLUMNS = {
+    "employment_type": "Employment type",
+    "seniority_level": "Seniority level",
+    "company": "company",
+    "location": "location",
+    "post_url": "post_url",
+    "title": "title",
+}
+
+
+def job_hash(row: Dict[str, str]) -> str:
+    """
+    Computes a content hash for a job posting.
+
+    Parameters
+    ----------
+    row : Dict[str, str]
+        Job posting with (at least) the columns in `JOB_COLUMNS`.
+
+    Returns
+    -------
+    str
+        Hex digest that only changes when the job content changes.
+    """
+    content = "\x1f".join(str(row[column]) for column in JOB_COLUMNS)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def job_hashes(descriptions: pd.DataFrame) -> List[str]:
+    """
+    Computes `job_hash` for every row of a DataFrame, joining the columns
+    as whole Series instead of row by row.
+
+    Parameters
+    ----------
+    descriptions : pd.DataFrame
+        Job postings with (at least) the columns in `JOB_COLUMNS`.
+
+    Returns
+    -------
+    List[str]
+        One hex digest per row, equal to `job_hash` of that row.
+    """
+    first, *others = (descriptions[column].astype(str) for column in JOB_COLUMNS)
+    contents = first.str.cat(others, sep="\x1f")
+    return [
+        hashlib.sha1(content.encode("utf-8")).hexdigest() for content in contents
+    ]
+
+
+def chunk_id(document: Document) -> str:
+    """
+    Builds a deterministic ID for a split document.
+
+    The ID combines the hash of the job it comes from with the chunk
+    offset added by the text splitter (`add_start_index=True`), so running
+    the ETL twice over the same data produces the same IDs.
+
+    Parameters
+    ----------
+    document : Document
+        Split document, as returned by `ETLProcessor.split_documents`.
+
+    Returns
+    -------
+    str
+        Chunk ID, e.g. "<job_hash>-<start_index>".
+    """
+    metadata = document.metadata
+    return f"{metadata['job_hash']}-{metadata.get('start_index', 0)}"
+
+
+def file_fingerprint(path: str) -> Dict[str, object]:
+    """
+    Fingerprints a file cheaply enough to run on multi-GB datasets: its
+    size, modification time and a hash of its first and last megabyte.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file.
+
+    Returns
+    -------
+    Dict[str, object]
+        JSON-serialisable fingerprint; two fingerprints compare equal when
+        the file is (very likely) unchanged.
+    """
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        digest.update(f.read(FINGERPRINT_BLOCK_SIZE))
+        if stat.st_size > FINGERPRINT_BLOCK_SIZE:
+            f.seek(max(FINGERPRINT_BLOCK_SIZE, stat.st_size - FINGERPRINT_BLOCK_SIZE))
+            digest.update(f.read())
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest.hexdigest(),
+    }
+
+
+class StageTimer:
+    """
+    Accumulates how many documents a pipeline stage processed and how long
+    it was busy doing so.
+    """
+
+    def __init__(self, name: str, workers: int = 1):
+        self.name = name
+        self.workers = workers
+        self.docs = 0
+        self.seconds = 0.0
+
+    def add(self, docs: int, seconds: float) -> None:
+        self.docs += docs
+        self.seconds += seconds
+
+    def timed(self, batches: Iterable[List[Document]]) -> Iterator[List[Document]]:
+        """Yields from `batches`, counting the time spent producing them."""
+        batches = iter(batches)
+        while True:
+            start = time.perf_counter()
+            batch = next(batches, None)
+            self.add(len(batch) if batch else 0, time.perf_counter() - start)
+            if batch is None:
+                return
+            yield batch
+
+    @property
+    def docs_per_second(self) -> float:
+        # Busy time is summed over workers, so scale it back to wall-clock
+        return self.docs * self.workers / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.docs} docs, {self.docs_per_second:.1f} docs/sec "
+            f"({self.seconds:.1f}s busy, {self.workers} worker(s))"
+        )
+
+
+def print_stage_stats(stages: List[StageTimer], elapsed: float) -> None:
+    """Prints the throughput of each pipeline stage and of the whole run."""
+    for stage in stages:
+        print(stage)
+    docs = stages[-1].docs
+    print(
+        f"total: {docs} docs in {elapsed:.1f}s "
+        f"({docs / elapsed if elapsed else 0.0:.1f} docs/sec)"
+    )
+
+
+class VectorStoreWriter:
+    """
+    Buffers embedded documents and upserts them into a Chroma collection in
+    bulk writes of `write_batch_size` documents.
+    """
+
+    def __init__(
+        self,
+        vector_store: Chroma,
+        write_batch_size: int,
+        timer: Optional[StageTimer] = None,
+    ):
+        get_max_batch_size = getattr(vector_store._client, "get_max_batch_size", None)
+        if get_max_batch_size is not None:
+            write_batch_size = min(write_batch_size, get_max_batch_size())
+        self.vector_store = vector_store
+        self.write_batch_size = write_batch_size
+        self.timer = timer or StageTimer("write")
+        self._buffer: Dict[str, Tuple[Document, List[float]]] = {}
+
+    def add(self, batch: List[Document], embeddings: List[List[float]]) -> None:
+        """Buffers a batch, writing out every full `write_batch_size` block."""
+        for doc, embedding in zip(batch, embeddings):
+            # Identical job rows yield identical chunk IDs, which Chroma
+            # rejects within a single write
+            self._buffer[chunk_id(doc)] = (doc, embedding)
+        if len(self._buffer) >= self.write_batch_size:
+            items = list(self._buffer.items())
+            full = len(items) - len(items) % self.write_batch_size
+            self._write(items[:full])
+            self._buffer = dict(items[full:])
+
+    def flush(self) -> None:
+        """Writes out every buffered document."""
+        self._write(list(self._buffer.items()))
+        self._buffer = {}
+
+    def _write(self, items: List[Tuple[str, Tuple[Document, List[float]]]]) -> None:
+        start = time.perf_counter()
+        for i in range(0, len(items), self.write_batch_size):
+            block = items[i: i + self.write_batch_size]
+            self.vector_store._collection.upsert(
+                ids=[doc_id for doc_id, _ in block],
+                embeddings=[embedding for _, (_, embedding) in block],
+                metadatas=[doc.metadata for _, (doc, _) in block],
+                documents=[doc.page_content for _, (doc, _) in block],
+            )
+        self.timer.add(len(items), time.perf_counter() - start)
+
+
+def ordered_map(
+    executor: Executor, fn: Callable, items: Iterable, max_pending: int
+) -> Iterator[Tuple[Any, Any]]:
+    """
+    Applies `fn` to `items` on an executor, yielding `(item, fn(item))` in
+    input order while keeping at most `max_pending` items in flight, so a
+    lazy `items` iterator is never materialised.
+    """
+    pending = deque()
+    for item in items:
+        pending.append((item, executor.submit(fn, item)))
+        if len(pending) >= max_pending:
+            item, future = pending.popleft()
+            yield item, future.result()
+    while pending:
+        item, future = pending.popleft()
+        yield item, future.result()
+
+
+# Models of the current worker process, see `_init_embedding_worker` and
+# `_init_split_worker`
+_worker_embedding = None
+_worker_text_splitter = None
+
+
+def _init_embedding_worker(
+    model_name: str, num_threads: int, cache_path: Optional[str]
+) -> None:
+    """Loads the embedding model once per embedding worker process."""
+    global _worker_embedding
+    import torch
+
+    torch.set_num_threads(num_threads)
+    _worker_embedding = with_embedding_cache(
+        SentenceTransformerEmbeddings(model_name=model_name),
+        model_name,
+        cache_path,
+        settings.EMBEDDING_CACHE_MAX_MB,
+    )
+
+
+def _embed_documents(documents: List[Document]) -> Tuple[List[List[float]], float]:
+    """Embeds documents in a worker process, returning vectors and time spent."""
+    start = time.perf_counter()
+    embeddings = _worker_embedding.embed_documents(
+        [doc.page_content for doc in documents]
+    )
+    return embeddings, time.perf_counter() - start
+
+
+def _init_split_worker(chunk_size: int, chunk_overlap: int) -> None:
+    """Creates the text splitter once per splitting worker process."""
+    global _worker_text_splitter
+    _worker_text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        add_start_index=True,
+    )
+
+
+def _split_documents(documents: List[Document]) -> List[Document]:
+    """Splits a shard of documents in a worker process."""
+    return _worker_text_splitter.split_documents(documents)
 
 
 class ETLProcessor:
@@ -27,6 +333,19 @@ class ETLProcessor:
         embedding_model: Optional[str] = settings.EMBEDDINGS_MODEL,
         collection_name: Optional[str] = settings.CHROMA_COLLECTION,
         persist_directory: Optional[str] = settings.CHROMA_DB_PATH,
+        incremental: bool = False,
+        read_chunksize: Optional[int] = None,
+        split_workers: int = 1,
+        embedding_workers: int = 1,
+        write_batch_size: int = 1000,
+        embedding_cache_path: Optional[str] = settings.EMBEDDING_CACHE_PATH,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = 100,
+        snapshot_path: Optional[str] = settings.JOBS_SNAPSHOT_PATH,
+        vector_backend: str = settings.VECTOR_BACKEND,
+        numpy_store_dtype: str = settings.NUMPY_STORE_DTYPE,
+        numpy_store_quantization: str = settings.NUMPY_STORE_QUANTIZATION,
+        lexical_index: bool = settings.LEXICAL_INDEX_ENABLED,
     ):
         """
         Initializes the ETLProcessor object with a specified batch_size.
@@ -54,15 +373,100 @@ class ETLProcessor:
 
         persist_directory : str, optional
             Directory to persist the vector store.
+
+        incremental : bool, optional
+            If True, only chunks that are not already in the collection are
+            embedded, and chunks of jobs no longer in the dataset are
+            deleted. Default is False.
+
+        read_chunksize : int, optional
+            If set, the dataset is streamed in chunks of this many rows,
+            e.g. 10000, and documents flow through splitting and embedding
+            batches lazily, so memory stays flat whatever the dataset size.
+            Default is None (load the whole dataset at once).
+
+        split_workers : int, optional
+            Number of processes splitting documents in parallel. Splits are
+            streamed back in the original order. Default is 1 (split in the
+            current process).
+
+        embedding_workers : int, optional
+            Number of processes embedding batches in parallel, e.g. the
+            number of CPU cores. With more than one worker, a separate
+            writer thread stores batch N while batch N+1 is being embedded.
+            Default is 1 (embed and store sequentially).
+
+        write_batch_size : int, optional
+            Number of embedded documents written to the vector store at
+            once, independent of `batch_size`. Capped to the maximum batch
+            size supported by the Chroma client. Default is 1000.
+
+        embedding_cache_path : str, optional
+            Path to a persistent embedding cache (SQLite file). Chunks whose
+            text was already embedded with the same model, in this or any
+            earlier run, are not encoded again. Default is
+            `settings.EMBEDDING_CACHE_PATH` (None disables the cache).
+
+        checkpoint_path : str, optional
+            Path to a JSON manifest recording the last committed batch,
+            the dataset fingerprint and the splitter and model config, so
+            an interrupted run can be resumed with `run_etl(resume=True)`.
+            Default is None (no checkpoints).
+
+        checkpoint_every : int, optional
+            Number of batches between checkpoints. At each checkpoint the
+            buffered documents are flushed to the vector store before the
+            manifest is updated. Default is 100.
+
+        snapshot_path : str, optional
+            Path to a columnar (Arrow IPC) snapshot of the cleaned dataset.
+            It is written while the csv is parsed, and read instead of the
+            csv (memory-mapped) as long as the csv is unchanged. Default is
+            `settings.JOBS_SNAPSHOT_PATH` (None disables the snapshot).
+
+        vector_backend : str, optional
+            Backend the retriever searches. With "numpy", the collection is
+            also exported to a NumPy store at the end of the run. Default
+            is `settings.VECTOR_BACKEND`.
+
+        numpy_store_dtype : str, optional
+            Storage type of the exported embeddings, "float32" or
+            "float16". Default is `settings.NUMPY_STORE_DTYPE`.
+
+        numpy_store_quantization : str, optional
+            Quantized copy of the exported embeddings, "none", "int8" or
+            "pq". Default is `settings.NUMPY_STORE_QUANTIZATION`.
+
+        lexical_index : bool, optional
+            Whether to build the BM25 index of the retriever's hybrid
+            search. Its postings are spilled to disk every
+            `settings.LEXICAL_INDEX_SEGMENT_CHUNKS` chunks, so memory stays
+            flat. Default is `settings.LEXICAL_INDEX_ENABLED`.
         """
         self.dataset_path = dataset_path
         self.batch_size = batch_size
-        self.embedding = SentenceTransformerEmbeddings(
-            model_name=embedding_model
-        )
+        self.embedding_model = embedding_model
+        self.embedding_cache_path = embedding_cache_path
+        self._embedding = None
         self.collection_name = collection_name
         self.persist_directory = persist_directory
+        self.incremental = incremental
+        self.read_chunksize = read_chunksize
+        self.split_workers = split_workers
+        self.embedding_workers = embedding_workers
+        self.write_batch_size = write_batch_size
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.snapshot_path = snapshot_path
+        self.vector_backend = vector_backend
+        self.numpy_store_dtype = numpy_store_dtype
+        self.numpy_store_quantization = numpy_store_quantization
+        self.lexical_index = lexical_index
+        self._checkpoint_state = None
+        self._vector_store = None
 
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
@@ -71,29 +475,130 @@ class ETLProcessor:
         )
 
 
+    @property
+    def embedding(self) -> Embeddings:
+        """
+        Embedding model of the single-process path, loaded on first use:
+        with several embedding workers, each loads its own copy instead.
+        """
+        if self._embedding is None:
+            self._embedding = with_embedding_cache(
+                SentenceTransformerEmbeddings(model_name=self.embedding_model),
+                self.embedding_model,
+                self.embedding_cache_path,
+                settings.EMBEDDING_CACHE_MAX_MB,
+            )
+        return self._embedding
+
+    @property
+    def vector_store(self) -> Chroma:
+        """
+        Chroma collection handle, opened on first use and shared by every
+        stage of the run.
+        """
+        if self._vector_store is None:
+            # The embedding workers hand over computed embeddings, so the
+            # collection needs no model of its own then
+            self._vector_store = Chroma(
+                collection_name=self.collection_name,
+                embedding_function=(
+                    self.embedding if self.embedding_workers <= 1 else None
+                ),
+                persist_directory=self.persist_directory,
+            )
+        return self._vector_store
+
     def load_data(self) -> pd.DataFrame:
         """
-        Loads the jobs descriptions from a csv file.
+        Loads the jobs descriptions from a csv file, or from its snapshot
+        if it is up to date.
 
         Returns
         -------
         df : pd.DataFrame
             Jobs descriptions with extra metadata from the dataset.
         """
+        if self._snapshot_is_fresh():
+            return snapshot_frame(open_snapshot(self.snapshot_path))
+
         df = pd.read_csv(self.dataset_path)
-        columns_to_keep = [
-            "description",
-            "Employment type",
-            "Seniority level",
-            "company",
-            "location",
-            "post_url",
-            "title",
-        ]
-        df = df[columns_to_keep]
+        df = df[JOB_COLUMNS]
         df = df.dropna()
+        if self.snapshot_path:
+            snapshot = SnapshotWriter(
+                self.snapshot_path, JOB_COLUMNS, file_fingerprint(self.dataset_path)
+            )
+            snapshot.write(df)
+            snapshot.commit()
         return df
-        
+
+    def iter_data(self) -> Iterator[pd.DataFrame]:
+        """
+        Streams the jobs descriptions from a csv file, or from its snapshot
+        if it is up to date, `read_chunksize` rows at a time.
+
+        Yields
+        ------
+        pd.DataFrame
+            Chunk of jobs descriptions with extra metadata from the dataset.
+            The index keeps counting across chunks, as in `load_data`.
+        """
+        if self._snapshot_is_fresh():
+            table = open_snapshot(self.snapshot_path)
+            for batch in table.to_batches(max_chunksize=self.read_chunksize):
+                yield snapshot_frame(pa.Table.from_batches([batch]))
+            return
+
+        snapshot = None
+        if self.snapshot_path:
+            snapshot = SnapshotWriter(
+                self.snapshot_path, JOB_COLUMNS, file_fingerprint(self.dataset_path)
+            )
+        completed = False
+        reader = pd.read_csv(
+            self.dataset_path, usecols=JOB_COLUMNS, chunksize=self.read_chunksize
+        )
+        try:
+            with reader:
+                for df in reader:
+                    df = df[JOB_COLUMNS].dropna()
+                    if snapshot is not None:
+                        snapshot.write(df)
+                    yield df
+            completed = True
+        finally:
+            # A run stopped early (e.g. by `limit`) leaves no partial snapshot
+            if snapshot is not None and completed:
+                snapshot.commit()
+            elif snapshot is not None:
+                snapshot.abort()
+
+    def _snapshot_is_fresh(self) -> bool:
+        """Whether the snapshot exists and was built from the current csv."""
+        if not self.snapshot_path:
+            return False
+        return snapshot_fingerprint(self.snapshot_path) == file_fingerprint(
+            self.dataset_path
+        )
+
+    def iter_documents(
+        self, descriptions: Iterable[pd.DataFrame]
+    ) -> Iterator[Document]:
+        """
+        Lazily creates Document objects from chunks of descriptions.
+
+        Parameters
+        ----------
+        descriptions : Iterable[pd.DataFrame]
+            Chunks of job descriptions, e.g. from `iter_data`.
+
+        Yields
+        ------
+        Document
+            Document (langchain.docstore.document.Document) objects.
+        """
+        for df in descriptions:
+            yield from self._frame_documents(df)
 
     def create_documents(self, descriptions: pd.DataFrame) -> List[Document]:
         """
@@ -109,21 +614,21 @@ class ETLProcessor:
         List[Document]
             List of Document (langchain.docstore.document.Document) objects.
         """
-        output_documents = []
-        for idx, row in descriptions.iterrows():
-            metadata = {
-                "employment_type": row["Employment type"],
-                "seniority_level": row["Seniority level"],
-                "company": row["company"],
-                "location": row["location"],
-                "post_url": row["post_url"],
-                "title": row["title"],
-                "id": idx,
-            }
-            doc = Document(page_content=row["description"], metadata=metadata)
-            output_documents.append(doc)
+        return list(self._frame_documents(descriptions))
 
-        return output_documents
+    @staticmethod
+    def _frame_documents(descriptions: pd.DataFrame) -> Iterator[Document]:
+        """
+        Lazily creates Document objects from a DataFrame, reading each
+        column once as a list rather than walking rows with `iterrows`.
+        """
+        fields = list(METADATA_COLUMNS) + ["id", "job_hash"]
+        columns = [descriptions[column].tolist() for column in METADATA_COLUMNS.values()]
+        columns += [descriptions.index.tolist(), job_hashes(descriptions)]
+        for description, *values in zip(
+            descriptions["description"].tolist(), *columns
+        ):
+            yield Document(page_content=description, metadata=dict(zip(fields, values)))
 
     def split_documents(self, documents: List[Document]) -> List[Document]:
         """
@@ -142,45 +647,472 @@ class ETLProcessor:
         """
         return self.text_splitter.split_documents(documents)
 
-    def process_batches(self, splits: List[Document]) -> None:
+    def iter_splits(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """
+        Lazily splits documents into smaller chunks using the pre-defined
+        text_splitter.
+
+        Parameters
+        ----------
+        documents : Iterable[Document]
+            Document objects to be split.
+
+        Yields
+        ------
+        Document
+            Split Document objects, in the same order as `split_documents`.
+        """
+        if self.split_workers > 1:
+            yield from self._iter_splits_parallel(documents)
+            return
+        for document in documents:
+            yield from self.text_splitter.split_documents([document])
+
+    def _iter_splits_parallel(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """
+        Splits shards of `SPLIT_SHARD_SIZE` documents on a pool of
+        `split_workers` processes, yielding the splits in input order.
+        """
+        documents = iter(documents)
+        shards = iter(lambda: list(islice(documents, SPLIT_SHARD_SIZE)), [])
+        with ProcessPoolExecutor(
+            max_workers=self.split_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_split_worker,
+            initargs=(self.chunk_size, self.chunk_overlap),
+        ) as split_pool:
+            for _, splits in ordered_map(
+                split_pool, _split_documents, shards, 2 * self.split_workers
+            ):
+                yield from splits
+
+    def iter_batches(self, splits: Iterable[Document]) -> Iterator[List[Document]]:
         """
-        Processes documents in batches, creating Chroma vector stores for
-        each batch.
+        Groups split documents into batches of `batch_size`.
 
         Parameters
         ----------
-        splits : List[Document]
-            List of Document objects to be processed.
+        splits : Iterable[Document]
+            Split Document objects.
+
+        Yields
+        ------
+        List[Document]
+            Batch of at most `batch_size` Document objects.
+        """
+        splits = iter(splits)
+        while batch := list(islice(splits, self.batch_size)):
+            yield batch
+
+    def process_batches(self, splits: Iterable[Document], start_batch: int = 0) -> int:
+        """
+        Processes documents in batches: each batch of `batch_size` documents
+        is embedded and buffered, and buffered documents are written to the
+        Chroma collection in bulk writes of `write_batch_size`. Throughput
+        of each stage is printed at the end.
+
+        Parameters
+        ----------
+        splits : Iterable[Document]
+            Document objects to be processed, either a list or a lazy
+            iterator such as `iter_splits`.
+
+        start_batch : int, optional
+            Number of leading batches to skip because they were committed
+            by an earlier run. Default is 0.
 
         Returns
         -------
-        None
+        int
+            Number of batches committed, including the skipped ones.
         """
-        for i in tqdm(
-            range(0, len(splits), self.batch_size), desc="Processing batches"
+        transform = StageTimer("transform")
+        embed = StageTimer("embed")
+        write = StageTimer("write")
+        store_writer = VectorStoreWriter(
+            self.vector_store, self.write_batch_size, timer=write
+        )
+
+        start = time.perf_counter()
+        batches = transform.timed(islice(self.iter_batches(splits), start_batch, None))
+        batch_number = start_batch
+        for batch_number, batch in enumerate(
+            tqdm(batches, desc="Processing batches"), start=start_batch + 1
         ):
-            Chroma.from_documents(
-                splits[i: i + self.batch_size],
-                embedding=self.embedding,
-                collection_name=self.collection_name,
-                persist_directory=self.persist_directory,
+            embed_start = time.perf_counter()
+            embeddings = self.embedding.embed_documents(
+                [doc.page_content for doc in batch]
             )
+            embed.add(len(batch), time.perf_counter() - embed_start)
+            self._store_batch(store_writer, batch_number, batch, embeddings)
+        store_writer.flush()
 
-    def run_etl(self) -> None:
+        print_stage_stats([transform, embed, write], time.perf_counter() - start)
+        return batch_number
+
+    def process_batches_parallel(
+        self, splits: Iterable[Document], start_batch: int = 0
+    ) -> int:
+        """
+        Processes documents in batches through a pipeline: a pool of
+        `embedding_workers` processes embeds batches while a writer thread
+        stores the previous batches in bulk writes of `write_batch_size`.
+        Throughput of each stage is printed at the end.
+
+        Parameters
+        ----------
+        splits : Iterable[Document]
+            Document objects to be processed, either a list or a lazy
+            iterator such as `iter_splits`.
+
+        start_batch : int, optional
+            Number of leading batches to skip because they were committed
+            by an earlier run. Default is 0.
+
+        Returns
+        -------
+        int
+            Number of batches committed, including the skipped ones.
+        """
+        transform = StageTimer("transform")
+        embed = StageTimer("embed", workers=self.embedding_workers)
+        write = StageTimer("write")
+        store_writer = VectorStoreWriter(
+            self.vector_store, self.write_batch_size, timer=write
+        )
+        # Keep every worker busy while bounding the batches held in memory
+        max_pending = 2 * self.embedding_workers
+        threads_per_worker = max(1, (os.cpu_count() or 1) // self.embedding_workers)
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(
+            max_workers=self.embedding_workers,
+            # Forking after torch has started its thread pool can deadlock
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_embedding_worker,
+            initargs=(
+                self.embedding_model,
+                threads_per_worker,
+                self.embedding_cache_path,
+            ),
+        ) as embed_pool, ThreadPoolExecutor(max_workers=1) as writer:
+            pending_write = None
+            batches = transform.timed(
+                islice(self.iter_batches(splits), start_batch, None)
+            )
+            embedded = ordered_map(embed_pool, _embed_documents, batches, max_pending)
+            batch_number = start_batch
+            for batch_number, (batch, (embeddings, seconds)) in enumerate(
+                tqdm(embedded, desc="Processing batches"), start=start_batch + 1
+            ):
+                embed.add(len(batch), seconds)
+                # At most one write in flight: batch N is stored while the
+                # pool keeps embedding the following batches
+                if pending_write is not None:
+                    pending_write.result()
+                pending_write = writer.submit(
+                    self._store_batch, store_writer, batch_number, batch, embeddings
+                )
+            if pending_write is not None:
+                pending_write.result()
+            writer.submit(store_writer.flush).result()
+
+        print_stage_stats([transform, embed, write], time.perf_counter() - start)
+        return batch_number
+
+    def _store_batch(
+        self,
+        store_writer: VectorStoreWriter,
+        batch_number: int,
+        batch: List[Document],
+        embeddings: List[List[float]],
+    ) -> None:
+        """Buffers an embedded batch, checkpointing every `checkpoint_every`."""
+        store_writer.add(batch, embeddings)
+        if self.checkpoint_path and batch_number % self.checkpoint_every == 0:
+            store_writer.flush()
+            self.save_checkpoint(batch_number)
+
+    def load_checkpoint(self) -> Optional[dict]:
+        """
+        Reads the checkpoint manifest.
+
+        Returns
+        -------
+        dict, optional
+            The manifest, or None if there is no checkpoint.
+        """
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path) as f:
+            return json.load(f)
+
+    def save_checkpoint(self, committed_batches: int, completed: bool = False) -> None:
+        """
+        Atomically writes the checkpoint manifest.
+
+        Parameters
+        ----------
+        committed_batches : int
+            Number of batches whose documents are stored in the collection.
+
+        completed : bool, optional
+            Whether the run finished. Default is False.
+        """
+        if not self.checkpoint_path:
+            return
+        manifest = {
+            **self._checkpoint_state,
+            "committed_batches": committed_batches,
+            "completed": completed,
+        }
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def sync_index(self, splits: Iterable[Document]) -> Iterator[Document]:
+        """
+        Reconciles the collection with the current splits while loading.
+
+        Only the chunks missing from the collection are yielded to be
+        embedded, and chunks that only moved to another row get their
+        metadata updated in place. Once `splits` is exhausted, chunks whose
+        ID is no longer produced by the dataset (removed or changed jobs)
+        are deleted.
+
+        Parameters
+        ----------
+        splits : Iterable[Document]
+            Split Document objects for the whole dataset.
+
+        Yields
+        ------
+        Document
+            Split Document objects that still need to be embedded.
+        """
+        vector_store = self.vector_store
+        existing = vector_store.get(include=["metadatas"])
+        existing_jobs = {
+            chunk: (metadata or {}).get("id")
+            for chunk, metadata in zip(existing["ids"], existing["metadatas"])
+        }
+
+        moved = {}
+        current_ids = set()
+        n_new = n_moved = n_unchanged = 0
+        for doc in splits:
+            doc_id = chunk_id(doc)
+            current_ids.add(doc_id)
+            if doc_id not in existing_jobs:
+                n_new += 1
+                yield doc
+            elif existing_jobs[doc_id] != doc.metadata["id"]:
+                n_moved += 1
+                moved[doc_id] = doc.metadata
+                if len(moved) >= self.batch_size:
+                    self._update_metadatas(vector_store, moved)
+                    moved = {}
+            else:
+                n_unchanged += 1
+        if moved:
+            self._update_metadatas(vector_store, moved)
+
+        stale_ids = [doc_id for doc_id in existing_jobs if doc_id not in current_ids]
+        for i in range(0, len(stale_ids), self.batch_size):
+            vector_store.delete(ids=stale_ids[i: i + self.batch_size])
+
+        print(
+            f"Incremental sync: {n_new} new, {len(stale_ids)} deleted, "
+            f"{n_moved} moved, {n_unchanged} unchanged chunks"
+        )
+
+    @staticmethod
+    def _update_metadatas(vector_store: Chroma, metadatas: Dict[str, dict]) -> None:
+        """Overwrites the metadata of already embedded chunks, by chunk ID."""
+        vector_store._collection.update(
+            ids=list(metadatas.keys()), metadatas=list(metadatas.values())
+        )
+
+    def run_etl(self, limit: Optional[int] = None, resume: bool = False) -> None:
         """
         Executes the ETL process: extract data from a source, transform it,
         and load into a new storage.
+
+        Parameters
+        ----------
+        limit : int, optional
+            Maximum number of jobs to load, e.g. 100 for a quick local
+            database. Default is None (load every job).
+
+        resume : bool, optional
+            If True, continue from the last batch committed in the
+            checkpoint manifest of an interrupted run with the same dataset
+            and config. In incremental mode, chunks already in the
+            collection are skipped anyway, so the run simply restarts.
+            Default is False.
+
+        Raises
+        ------
+        ValueError
+            If `resume` is set and the checkpoint doesn't match the current
+            dataset or config.
         """
-        job_descriptions = self.load_data()
-        docs = self.create_documents(job_descriptions)[:100]
-        splits = self.split_documents(docs)
-        self.process_batches(splits)
+        start_batch = 0
+        if self.checkpoint_path:
+            self._checkpoint_state = {
+                "dataset": file_fingerprint(self.dataset_path),
+                "config": self._checkpoint_config(limit),
+            }
+        if resume:
+            checkpoint = self.load_checkpoint()
+            if checkpoint is None:
+                print("No checkpoint found, starting from the first batch")
+            elif any(
+                checkpoint[key] != value
+                for key, value in self._checkpoint_state.items()
+            ):
+                raise ValueError(
+                    f"Checkpoint {self.checkpoint_path} was written for another "
+                    "dataset or config; run without resume to start over."
+                )
+            elif checkpoint["completed"]:
+                print("Checkpointed run already completed, nothing to resume")
+                return
+            elif not self.incremental:
+                start_batch = checkpoint["committed_batches"]
+                print(f"Resuming after batch {start_batch}")
+
+        # Maps normalised filter values to the indexed metadata, for the
+        # retriever's filters
+        metadata_index = MetadataIndex()
+        if self.read_chunksize:
+            docs = islice(self.iter_documents(self.iter_data()), limit)
+            docs = metadata_index.indexed(docs)
+        else:
+            docs = self.create_documents(self.load_data())[:limit]
+            for doc in docs:
+                metadata_index.add(doc.metadata)
+        if self.read_chunksize or self.split_workers > 1:
+            splits = self.iter_splits(docs)
+        else:
+            splits = self.split_documents(docs)
+        # BM25 index over every chunk, for the retriever's hybrid search
+        lexical_index = LexicalIndexBuilder() if self.lexical_index else None
+        if lexical_index is not None:
+            splits = lexical_index.indexed(splits, chunk_id)
+        if self.incremental:
+            splits = self.sync_index(splits)
+        if self.embedding_workers > 1:
+            committed_batches = self.process_batches_parallel(splits, start_batch)
+        else:
+            committed_batches = self.process_batches(splits, start_batch)
+        metadata_index.save(os.path.join(self.persist_directory, METADATA_INDEX_FILE))
+        lexical_index_path = os.path.join(self.persist_directory, LEXICAL_INDEX_DIR)
+        if lexical_index is not None:
+            lexical_index.save(lexical_index_path)
+        elif os.path.exists(lexical_index_path):
+            # It no longer matches the collection; hybrid search falls back
+            # to vector search without it
+            shutil.rmtree(lexical_index_path)
+            print(f"Removed the outdated lexical index {lexical_index_path}")
+        if self.vector_backend == "numpy":
+            exported = export_collection(
+                self.vector_store._collection,
+                os.path.join(self.persist_directory, NUMPY_STORE_DIR),
+                dtype=self.numpy_store_dtype,
+                quantization=self.numpy_store_quantization,
+                pq_subvectors=settings.NUMPY_STORE_PQ_SUBVECTORS,
+            )
+            print(f"Exported {exported} chunks to the NumPy store")
+        self.save_checkpoint(committed_batches, completed=True)
+
+    def _checkpoint_config(self, limit: Optional[int]) -> Dict[str, object]:
+        """Settings that must not change between a run and its resumption."""
+        return {
+            "limit": limit,
+            "batch_size": self.batch_size,
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+            "embedding_model": self.embedding_model,
+            "collection_name": self.collection_name,
+            "persist_directory": self.persist_directory,
+            "incremental": self.incremental,
+        }
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load job postings into the vector store.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only embed new or changed chunks and delete chunks of removed jobs.",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        help="Stream the dataset in chunks of this many rows to bound memory use.",
+    )
+    parser.add_argument(
+        "--split-workers",
+        type=int,
+        default=1,
+        help="Number of text splitting worker processes (default: 1).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of embedding worker processes (default: 1).",
+    )
+    parser.add_argument(
+        "--write-batch-size",
+        type=int,
+        default=1000,
+        help="Number of embedded chunks written to the vector store at once.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=os.path.join(settings.CHROMA_DB_PATH, "etl_checkpoint.json"),
+        help="Checkpoint manifest to record progress in.",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=100,
+        help="Number of batches between checkpoints (default: 100).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its last committed batch.",
+    )
+    parser.add_argument(
+        "--no-lexical-index",
+        action="store_true",
+        help="Don't build the BM25 index of hybrid search.",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        help="Maximum number of jobs to load (default: all).",
+    )
+    args = parser.parse_args()
+
     etl_processor = ETLProcessor(
         batch_size=32,
         chunk_size=500,
         chunk_overlap=100,
+        incremental=args.incremental,
+        read_chunksize=args.chunksize,
+        split_workers=args.split_workers,
+        embedding_workers=args.workers,
+        write_batch_size=args.write_batch_size,
+        checkpoint_path=args.checkpoint,
+        checkpoint_every=args.checkpoint_every,
+        lexical_index=settings.LEXICAL_INDEX_ENABLED and not args.no_lexical_index,
     )
-    etl_processor.run_etl()
+    etl_processor.run_etl(limit=args.limit, resume=args.resume)
@@ -0,0 +1,179 @@
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from backend.config import settings
+
+# Schema metadata key holding the fingerprint of the source dataset
+FINGERPRINT_KEY = b"source_fingerprint"
+
+
+def snapshot_fingerprint(path: str) -> Optional[dict]:
+    """
+    Reads the fingerprint of the dataset a snapshot was built from.
+
+    Parameters
+    ----------
+    path : str
+        Path to the snapshot (Arrow IPC file).
+
+    Returns
+    -------
+    dict, optional
+        The fingerprint, or None if there is no readable snapshot.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with pa.memory_map(path) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+    except pa.ArrowInvalid:
+        return None
+    if FINGERPRINT_KEY not in metadata:
+        return None
+    return json.loads(metadata[FINGERPRINT_KEY])
+
+
+def open_snapshot(path: str) -> pa.Table:
+    """
+    Opens a snapshot as an Arrow table backed by a memory map, so columns
+    are read from the page cache without being copied or parsed.
+
+    Parameters
+    ----------
+    path : str
+        Path to the snapshot (Arrow IPC file).
+
+    Returns
+    -------
+    pa.Table
+        Table with an "id" column (the row label of the cleaned dataset)
+        followed by the job columns.
+    """
+    return pa.ipc.open_file(pa.memory_map(path)).read_all()
+
+
+def snapshot_frame(table: pa.Table) -> pd.DataFrame:
+    """Converts (part of) a snapshot back to the DataFrame it was built from."""
+    df = table.to_pandas().set_index("id")
+    df.index.name = None
+    return df
+
+
+class SnapshotWriter:
+    """
+    Writes cleaned job DataFrames to an Arrow IPC snapshot, one record batch
+    per DataFrame. Data goes to a temporary file that only replaces the
+    snapshot on `commit`, so readers never see a partial snapshot.
+    """
+
+    def __init__(self, path: str, columns: List[str], fingerprint: dict):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.columns = columns
+        self.schema = pa.schema(
+            [("id", pa.int64())] + [(column, pa.string()) for column in columns],
+            metadata={FINGERPRINT_KEY: json.dumps(fingerprint)},
+        )
+        self._tmp_path = f"{path}.tmp"
+        self._sink = pa.OSFile(self._tmp_path, "wb")
+        self._writer = pa.ipc.new_file(self._sink, self.schema)
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Appends a DataFrame of cleaned jobs, indexed by job id."""
+        df = df[self.columns].astype(str).reset_index(names="id")
+        self._writer.write_table(
+            pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        )
+
+    def commit(self) -> None:
+        """Finishes the snapshot and moves it into place."""
+        self._writer.close()
+        self._sink.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Discards the snapshot being written."""
+        self._writer.close()
+        self._sink.close()
+        os.remove(self._tmp_path)
+
+
+class JobStore:
+    """
+    Lookup of full job postings by the `id` metadata of the retrieved
+    chunks, served from the snapshot written by the ETL.
+    """
+
+    def __init__(self, path: str):
+        self.table = open_snapshot(path)
+        ids = self.table.column("id").to_numpy()
+        self._order = np.argsort(ids, kind="stable")
+        self._sorted_ids = ids[self._order]
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def get_many(self, job_ids: Iterable[int]) -> List[Optional[Dict[str, str]]]:
+        """
+        Fetches several job postings.
+
+        Parameters
+        ----------
+        job_ids : Iterable[int]
+            Job ids, as stored in the `id` metadata of the chunks.
+
+        Returns
+        -------
+        List[Optional[Dict[str, str]]]
+            One posting (column -> value) per id, or None if it is unknown.
+        """
+        job_ids = np.asarray(list(job_ids), dtype=np.int64)
+        if not len(self):
+            return [None] * len(job_ids)
+        positions = np.searchsorted(self._sorted_ids, job_ids)
+        positions = np.minimum(positions, len(self._sorted_ids) - 1)
+        found = self._sorted_ids[positions] == job_ids
+        rows = iter(self.table.take(self._order[positions[found]]).to_pylist())
+        return [next(rows) if hit else None for hit in found]
+
+    def get(self, job_id: int) -> Optional[Dict[str, str]]:
+        """Fetches one job posting, or None if the id is unknown."""
+        return self.get_many([job_id])[0]
+
+
+_job_store = None
+_job_store_lock = threading.Lock()
+
+
+def get_job_store() -> Optional[JobStore]:
+    """
+    Returns the process-wide JobStore over `settings.JOBS_SNAPSHOT_PATH`,
+    opening it on first use.
+
+    Returns
+    -------
+    JobStore, optional
+        The store, or None if no snapshot is configured or built yet.
+    """
+    global _job_store
+    path = settings.JOBS_SNAPSHOT_PATH
+    if _job_store is None and path and os.path.exists(path):
+        with _job_store_lock:
+            if _job_store is None:
+                _job_store = JobStore(path)
+    return _job_store
+
+
+def reset_job_store() -> None:
+    """Drops the shared JobStore, so the next use opens the current snapshot."""
+    global _job_store
+    with _job_store_lock:
+        _job_store = None
@@ -0,0 +1,408 @@
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import tempfile
+from array import array
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+from langchain.docstore.document import Document
+
+from backend.config import settings
+
+# Directory written next to the Chroma collection by the ETL
+LEXICAL_INDEX_DIR = "lexical_index"
+
+# Keeps "c++", "c#", "node.js" and "iso-27001"-like codes as single tokens
+TOKEN_PATTERN = re.compile(r"\w[\w+#]*(?:[.\-]\w[\w+#]*)*")
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Rank constant of reciprocal rank fusion
+RRF_K = 60
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cases a text and splits it into search terms."""
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+def lexical_text(document: Document) -> str:
+    """Text of a chunk indexed for lexical search: its job title and content."""
+    return f"{document.metadata.get('title', '')} {document.page_content}"
+
+
+class LexicalIndexBuilder:
+    """
+    Builds a BM25 inverted index over chunks with flat memory: postings are
+    accumulated in compact arrays for `segment_size` chunks at a time, then
+    written to a segment on disk; `save` merges the segments into
+    `LexicalIndex` files, keeping the first chunk of each id only.
+    """
+
+    def __init__(self, segment_size: int = settings.LEXICAL_INDEX_SEGMENT_CHUNKS):
+        """
+        Parameters
+        ----------
+        segment_size : int, optional
+            Chunks indexed in memory before their postings are written to
+            disk. Default is `settings.LEXICAL_INDEX_SEGMENT_CHUNKS`.
+        """
+        self.segment_size = segment_size
+        self.n_chunks = 0
+        self._segments_path = tempfile.mkdtemp(prefix="lexical_index-")
+        self._n_segments = 0
+        self._reset_segment()
+
+    def _reset_segment(self) -> None:
+        self.chunk_ids = []
+        self.lengths = array("I")
+        # Term -> (chunk numbers, term frequencies)
+        self.postings: Dict[str, Tuple[array, array]] = {}
+
+    def add(self, chunk_id: str, text: str) -> None:
+        """Indexes one chunk."""
+        number = self.n_chunks
+        self.n_chunks += 1
+        self.chunk_ids.append(chunk_id)
+        counts = Counter(tokenize(text))
+        self.lengths.append(sum(counts.values()))
+        for term, count in counts.items():
+            if term not in self.postings:
+                self.postings[term] = (array("I"), array("H"))
+            chunks, frequencies = self.postings[term]
+            chunks.append(number)
+            frequencies.append(min(count, 0xFFFF))
+        if len(self.chunk_ids) >= self.segment_size:
+            self._write_segment()
+
+    def indexed(
+        self, documents: Iterable[Document], id_function: Callable[[Document], str]
+    ) -> Iterator[Document]:
+        """Indexes chunks as they flow through a pipeline."""
+        for document in documents:
+            self.add(id_function(document), lexical_text(document))
+            yield document
+
+    def _write_segment(self) -> None:
+        """Writes the postings in memory as the next segment, then clears them."""
+        if not self.chunk_ids:
+            return
+        path = os.path.join(self._segments_path, str(self._n_segments))
+        _write_postings(path, self.postings, self.lengths, self.chunk_ids)
+        self._n_segments += 1
+        self._reset_segment()
+
+    def save(self, path: str) -> None:
+        """
+        Merges the segments into an index directory of NumPy arrays,
+        replacing any previous index at `path`. Postings are copied one
+        segment at a time into memory-mapped arrays.
+
+        Parameters
+        ----------
+        path : str
+            Directory of the index, e.g. "chroma/lexical_index".
+        """
+        self._write_segment()
+        segment_paths = [
+            os.path.join(self._segments_path, str(i)) for i in range(self._n_segments)
+        ]
+        # Duplicate rows repeat chunk ids: their chunks are dropped, and the
+        # others renumbered, so document counts and frequencies stay right
+        keep = self._first_occurrences(segment_paths)
+        renumbered = np.cumsum(keep, dtype=np.int64) - 1
+        n_chunks = int(keep.sum())
+        # Only the vocabulary and one segment are held in memory at a time
+        terms = set()
+        id_width = 1
+        for segment_path in segment_paths:
+            segment = LexicalIndex(segment_path)
+            terms.update(segment.terms)
+            id_width = max(id_width, segment.chunk_ids.dtype.itemsize // 4)
+        terms = sorted(terms)
+        term_numbers = {term: i for i, term in enumerate(terms)}
+
+        def segments() -> Iterator[Tuple["LexicalIndex", np.ndarray, ...]]:
+            """
+            Each segment, the chunks it keeps, the final number and kept
+            posting count of its terms, and its kept postings.
+            """
+            first_chunk = 0
+            for segment_path in segment_paths:
+                segment = LexicalIndex(segment_path)
+                segment_keep = keep[first_chunk : first_chunk + len(segment)]
+                first_chunk += len(segment)
+                numbers = np.fromiter(
+                    (term_numbers[term] for term in segment.terms),
+                    dtype=np.int64,
+                    count=len(segment.terms),
+                )
+                kept = keep[segment.chunks]
+                posting_terms = np.repeat(
+                    np.arange(len(numbers)), np.diff(segment.offsets)
+                )
+                segment_sizes = np.bincount(
+                    posting_terms[kept], minlength=len(numbers)
+                )
+                yield (
+                    segment,
+                    segment_keep,
+                    numbers,
+                    segment_sizes,
+                    renumbered[segment.chunks[kept]],
+                    segment.frequencies[kept],
+                )
+
+        sizes = np.zeros(len(terms), dtype=np.int64)
+        for _, _, numbers, segment_sizes, _, _ in segments():
+            sizes[numbers] += segment_sizes
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+
+        tmp_path = f"{path}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        with open(os.path.join(tmp_path, "terms.json"), "w") as f:
+            json.dump(terms, f)
+        np.save(os.path.join(tmp_path, "offsets.npy"), offsets)
+        chunks = np.lib.format.open_memmap(
+            os.path.join(tmp_path, "chunks.npy"),
+            mode="w+",
+            dtype=np.uint32,
+            shape=(int(offsets[-1]),),
+        )
+        frequencies = np.lib.format.open_memmap(
+            os.path.join(tmp_path, "frequencies.npy"),
+            mode="w+",
+            dtype=np.uint16,
+            shape=(int(offsets[-1]),),
+        )
+        lengths = np.lib.format.open_memmap(
+            os.path.join(tmp_path, "lengths.npy"),
+            mode="w+",
+            dtype=np.uint32,
+            shape=(n_chunks,),
+        )
+        chunk_ids = np.lib.format.open_memmap(
+            os.path.join(tmp_path, "chunk_ids.npy"),
+            mode="w+",
+            dtype=f"<U{id_width}",
+            shape=(n_chunks,),
+        )
+
+        # Segments hold increasing chunk numbers, so appending each
+        # segment's postings after the previous ones keeps them sorted
+        cursors = offsets[:-1].copy()
+        first_chunk = 0
+        for (
+            segment,
+            segment_keep,
+            numbers,
+            segment_sizes,
+            segment_chunks,
+            segment_frequencies,
+        ) in segments():
+            # Destination of each posting: its term's cursor plus its rank
+            # within the term
+            posting_terms = np.repeat(numbers, segment_sizes)
+            segment_offsets = np.cumsum(segment_sizes) - segment_sizes
+            ranks = np.arange(len(segment_chunks)) - np.repeat(
+                segment_offsets, segment_sizes
+            )
+            destinations = cursors[posting_terms] + ranks
+            chunks[destinations] = segment_chunks
+            frequencies[destinations] = segment_frequencies
+            cursors[numbers] += segment_sizes
+            last_chunk = first_chunk + int(segment_keep.sum())
+            lengths[first_chunk:last_chunk] = segment.lengths[segment_keep]
+            chunk_ids[first_chunk:last_chunk] = segment.chunk_ids[segment_keep]
+            first_chunk = last_chunk
+        for array_file in [chunks, frequencies, lengths, chunk_ids]:
+            array_file.flush()
+        del chunks, frequencies, lengths, chunk_ids
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        shutil.rmtree(self._segments_path, ignore_errors=True)
+
+    def _first_occurrences(self, segment_paths: List[str]) -> np.ndarray:
+        """
+        Mask of the chunks whose id wasn't added before. Ids are compared
+        by 64-bit hash, held in an array rather than a set of the ids, and
+        the rare chunks sharing a hash by id.
+        """
+        hashes = np.empty(self.n_chunks, dtype=np.uint64)
+        segment_ids = [
+            np.load(os.path.join(path, "chunk_ids.npy"), mmap_mode="r")
+            for path in segment_paths
+        ]
+        first_chunk = 0
+        for ids in segment_ids:
+            hashes[first_chunk : first_chunk + len(ids)] = np.fromiter(
+                (_id_hash(str(chunk_id)) for chunk_id in ids),
+                dtype=np.uint64,
+                count=len(ids),
+            )
+            first_chunk += len(ids)
+
+        keep = np.ones(self.n_chunks, dtype=bool)
+        # Stable, so chunks sharing a hash come in the order they were added
+        order = np.argsort(hashes, kind="stable")
+        sorted_hashes = hashes[order]
+        shared = np.zeros(self.n_chunks, dtype=bool)
+        repeated = np.flatnonzero(sorted_hashes[1:] == sorted_hashes[:-1])
+        shared[repeated] = True
+        shared[repeated + 1] = True
+        seen = set()
+        for number in order[shared]:
+            # Every segment but the last holds `segment_size` chunks
+            segment, rank = divmod(int(number), self.segment_size)
+            chunk_id = str(segment_ids[segment][rank])
+            if chunk_id in seen:
+                keep[number] = False
+            else:
+                seen.add(chunk_id)
+        return keep
+
+
+def _id_hash(chunk_id: str) -> int:
+    """Deterministic 64-bit hash of a chunk id."""
+    digest = hashlib.blake2b(chunk_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _write_postings(
+    path: str,
+    postings: Dict[str, Tuple[array, array]],
+    lengths: array,
+    chunk_ids: List[str],
+) -> None:
+    """Writes postings as `LexicalIndex` files, with global chunk numbers."""
+    terms = sorted(postings)
+    sizes = np.fromiter((len(postings[term][0]) for term in terms), dtype=np.int64)
+    offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    chunks = np.empty(offsets[-1], dtype=np.uint32)
+    frequencies = np.empty(offsets[-1], dtype=np.uint16)
+    for i, term in enumerate(terms):
+        term_chunks, term_frequencies = postings[term]
+        chunks[offsets[i]: offsets[i + 1]] = term_chunks
+        frequencies[offsets[i]: offsets[i + 1]] = term_frequencies
+
+    os.makedirs(path)
+    with open(os.path.join(path, "terms.json"), "w") as f:
+        json.dump(terms, f)
+    np.save(os.path.join(path, "offsets.npy"), offsets)
+    np.save(os.path.join(path, "chunks.npy"), chunks)
+    np.save(os.path.join(path, "frequencies.npy"), frequencies)
+    np.save(os.path.join(path, "lengths.npy"), np.asarray(lengths, dtype=np.uint32))
+    np.save(os.path.join(path, "chunk_ids.npy"), np.asarray(chunk_ids, dtype=str))
+
+
+class LexicalIndex:
+    """
+    BM25 inverted index over the chunks of the vector store, written by the
+    ETL. Postings are memory-mapped arrays, so only the pages touched by a
+    query are read.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens an index written by `LexicalIndexBuilder.save`.
+
+        Parameters
+        ----------
+        path : str
+            Directory of the index.
+        """
+        with open(os.path.join(path, "terms.json")) as f:
+            self.terms = {term: i for i, term in enumerate(json.load(f))}
+        self.offsets = np.load(os.path.join(path, "offsets.npy"), mmap_mode="r")
+        self.chunks = np.load(os.path.join(path, "chunks.npy"), mmap_mode="r")
+        self.frequencies = np.load(
+            os.path.join(path, "frequencies.npy"), mmap_mode="r"
+        )
+        self.lengths = np.load(os.path.join(path, "lengths.npy"), mmap_mode="r")
+        self.chunk_ids = np.load(os.path.join(path, "chunk_ids.npy"), mmap_mode="r")
+        self.average_length = float(self.lengths.mean()) if len(self.lengths) else 0.0
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        """
+        Scores the chunks containing the query terms with BM25.
+
+        Parameters
+        ----------
+        query : str
+            The query text.
+
+        k : int
+            Maximum number of chunks to return.
+
+        Returns
+        -------
+        List[Tuple[str, float]]
+            (chunk id, score) pairs, best first.
+        """
+        if k <= 0:
+            return []
+        scores = np.zeros(len(self), dtype=np.float32)
+        # Empty, or only empty chunks (e.g. a segment of them)
+        average_length = self.average_length or 1.0
+        for term in set(tokenize(query)):
+            i = self.terms.get(term)
+            if i is None:
+                continue
+            start, end = self.offsets[i], self.offsets[i + 1]
+            chunks = self.chunks[start:end]
+            frequencies = self.frequencies[start:end].astype(np.float32)
+            n_matches = end - start
+            idf = math.log(1 + (len(self) - n_matches + 0.5) / (n_matches + 0.5))
+            norms = BM25_K1 * (
+                1 - BM25_B + BM25_B * self.lengths[chunks] / average_length
+            )
+            scores[chunks] += (
+                idf * frequencies * (BM25_K1 + 1) / (frequencies + norms)
+            )
+
+        matches = np.flatnonzero(scores)
+        if len(matches) > k:
+            matches = matches[np.argpartition(-scores[matches], k - 1)[:k]]
+        matches = matches[np.argsort(-scores[matches], kind="stable")]
+        return [(str(self.chunk_ids[i]), float(scores[i])) for i in matches]
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]], weights: Sequence[float]
+) -> List[str]:
+    """
+    Fuses rankings of ids by weighted reciprocal rank, so scores on
+    different scales (BM25, vector distances) need no normalisation.
+
+    Parameters
+    ----------
+    rankings : Sequence[Sequence[str]]
+        Ids ranked best first, one sequence per ranking.
+
+    weights : Sequence[float]
+        Weight of each ranking.
+
+    Returns
+    -------
+    List[str]
+        Every ranked id, best fused score first.
+    """
+    scores = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, item in enumerate(ranking):
+            scores[item] = scores.get(item, 0.0) + weight / (RRF_K + rank + 1)
+    return sorted(scores, key=scores.get, reverse=True)
@@ -0,0 +1,173 @@
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from langchain.docstore.document import Document
+
+# File written next to the Chroma collection by the ETL
+METADATA_INDEX_FILE = "metadata_index.json"
+
+# Chunk metadata fields the retriever can filter on
+FILTER_FIELDS = ["employment_type", "seniority_level", "company", "location", "title"]
+
+FilterValue = Union[str, Iterable[str]]
+
+
+def normalize_value(value: str) -> str:
+    """Case-folds and collapses whitespace, so "Berlin " matches "berlin"."""
+    return " ".join(str(value).casefold().split())
+
+
+def value_keys(field: str, value: str) -> List[str]:
+    """
+    Keys under which a metadata value is indexed.
+
+    Locations are also indexed by each of their comma-separated parts, so
+    a filter on "Berlin" or "Germany" matches "Berlin, Berlin, Germany".
+    """
+    keys = [normalize_value(value)]
+    if field == "location":
+        keys.extend(normalize_value(part) for part in str(value).split(","))
+    return [key for key in dict.fromkeys(keys) if key]
+
+
+def check_filter_fields(filters: Dict[str, FilterValue]) -> None:
+    """Raises a ValueError if a filter is on a field that can't be filtered on."""
+    for field in filters:
+        if field not in FILTER_FIELDS:
+            raise ValueError(
+                f"Cannot filter on {field!r}, expected one of {FILTER_FIELDS}"
+            )
+
+
+def combine_clauses(clauses: List[dict]) -> dict:
+    """ANDs Chroma `where` clauses together."""
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def exact_where(filters: Dict[str, FilterValue]) -> dict:
+    """
+    Translates filters into a Chroma `where` clause matching the raw values
+    exactly, for collections indexed without a metadata index.
+    """
+    check_filter_fields(filters)
+    return combine_clauses(
+        [
+            {field: {"$in": [value] if isinstance(value, str) else list(value)}}
+            for field, value in filters.items()
+        ]
+    )
+
+
+class MetadataIndex:
+    """
+    Pre-computed map from normalised filter values to the raw metadata
+    values of the indexed chunks, built by the ETL. It turns user-facing
+    filters into exact Chroma `where` clauses, so the vector store narrows
+    the candidates before similarity scoring.
+    """
+
+    def __init__(self, values: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        """
+        Initialize the MetadataIndex class.
+
+        Parameters
+        ----------
+        values : Dict[str, Dict[str, List[str]]], optional
+            Field -> normalised key -> raw values, as written by `save`.
+        """
+        self.values = {
+            field: {key: set(raw) for key, raw in keys.items()}
+            for field, keys in (values or {}).items()
+        }
+
+    def add(self, metadata: Dict[str, object]) -> None:
+        """Indexes the filterable fields of one chunk's metadata."""
+        for field in FILTER_FIELDS:
+            value = metadata.get(field)
+            if value is None:
+                continue
+            keys = self.values.setdefault(field, {})
+            for key in value_keys(field, value):
+                keys.setdefault(key, set()).add(value)
+
+    def indexed(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """Indexes documents as they flow through a pipeline."""
+        for document in documents:
+            self.add(document.metadata)
+            yield document
+
+    def resolve(self, field: str, value: FilterValue) -> List[str]:
+        """
+        Finds the raw metadata values a filter on one field matches.
+
+        Parameters
+        ----------
+        field : str
+            One of `FILTER_FIELDS`.
+
+        value : str or Iterable[str]
+            Wanted value, or set of accepted values.
+
+        Returns
+        -------
+        List[str]
+            Matching raw values, empty if no indexed chunk matches.
+        """
+        wanted = [value] if isinstance(value, str) else list(value)
+        keys = self.values.get(field, {})
+        matches = set()
+        for item in wanted:
+            matches.update(keys.get(normalize_value(item), ()))
+        return sorted(matches)
+
+    def where(self, filters: Dict[str, FilterValue]) -> Optional[dict]:
+        """
+        Translates filters into a Chroma `where` clause.
+
+        Parameters
+        ----------
+        filters : Dict[str, str or Iterable[str]]
+            Field -> wanted value or set of accepted values, e.g.
+            `{"seniority_level": "Mid-Senior level", "location": "Berlin"}`.
+
+        Returns
+        -------
+        dict, optional
+            The `where` clause, or None if no indexed chunk matches.
+
+        Raises
+        ------
+        ValueError
+            If a filter is on a field that can't be filtered on.
+        """
+        check_filter_fields(filters)
+        clauses = []
+        for field, value in filters.items():
+            matches = self.resolve(field, value)
+            if not matches:
+                return None
+            clauses.append({field: {"$in": matches}})
+        return combine_clauses(clauses)
+
+    def save(self, path: str) -> None:
+        """Writes the index atomically, as JSON."""
+        values = {
+            field: {key: sorted(raw) for key, raw in sorted(keys.items())}
+            for field, keys in self.values.items()
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(values, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["MetadataIndex"]:
+        """Reads an index written by `save`, or returns None if there is none."""
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return cls(json.load(f))
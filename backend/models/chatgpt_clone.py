@@ -1,9 +1,12 @@
+from typing import AsyncIterator
+
 from langchain.chains import LLMChain
 from langchain.memory import ConversationBufferWindowMemory
 from langchain.prompts import PromptTemplate
 
 from backend.config import settings
 from backend.llm_factory import get_llm
+from backend.models.streaming import astream_chain
 
 
 class ChatAssistant:
@@ -81,6 +84,43 @@ AI Assistant:"""
 
         return response["text"]
 
+    async def apredict(self, human_input: str) -> str:
+        """
+        Async version of `predict`, awaiting the LLM without blocking the
+        event loop.
+
+        Parameters
+        ----------
+        human_input : str
+            The human input to the chat assistant.
+
+        Returns
+        -------
+        response : str
+            The response from the chat assistant.
+        """
+        response = await self.model.ainvoke({"human_input": human_input})
+
+        return response["text"]
+
+    async def astream(self, human_input: str) -> AsyncIterator[str]:
+        """
+        Streaming version of `apredict`, yielding the response token by
+        token as the LLM generates it.
+
+        Parameters
+        ----------
+        human_input : str
+            The human input to the chat assistant.
+
+        Yields
+        ------
+        str
+            The tokens of the response.
+        """
+        async for token in astream_chain(self.model, {"human_input": human_input}):
+            yield token
+
 
 if __name__ == "__main__":
     # Determine which model and API key to use based on provider
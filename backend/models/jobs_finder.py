@@ -1,18 +1,53 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AsyncIterator, List, Optional
+
 from langchain.chains import LLMChain
+from langchain.schema.document import Document
 from langchain.memory import ConversationBufferWindowMemory
 from langchain.prompts import PromptTemplate
 
 from backend.config import settings
 from backend.models.resume_summarizer_chain import get_resume_summarizer_chain
+from backend.models.streaming import astream_chain
 from backend.retriever import Retriever
 from backend.llm_factory import get_llm
 
+logger = logging.getLogger(__name__)
+
 resume_summarizer = get_resume_summarizer_chain()
 
+_summary_executor = None
+_summary_executor_lock = threading.Lock()
+
+
+def get_summary_executor() -> ThreadPoolExecutor:
+    """
+    Returns the process-wide pool of `settings.RESUME_SUMMARY_WORKERS`
+    threads that summarize and embed the resumes in the background.
+    """
+    global _summary_executor
+    if _summary_executor is None:
+        with _summary_executor_lock:
+            if _summary_executor is None:
+                _summary_executor = ThreadPoolExecutor(
+                    max_workers=settings.RESUME_SUMMARY_WORKERS,
+                    thread_name_prefix="resume-summary",
+                )
+    return _summary_executor
+
 
 class JobsFinderAssistant:
     def __init__(
-        self, resume, llm_model, api_key, temperature=0, history_length=3
+        self,
+        resume,
+        llm_model,
+        api_key,
+        temperature=0,
+        history_length=3,
+        resume_summary=None,
     ):
         """
         Initialize the JobsFinderAssistant class.
@@ -33,14 +68,22 @@ class JobsFinderAssistant:
 
         history_length : int, optional
             The length of the conversation history to be stored in memory. Default is 3.
-        """
-        # Make a summary of the resume for the queries
-        # Use resume_summarizer_chain.
-        resume_summary_result = resume_summarizer.invoke(resume)
-        self.resume_summary = resume_summary_result.get("text", str(resume_summary_result))
 
+        resume_summary : str, optional
+            A summary of the resume made earlier, e.g. served by the resume
+            cache. Default is to summarize the resume.
+        """
         # Initialize the jobs retriever
         self.retriever = Retriever()
+        # Embedding of the resume summary, computed once
+        self._resume_embedding = None
+
+        # Make a summary of the resume for the queries, in the background
+        # so the session starts right away; the first question waits for
+        # it only if it isn't ready yet
+        self.resume_summary_future: Future = get_summary_executor().submit(
+            self._prepare_resume, resume, resume_summary
+        )
 
         # Create a string template for the chat assistant
         template = """You are a helpful job search assistant. You have access to the user's resume, conversation history, and a database of job postings.
@@ -85,6 +128,41 @@ Please provide a helpful response based on the user's resume, conversation histo
         ) 
         
 
+    @property
+    def resume_summary(self) -> str:
+        """The resume summary, waiting for the background summarization if needed."""
+        return self.resume_summary_future.result()
+
+    @property
+    def resume_embedding(self):
+        """Embedding of the resume summary, shared by every search of the session."""
+        resume_summary = self.resume_summary
+        if self._resume_embedding is None:
+            self._resume_embedding = self.retriever.embed_query(resume_summary)
+        return self._resume_embedding
+
+    def _prepare_resume(self, resume: str, resume_summary: Optional[str]) -> str:
+        """
+        Summarizes the resume with the resume_summarizer_chain, unless a
+        summary is given, and embeds the summary ahead of the first search.
+        """
+        if resume_summary is None:
+            resume_summary_result = resume_summarizer.invoke(resume)
+            resume_summary = resume_summary_result.get("text", str(resume_summary_result))
+
+        # Only a head start: if it fails, the first search embeds the
+        # summary again, and only a failure of that reaches the user
+        try:
+            self._resume_embedding = self.retriever.embed_query(resume_summary)
+        except Exception:
+            logger.warning(
+                "Embedding the resume summary in the background failed, "
+                "the first search embeds it again",
+                exc_info=True,
+            )
+
+        return resume_summary
+
     def predict(self, human_input: str) -> str:
         """
         Generate a response to a human input.
@@ -100,22 +178,81 @@ Please provide a helpful response based on the user's resume, conversation histo
             The response from the chat assistant.
         """
 
-        # Use the human input and the user resume summary to search for jobs
-        query = human_input + " " + self.resume_summary
-        jobs = self.retriever.search(query)
+        # Use the human input and the user resume summary to search for jobs:
+        # only the short input is embedded on each turn, and combined with
+        # the resume embedding. Each job appears once, in a compact form,
+        # however many of its chunks matched
+        jobs = self.retriever.search_jobs(
+            human_input, context_embedding=self.resume_embedding
+        )
 
         # Call the model to generate a response.
         # Pass the resume summary, search results, and human input
-        model_answer = self.model.invoke(
-            {
-                "resume_summary": self.resume_summary,
-                "search_results": jobs,
-                "human_input": human_input
-            }
-        )
+        model_answer = self.model.invoke(self._model_inputs(human_input, jobs))
 
         return model_answer.get("text", str(model_answer))
 
+    async def apredict(self, human_input: str) -> str:
+        """
+        Async version of `predict`: the searches run on the retriever's
+        search threads and the LLM is awaited, so the event loop keeps
+        serving other sessions meanwhile.
+
+        Parameters
+        ----------
+        human_input : str
+            The human input to the chat assistant.
+
+        Returns
+        -------
+        response : str
+            The response from the chat assistant.
+        """
+        jobs = await self._asearch_jobs(human_input)
+
+        model_answer = await self.model.ainvoke(self._model_inputs(human_input, jobs))
+
+        return model_answer.get("text", str(model_answer))
+
+    async def astream(self, human_input: str) -> AsyncIterator[str]:
+        """
+        Streaming version of `apredict`: searches the jobs, then yields the
+        response token by token as the LLM generates it.
+
+        Parameters
+        ----------
+        human_input : str
+            The human input to the chat assistant.
+
+        Yields
+        ------
+        str
+            The tokens of the response.
+        """
+        jobs = await self._asearch_jobs(human_input)
+
+        async for token in astream_chain(
+            self.model, self._model_inputs(human_input, jobs)
+        ):
+            yield token
+
+    async def _asearch_jobs(self, human_input: str) -> List[Document]:
+        """Searches the jobs matching the input and the resume, off the event loop."""
+        resume_summary = await asyncio.wrap_future(self.resume_summary_future)
+        if self._resume_embedding is None:
+            self._resume_embedding = await self.retriever.aembed_query(resume_summary)
+        return await self.retriever.asearch_jobs(
+            human_input, context_embedding=self._resume_embedding
+        )
+
+    def _model_inputs(self, human_input: str, jobs: List[Document]) -> dict:
+        """Inputs of the chain: resume summary, found jobs and human input."""
+        return {
+            "resume_summary": self.resume_summary,
+            "search_results": "\n\n".join(job.page_content for job in jobs),
+            "human_input": human_input,
+        }
+
 
 if __name__ == "__main__":
     # Determine which model and API key to use based on provider
@@ -1,3 +1,5 @@
+from typing import AsyncIterator
+
 from langchain import hub
 from langchain.agents import AgentExecutor, Tool, create_openai_functions_agent
 from langchain.chains import LLMChain
@@ -8,6 +10,13 @@ from backend.config import settings
 from backend.models.jobs_finder import JobsFinderAssistant
 from backend.llm_factory import get_llm
 
+# Tags the LLM runs of the agent itself, to tell its final answer apart
+# from the LLM calls of the tools when streaming
+AGENT_LLM_TAG = "jobs_finder_agent"
+
+# Line prefixing the final answer of the ReAct agent
+FINAL_ANSWER_MARKER = "Final Answer:"
+
 
 def build_job_finder(job_finder_assistant):
     def job_finder(human_input: str):
@@ -16,10 +25,16 @@ def build_job_finder(job_finder_assistant):
     return job_finder
 
 
-def build_cover_letter_writing(llm, resume):
-    def cover_letter_writing(job_description: str):
-        # Create a string template for this chain
-        template = """You are an expert cover letter writer. You will be provided with a resume and a job description. 
+def build_ajob_finder(job_finder_assistant):
+    async def ajob_finder(human_input: str):
+        return await job_finder_assistant.apredict(human_input)
+
+    return ajob_finder
+
+
+def build_cover_letter_chain(llm):
+    # Create a string template for this chain
+    template = """You are an expert cover letter writer. You will be provided with a resume and a job description. 
 Please write a professional and compelling cover letter that highlights how the applicant's skills and experience match the job requirements.
 
 Resume:
@@ -30,18 +45,23 @@ Job Description:
 
 Please write a well-structured cover letter that emphasizes the candidate's relevant qualifications and enthusiasm for the position."""
 
-        # Create a prompt template
-        prompt = PromptTemplate(
-            input_variables=["resume", "job_description"],
-            template=template,
-        )
+    # Create a prompt template
+    prompt = PromptTemplate(
+        input_variables=["resume", "job_description"],
+        template=template,
+    )
+
+    # Create an instance of LLMChain
+    return LLMChain(
+        llm=llm,
+        prompt=prompt,
+    )
 
-        # Create an instance of LLMChain
-        cover_letter_writing_chain = LLMChain(
-            llm=llm,
-            prompt=prompt,
-        )
 
+def build_cover_letter_writing(llm, resume):
+    cover_letter_writing_chain = build_cover_letter_chain(llm)
+
+    def cover_letter_writing(job_description: str):
         return cover_letter_writing_chain.invoke(
             {"resume": resume, "job_description": job_description}
         )["text"]
@@ -49,9 +69,37 @@ Please write a well-structured cover letter that emphasizes the candidate's rele
     return cover_letter_writing
 
 
+def build_acover_letter_writing(llm, resume):
+    cover_letter_writing_chain = build_cover_letter_chain(llm)
+
+    async def acover_letter_writing(job_description: str):
+        response = await cover_letter_writing_chain.ainvoke(
+            {"resume": resume, "job_description": job_description}
+        )
+        return response["text"]
+
+    return acover_letter_writing
+
+
+def calls_tool(message) -> bool:
+    """Whether an LLM message calls a tool or, with the functions API, a function."""
+    return bool(
+        getattr(message, "tool_call_chunks", None)
+        or getattr(message, "tool_calls", None)
+        or message.additional_kwargs.get("function_call")
+        or message.additional_kwargs.get("tool_calls")
+    )
+
+
 class JobsFinderAgent:
     def __init__(
-        self, resume, llm_model, api_key, temperature=0, history_length=3
+        self,
+        resume,
+        llm_model,
+        api_key,
+        temperature=0,
+        history_length=3,
+        resume_summary=None,
     ):
         """
         Initialize the JobsFinderAgent class.
@@ -69,6 +117,9 @@ class JobsFinderAgent:
 
         temperature : float
             The temperature parameter for generating responses.
+
+        resume_summary : str, optional
+            A summary of the resume made earlier, passed to the jobs finder.
         """
 
         self.resume = resume
@@ -87,6 +138,7 @@ class JobsFinderAgent:
             llm_model=llm_model,
             api_key=api_key,
             temperature=temperature,
+            resume_summary=resume_summary,
         )
 
         self.agent_executor = self.create_agent()
@@ -98,27 +150,36 @@ class JobsFinderAgent:
         cover_letter_writing = build_cover_letter_writing(
             self.llm, self.resume
         )
+        # Coroutines used by `apredict`, through `AgentExecutor.ainvoke`
+        ajob_finder = build_ajob_finder(self.job_finder)
+        acover_letter_writing = build_acover_letter_writing(
+            self.llm, self.resume
+        )
         tools = [
             Tool(
                 name="jobs_finder",
                 func=job_finder,
+                coroutine=ajob_finder,
                 description="Look up for jobs based on user preferences.",
                 handle_tool_error=True,
             ),
             Tool(
                 name="cover_letter_writing",
                 func=cover_letter_writing,
+                coroutine=acover_letter_writing,
                 description="Write a cover letter based on a job description, extract as much information you can about the job from the user input and from the chat history.",
                 handle_tool_error=True,
             ),
         ]
 
+        agent_llm = self.llm.with_config(tags=[AGENT_LLM_TAG])
+
         # Use different agent types based on provider
         if settings.LLM_PROVIDER == "openai":
             prompt = hub.pull("hwchase17/openai-functions-agent")
             print(f"Prompt pulled from hub: {prompt}")
             from langchain.agents import create_openai_functions_agent
-            agent = create_openai_functions_agent(self.llm, tools, prompt)
+            agent = create_openai_functions_agent(agent_llm, tools, prompt)
         else:
             # Use ReAct agent for Gemini and other providers with custom prompt
             from langchain.prompts import PromptTemplate as AgentPromptTemplate
@@ -157,7 +218,7 @@ Thought:{agent_scratchpad}"""
                 template=template
             )
             print(f"Using custom ReAct prompt for {settings.LLM_PROVIDER}")
-            agent = create_react_agent(self.llm, tools, prompt)
+            agent = create_react_agent(agent_llm, tools, prompt)
 
         # Create an agent executor by passing in the agent and tools
         return AgentExecutor(
@@ -174,6 +235,93 @@ Thought:{agent_scratchpad}"""
             {"input": human_input, "chat_memory": self.agent_memory}
         )
 
+        return self._remember(human_input, agent_reseponse)
+
+    async def apredict(self, human_input: str) -> str:
+        """
+        Async version of `predict`: the agent, its LLM calls and its tools
+        are awaited, so the event loop keeps serving other sessions.
+        """
+        agent_reseponse = await self.agent_executor.ainvoke(
+            {"input": human_input, "chat_memory": self.agent_memory}
+        )
+
+        return self._remember(human_input, agent_reseponse)
+
+    async def astream(self, human_input: str) -> AsyncIterator[str]:
+        """
+        Streaming version of `apredict`, yielding the tokens of the agent's
+        final answer as they arrive. Tool calls and the LLM calls made by
+        the tools are not streamed. With the ReAct agent, only the text
+        after "Final Answer:" is; with the functions agent, the content of
+        each LLM message is, unless the message calls a tool, which the
+        first chunk tells.
+
+        Parameters
+        ----------
+        human_input : str
+            The human input to the agent.
+
+        Yields
+        ------
+        str
+            The tokens of the final answer.
+        """
+        react = settings.LLM_PROVIDER != "openai"
+        # Run id -> text generated so far (ReAct)
+        runs = {}
+        # Runs of the functions agent that call a tool
+        tool_runs = set()
+        streamed = False
+        agent_reseponse = None
+        async for event in self.agent_executor.astream_events(
+            {"input": human_input, "chat_memory": self.agent_memory}, version="v2"
+        ):
+            agent_llm = AGENT_LLM_TAG in event["tags"]
+            run_id = event["run_id"]
+            token = ""
+            if agent_llm and event["event"] == "on_chat_model_stream":
+                chunk = event["data"]["chunk"]
+                if react:
+                    token = self._final_answer_token(runs, run_id, chunk.content)
+                elif calls_tool(chunk):
+                    tool_runs.add(run_id)
+                elif run_id not in tool_runs:
+                    token = chunk.content
+            elif agent_llm and event["event"] == "on_chat_model_end":
+                runs.pop(run_id, None)
+                tool_runs.discard(run_id)
+            elif event["event"] == "on_chain_end" and not event["parent_ids"]:
+                agent_reseponse = event["data"]["output"]
+            if token:
+                streamed = True
+                yield token
+
+        # E.g. the answer forced when the agent stops early
+        if not streamed and agent_reseponse is not None:
+            yield agent_reseponse["output"]
+        if agent_reseponse is not None:
+            self._remember(human_input, agent_reseponse)
+
+    @staticmethod
+    def _final_answer_token(texts: dict, run_id: str, token: str) -> str:
+        """
+        Part of a ReAct LLM token that belongs to the final answer, given
+        the text generated so far by each run.
+        """
+        previous = texts.get(run_id, "")
+        text = texts[run_id] = previous + token
+        marker = text.find(FINAL_ANSWER_MARKER)
+        if marker < 0:
+            return ""
+        start = marker + len(FINAL_ANSWER_MARKER)
+        answer = text[start:].lstrip()
+        if FINAL_ANSWER_MARKER not in previous:
+            return answer
+        return answer[len(previous[start:].lstrip()):]
+
+    def _remember(self, human_input: str, agent_reseponse: dict) -> dict:
+        """Adds a turn to the agent memory and returns the agent response."""
         self.agent_memory.extend(
             [
                 HumanMessage(content=human_input),
@@ -1,3 +1,5 @@
+import hashlib
+
 from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
 
@@ -36,6 +38,20 @@ def get_resume_summarizer_chain():
     return resume_summarizer_chain
 
 
+def resume_summarizer_version() -> str:
+    """
+    Version of the summaries made by the resume summarizer chain: a hash of
+    its prompt, LLM provider and model, which changes whenever they do.
+    """
+    model = (
+        settings.OPENAI_LLM_MODEL
+        if settings.LLM_PROVIDER == "openai"
+        else settings.GEMINI_LLM_MODEL
+    )
+    key = f"{settings.LLM_PROVIDER}\n{model}\n{template}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
 if __name__ == "__main__":
     resume_summarizer_chain = get_resume_summarizer_chain()
     print(
@@ -0,0 +1,38 @@
+from typing import AsyncIterator, Dict
+
+from langchain.chains import LLMChain
+
+
+async def astream_chain(chain: LLMChain, inputs: Dict[str, str]) -> AsyncIterator[str]:
+    """
+    Streams the answer of an LLMChain token by token. `LLMChain.astream`
+    only yields the whole output, so the prompt is formatted here and the
+    LLM streamed directly; the turn is then saved to the chain memory, as
+    `invoke` would.
+
+    Parameters
+    ----------
+    chain : LLMChain
+        The chain, with or without memory.
+
+    inputs : Dict[str, str]
+        The chain inputs, without the memory variables.
+
+    Yields
+    ------
+    str
+        The tokens of the answer, as they arrive.
+    """
+    prompt_inputs = chain.prep_inputs(inputs)
+    prompt = chain.prompt.format_prompt(
+        **{key: prompt_inputs[key] for key in chain.prompt.input_variables}
+    )
+    tokens = []
+    async for chunk in chain.llm.astream(prompt):
+        token = chunk.content if hasattr(chunk, "content") else chunk
+        if token:
+            tokens.append(token)
+            yield token
+
+    if chain.memory is not None:
+        chain.memory.save_context(inputs, {chain.output_key: "".join(tokens)})
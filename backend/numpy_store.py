@@ -0,0 +1,444 @@
+import os
+import shutil
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+from langchain.schema.document import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from backend.quantization import build_quantized_index, load_quantized_index
+
+# Directory written next to the Chroma collection by the ETL
+NUMPY_STORE_DIR = "numpy_store"
+
+# Columns of the chunk table that are not chunk metadata
+CHUNK_ID_COLUMN = "chunk_id"
+DOCUMENT_COLUMN = "document"
+
+# Rows scored at once, bounding the float32 copy of float16 embeddings
+SCORE_BLOCK_SIZE = 65536
+
+
+def top_k(values: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the `k` smallest values, smallest first."""
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < len(values):
+        top = np.argpartition(values, k - 1)[:k]
+    else:
+        top = np.arange(len(values))
+    return top[np.argsort(values[top], kind="stable")]
+
+
+def export_collection(
+    collection: Any,
+    path: str,
+    dtype: str = "float32",
+    page_size: int = 5000,
+    quantization: str = "none",
+    pq_subvectors: int = 48,
+) -> int:
+    """
+    Copies a Chroma collection into a NumPy store: the embeddings into one
+    contiguous matrix, the chunk ids, texts and metadata into an Arrow
+    table of parallel columns. The store replaces any previous one at
+    `path` once it is complete.
+
+    Parameters
+    ----------
+    collection : chromadb.Collection
+        Collection to export, e.g. `Chroma(...)._collection`.
+
+    path : str
+        Directory of the store, e.g. "chroma/numpy_store".
+
+    dtype : str, optional
+        Storage type of the embeddings, "float32" or "float16". Default is
+        "float32".
+
+    page_size : int, optional
+        Number of chunks read from the collection at once.
+
+    quantization : str, optional
+        Also store quantized embeddings, searched in memory while the full
+        precision ones stay on disk: "int8" (scalar quantization), "pq"
+        (product quantization) or "none". Default is "none".
+
+    pq_subvectors : int, optional
+        Slices per vector of product quantization; must divide the
+        embedding dimension. Default is 48.
+
+    Returns
+    -------
+    int
+        Number of exported chunks.
+    """
+    count = collection.count()
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    embeddings = None
+    norms = np.empty(count, dtype=np.float32)
+    schema = None
+    writer = None
+    offset = 0
+    while offset < count:
+        page = collection.get(
+            limit=page_size,
+            offset=offset,
+            include=["embeddings", "documents", "metadatas"],
+        )
+        if not page["ids"]:
+            break
+        vectors = np.asarray(page["embeddings"], dtype=np.float32)
+        if embeddings is None:
+            embeddings = np.lib.format.open_memmap(
+                os.path.join(tmp_path, "embeddings.npy"),
+                mode="w+",
+                dtype=dtype,
+                shape=(count, vectors.shape[1]),
+            )
+        end = offset + len(vectors)
+        embeddings[offset:end] = vectors
+        # Norms of the stored vectors, so distances match what is scored
+        stored = embeddings[offset:end].astype(np.float32)
+        norms[offset:end] = np.einsum("ij,ij->i", stored, stored)
+
+        rows = [
+            {CHUNK_ID_COLUMN: chunk_id, DOCUMENT_COLUMN: text, **(metadata or {})}
+            for chunk_id, text, metadata in zip(
+                page["ids"], page["documents"], page["metadatas"]
+            )
+        ]
+        if writer is None:
+            schema = pa.Table.from_pylist(rows).schema
+            writer = pa.ipc.new_file(os.path.join(tmp_path, "chunks.arrow"), schema)
+        writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+        offset = end
+
+    if writer is None:
+        # Empty collection
+        schema = pa.schema(
+            [(CHUNK_ID_COLUMN, pa.string()), (DOCUMENT_COLUMN, pa.string())]
+        )
+        writer = pa.ipc.new_file(os.path.join(tmp_path, "chunks.arrow"), schema)
+        np.save(os.path.join(tmp_path, "embeddings.npy"), np.zeros((0, 0), dtype))
+    else:
+        embeddings.flush()
+        quantized = build_quantized_index(
+            embeddings[:offset], quantization, pq_subvectors
+        )
+        if quantized is not None:
+            quantized.save(tmp_path)
+    writer.close()
+    np.save(os.path.join(tmp_path, "norms.npy"), norms[:offset])
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return offset
+
+
+def where_mask(columns: Dict[str, np.ndarray], where: dict, size: int) -> np.ndarray:
+    """
+    Evaluates a Chroma `where` clause over metadata columns.
+
+    Parameters
+    ----------
+    columns : Dict[str, np.ndarray]
+        Metadata field -> values of every chunk.
+
+    where : dict
+        Clause made of `$and`, `$in`, `$eq` or plain equality conditions.
+
+    size : int
+        Number of chunks.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean mask of the chunks matching the clause.
+
+    Raises
+    ------
+    ValueError
+        If the clause uses another operator.
+    """
+    mask = np.ones(size, dtype=bool)
+    for field, condition in where.items():
+        if field == "$and":
+            for clause in condition:
+                mask &= where_mask(columns, clause, size)
+            continue
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        if field not in columns:
+            return np.zeros(size, dtype=bool)
+        for operator, value in condition.items():
+            if operator == "$in":
+                mask &= np.isin(columns[field], list(value))
+            elif operator == "$eq":
+                mask &= columns[field] == value
+            else:
+                raise ValueError(f"Unsupported where operator {operator!r}")
+    return mask
+
+
+class NumpyCollection:
+    """
+    Read-only stand-in for a Chroma collection over a NumPy store, answering
+    `query` and `get` with one matrix product and `argpartition` per block
+    of chunks. Results have the shape and squared L2 distances Chroma
+    returns, so the retriever can use either backend.
+
+    If the store has quantized embeddings, they are scored instead, and the
+    best `shortlist` chunks are re-scored with the full precision
+    embeddings, which then stay memory-mapped.
+    """
+
+    def __init__(self, path: str, mmap: bool = True, shortlist: int = 100):
+        """
+        Opens a store written by `export_collection`.
+
+        Parameters
+        ----------
+        path : str
+            Directory of the store.
+
+        mmap : bool, optional
+            If True, memory-map the embeddings instead of reading them into
+            memory. Default is True.
+
+        shortlist : int, optional
+            Chunks re-scored per query when searching quantized embeddings.
+            Default is 100.
+        """
+        self.quantized = load_quantized_index(path)
+        self.shortlist = shortlist
+        self.embeddings = np.load(
+            os.path.join(path, "embeddings.npy"),
+            mmap_mode="r" if mmap or self.quantized is not None else None,
+        )
+        self.norms = np.load(os.path.join(path, "norms.npy"))
+        self.table = pa.ipc.open_file(
+            pa.memory_map(os.path.join(path, "chunks.arrow"))
+        ).read_all()
+        self.ids = self.table.column(CHUNK_ID_COLUMN).to_numpy(zero_copy_only=False)
+        self._positions = None
+        self._columns = {}
+
+    def count(self) -> int:
+        return len(self.norms)
+
+    def query(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        n_results: int = 10,
+        where: Optional[dict] = None,
+        include: Iterable[str] = ("metadatas", "documents", "distances"),
+        **kwargs: Any,
+    ) -> Dict[str, list]:
+        """Finds the `n_results` nearest chunks of each query, like Chroma."""
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[None, :]
+        candidates = None
+        if where:
+            candidates = np.flatnonzero(self._where_mask(where))
+        size = self.count() if candidates is None else len(candidates)
+        n_results = min(n_results, size)
+        if self.quantized is None:
+            distances = self._distances(queries, candidates)
+        else:
+            norms = self.norms if candidates is None else self.norms[candidates]
+            distances = self.quantized.distances(queries, norms, candidates)
+
+        results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for query, row in zip(queries, distances):
+            if self.quantized is None:
+                top = top_k(row, n_results)
+            else:
+                top = top_k(row, max(n_results, self.shortlist))
+            positions = top if candidates is None else candidates[top]
+            row_distances = row[top]
+            if self.quantized is not None:
+                # Re-score the shortlist with the full precision embeddings
+                exact = self._distances(query[None], positions)[0]
+                best = top_k(exact, n_results)
+                positions, row_distances = positions[best], exact[best]
+            rows = self._rows(positions, include)
+            results["ids"].append(rows["ids"])
+            results["documents"].append(rows.get("documents"))
+            results["metadatas"].append(rows.get("metadatas"))
+            results["distances"].append(row_distances.tolist())
+        return {
+            key: value
+            for key, value in results.items()
+            if key == "ids" or key in include
+        }
+
+    def get(
+        self,
+        ids: Optional[Sequence[str]] = None,
+        where: Optional[dict] = None,
+        include: Iterable[str] = ("metadatas", "documents"),
+        **kwargs: Any,
+    ) -> Dict[str, list]:
+        """Fetches chunks by id and/or metadata, like Chroma."""
+        if ids is None:
+            positions = np.arange(self.count())
+        else:
+            positions = np.asarray(
+                [self._position(chunk_id) for chunk_id in ids], dtype=np.int64
+            )
+            positions = positions[positions >= 0]
+        if where:
+            positions = positions[self._where_mask(where)[positions]]
+        return self._rows(positions, include)
+
+    def _distances(
+        self, queries: np.ndarray, candidates: Optional[np.ndarray]
+    ) -> np.ndarray:
+        """Squared L2 distances between each query and the (candidate) chunks."""
+        size = self.count() if candidates is None else len(candidates)
+        distances = np.empty((len(queries), size), dtype=np.float32)
+        query_norms = np.einsum("ij,ij->i", queries, queries)[:, None]
+        for start in range(0, size, SCORE_BLOCK_SIZE):
+            end = min(start + SCORE_BLOCK_SIZE, size)
+            if candidates is None:
+                block, norms = self.embeddings[start:end], self.norms[start:end]
+            else:
+                rows = candidates[start:end]
+                block, norms = self.embeddings[rows], self.norms[rows]
+            products = queries @ block.astype(np.float32, copy=False).T
+            distances[:, start:end] = norms - 2 * products + query_norms
+        return distances
+
+    def _rows(self, positions: np.ndarray, include: Iterable[str]) -> Dict[str, list]:
+        rows = self.table.take(pa.array(positions, type=pa.int64())).to_pylist()
+        result = {"ids": [row.pop(CHUNK_ID_COLUMN) for row in rows]}
+        documents = [row.pop(DOCUMENT_COLUMN) for row in rows]
+        if "documents" in include:
+            result["documents"] = documents
+        if "metadatas" in include:
+            result["metadatas"] = [
+                {key: value for key, value in row.items() if value is not None}
+                for row in rows
+            ]
+        if "embeddings" in include:
+            result["embeddings"] = self.embeddings[positions].astype(np.float32)
+        return result
+
+    def _position(self, chunk_id: str) -> int:
+        if self._positions is None:
+            self._positions = {chunk_id: i for i, chunk_id in enumerate(self.ids)}
+        return self._positions.get(chunk_id, -1)
+
+    def _where_mask(self, where: dict) -> np.ndarray:
+        return where_mask(self._metadata_columns(where), where, self.count())
+
+    def _metadata_columns(self, where: dict) -> Dict[str, np.ndarray]:
+        """Metadata columns referenced by a clause, converted on first use."""
+        fields = set()
+        stack = [where]
+        while stack:
+            clause = stack.pop()
+            for field, condition in clause.items():
+                if field == "$and":
+                    stack.extend(condition)
+                else:
+                    fields.add(field)
+        for field in fields:
+            if field not in self._columns and field in self.table.column_names:
+                self._columns[field] = self.table.column(field).to_numpy(
+                    zero_copy_only=False
+                )
+        return self._columns
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Vector store answering similarity searches from a NumPy store exported
+    by the ETL, a drop-in replacement of `Chroma` for the retriever.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        embedding_function: Embeddings,
+        mmap: bool = True,
+        shortlist: int = 100,
+    ):
+        """
+        Initialize the NumpyVectorStore class.
+
+        Parameters
+        ----------
+        path : str
+            Directory of the store written by `export_collection`.
+
+        embedding_function : Embeddings
+            Model embedding the queries, the one the chunks were embedded
+            with.
+
+        mmap : bool, optional
+            If True, memory-map the embeddings. Default is True.
+
+        shortlist : int, optional
+            Chunks re-scored per query when the store is quantized.
+        """
+        self._embedding_function = embedding_function
+        self._collection = NumpyCollection(path, mmap=mmap, shortlist=shortlist)
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding_function
+
+    def add_texts(self, texts, metadatas=None, **kwargs):
+        raise NotImplementedError("The NumPy store is written by the ETL")
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, **kwargs):
+        raise NotImplementedError("The NumPy store is written by the ETL")
+
+    def similarity_search(
+        self, query: str, k: int = 4, filter: Optional[dict] = None, **kwargs: Any
+    ) -> List[Document]:
+        return self.similarity_search_by_vector(
+            self._embedding_function.embed_query(query), k=k, filter=filter
+        )
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        return [
+            document
+            for document, _ in self.similarity_search_by_vector_with_relevance_scores(
+                embedding, k=k, filter=filter
+            )
+        ]
+
+    def similarity_search_by_vector_with_relevance_scores(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        results = self._collection.query(
+            query_embeddings=[embedding], n_results=k, where=filter
+        )
+        return [
+            (Document(page_content=text, metadata=metadata), distance)
+            for text, metadata, distance in zip(
+                results["documents"][0],
+                results["metadatas"][0],
+                results["distances"][0],
+            )
+        ]
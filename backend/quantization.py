@@ -0,0 +1,341 @@
+import os
+from typing import Optional, Union
+
+import numpy as np
+
+# Rows encoded or scored at once; blocks converted to float32 stay small
+# enough for the CPU cache
+BLOCK_SIZE = 8192
+
+
+def squared_norms(vectors: np.ndarray) -> np.ndarray:
+    """Squared L2 norm of each row, in float32."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return np.einsum("ij,ij->i", vectors, vectors)
+
+
+class Int8Index:
+    """
+    Scalar quantization of embeddings to int8 with one scale per vector:
+    each vector is divided by its largest absolute component / 127 and
+    rounded, which takes a quarter of the float32 memory.
+    """
+
+    CODES_FILE = "int8_codes.npy"
+    SCALES_FILE = "int8_scales.npy"
+
+    def __init__(self, codes: np.ndarray, scales: np.ndarray):
+        self.codes = codes
+        self.scales = scales
+
+    @classmethod
+    def build(cls, vectors: np.ndarray) -> "Int8Index":
+        """
+        Quantizes embeddings.
+
+        Parameters
+        ----------
+        vectors : np.ndarray
+            (n, dim) embeddings, e.g. a memory-mapped float32 matrix.
+
+        Returns
+        -------
+        Int8Index
+            The quantized embeddings.
+        """
+        codes = np.empty(vectors.shape, dtype=np.int8)
+        scales = np.empty(len(vectors), dtype=np.float32)
+        for start in range(0, len(vectors), BLOCK_SIZE):
+            block = np.asarray(vectors[start: start + BLOCK_SIZE], dtype=np.float32)
+            block_scales = np.abs(block).max(axis=1) / 127
+            block_scales[block_scales == 0] = 1
+            codes[start: start + len(block)] = np.rint(block / block_scales[:, None])
+            scales[start: start + len(block)] = block_scales
+        return cls(codes, scales)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.scales.nbytes
+
+    def dot(
+        self, queries: np.ndarray, rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Approximate dot products between queries and the (selected) rows."""
+        codes = self.codes if rows is None else self.codes[rows]
+        scales = self.scales if rows is None else self.scales[rows]
+        products = np.empty((len(queries), len(codes)), dtype=np.float32)
+        for start in range(0, len(codes), BLOCK_SIZE):
+            block = codes[start: start + BLOCK_SIZE].astype(np.float32)
+            products[:, start: start + len(block)] = (
+                queries @ block.T * scales[start: start + len(block)]
+            )
+        return products
+
+    def distances(
+        self,
+        queries: np.ndarray,
+        norms: np.ndarray,
+        rows: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Approximate squared L2 distances between queries and stored vectors.
+
+        Parameters
+        ----------
+        queries : np.ndarray
+            (q, dim) float32 query embeddings.
+
+        norms : np.ndarray
+            Exact squared norms of the stored vectors (of `rows`).
+
+        rows : np.ndarray, optional
+            Positions of the vectors to score. Default is all of them.
+
+        Returns
+        -------
+        np.ndarray
+            (q, n) distances.
+        """
+        query_norms = squared_norms(queries)[:, None]
+        return norms - 2 * self.dot(queries, rows) + query_norms
+
+    def save(self, path: str) -> None:
+        np.save(os.path.join(path, self.CODES_FILE), self.codes)
+        np.save(os.path.join(path, self.SCALES_FILE), self.scales)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["Int8Index"]:
+        if not os.path.exists(os.path.join(path, cls.CODES_FILE)):
+            return None
+        return cls(
+            np.load(os.path.join(path, cls.CODES_FILE)),
+            np.load(os.path.join(path, cls.SCALES_FILE)),
+        )
+
+
+class ProductQuantizationIndex:
+    """
+    Product quantization of embeddings: each vector is cut into
+    `n_subvectors` slices, and each slice is replaced by the index of its
+    nearest centroid (one byte), learnt by k-means per slice. Distances to
+    a query are sums of per-slice table lookups.
+    """
+
+    CODES_FILE = "pq_codes.npy"
+    CENTROIDS_FILE = "pq_centroids.npy"
+
+    def __init__(self, codes: np.ndarray, centroids: np.ndarray):
+        """
+        Parameters
+        ----------
+        codes : np.ndarray
+            (n, n_subvectors) uint8 centroid indexes.
+
+        centroids : np.ndarray
+            (n_subvectors, n_centroids, dim / n_subvectors) float32
+            centroids.
+        """
+        self.codes = codes
+        self.centroids = centroids
+
+    @classmethod
+    def build(
+        cls,
+        vectors: np.ndarray,
+        n_subvectors: int,
+        n_centroids: int = 256,
+        iterations: int = 10,
+        sample_size: int = 65536,
+        seed: int = 0,
+    ) -> "ProductQuantizationIndex":
+        """
+        Learns the centroids on a sample of embeddings and encodes them all.
+
+        Parameters
+        ----------
+        vectors : np.ndarray
+            (n, dim) embeddings, e.g. a memory-mapped float32 matrix.
+
+        n_subvectors : int
+            Number of slices per vector; must divide `dim`.
+
+        n_centroids : int, optional
+            Centroids per slice, at most 256. Default is 256.
+
+        iterations : int, optional
+            k-means iterations. Default is 10.
+
+        sample_size : int, optional
+            Number of vectors the centroids are learnt on.
+
+        seed : int, optional
+            Seed of the sampling and centroid initialisation.
+
+        Returns
+        -------
+        ProductQuantizationIndex
+            The quantized embeddings.
+
+        Raises
+        ------
+        ValueError
+            If `n_subvectors` doesn't divide the dimension, or there are
+            more than 256 centroids.
+        """
+        n, dim = vectors.shape
+        if dim % n_subvectors:
+            raise ValueError(
+                f"{n_subvectors} subvectors don't divide the dimension {dim}"
+            )
+        if n_centroids > 256:
+            raise ValueError(f"Codes are one byte, {n_centroids} centroids > 256")
+        rng = np.random.default_rng(seed)
+        sample = np.sort(rng.choice(n, size=min(n, sample_size), replace=False))
+        sample = np.asarray(vectors[sample], dtype=np.float32)
+        sample = sample.reshape(len(sample), n_subvectors, -1)
+        n_centroids = min(n_centroids, len(sample))
+
+        centroids = np.empty(
+            (n_subvectors, n_centroids, dim // n_subvectors), dtype=np.float32
+        )
+        for m in range(n_subvectors):
+            centroids[m] = _kmeans(sample[:, m], n_centroids, iterations, rng)
+
+        index = cls(np.empty((n, n_subvectors), dtype=np.uint8), centroids)
+        for start in range(0, n, BLOCK_SIZE):
+            block = np.asarray(vectors[start: start + BLOCK_SIZE], dtype=np.float32)
+            index.codes[start: start + len(block)] = index.encode(block)
+        return index
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.centroids.nbytes
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Centroid index of each slice of each vector."""
+        slices = vectors.reshape(len(vectors), len(self.centroids), -1)
+        codes = np.empty(slices.shape[:2], dtype=np.uint8)
+        for m, centroids in enumerate(self.centroids):
+            codes[:, m] = _nearest(slices[:, m], centroids)
+        return codes
+
+    def distances(
+        self,
+        queries: np.ndarray,
+        norms: Optional[np.ndarray] = None,
+        rows: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Approximate squared L2 distances between queries and stored vectors
+        (asymmetric distance computation: the queries are not quantized).
+
+        Parameters
+        ----------
+        queries : np.ndarray
+            (q, dim) float32 query embeddings.
+
+        norms : np.ndarray, optional
+            Unused, for the same signature as `Int8Index.distances`.
+
+        rows : np.ndarray, optional
+            Positions of the vectors to score. Default is all of them.
+
+        Returns
+        -------
+        np.ndarray
+            (q, n) distances.
+        """
+        codes = self.codes if rows is None else self.codes[rows]
+        n_subvectors = len(self.centroids)
+        slices = queries.reshape(len(queries), n_subvectors, 1, -1)
+        # (q, n_subvectors, n_centroids) distances of each query slice to
+        # each centroid
+        tables = ((slices - self.centroids[None]) ** 2).sum(axis=-1)
+        distances = np.zeros((len(queries), len(codes)), dtype=np.float32)
+        for m in range(n_subvectors):
+            distances += tables[:, m, codes[:, m]]
+        return distances
+
+    def save(self, path: str) -> None:
+        np.save(os.path.join(path, self.CODES_FILE), self.codes)
+        np.save(os.path.join(path, self.CENTROIDS_FILE), self.centroids)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["ProductQuantizationIndex"]:
+        if not os.path.exists(os.path.join(path, cls.CODES_FILE)):
+            return None
+        return cls(
+            np.load(os.path.join(path, cls.CODES_FILE)),
+            np.load(os.path.join(path, cls.CENTROIDS_FILE)),
+        )
+
+
+QuantizedIndex = Union[Int8Index, ProductQuantizationIndex]
+
+
+def build_quantized_index(
+    vectors: np.ndarray, quantization: str, pq_subvectors: int
+) -> Optional[QuantizedIndex]:
+    """
+    Builds the quantized index named by a setting.
+
+    Parameters
+    ----------
+    vectors : np.ndarray
+        (n, dim) embeddings.
+
+    quantization : str
+        "none", "int8" or "pq".
+
+    pq_subvectors : int
+        Slices per vector of product quantization.
+
+    Returns
+    -------
+    Int8Index or ProductQuantizationIndex, optional
+        The index, or None for "none".
+    """
+    if quantization == "int8":
+        return Int8Index.build(vectors)
+    if quantization == "pq":
+        return ProductQuantizationIndex.build(vectors, pq_subvectors)
+    return None
+
+
+def load_quantized_index(path: str) -> Optional[QuantizedIndex]:
+    """Loads the quantized index saved in a NumPy store, if any."""
+    return Int8Index.load(path) or ProductQuantizationIndex.load(path)
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the nearest centroid of each vector."""
+    # In blocks that fit in cache, as argmin dominates on large inputs
+    vectors = np.ascontiguousarray(vectors)
+    projection = -2 * centroids.T
+    centroid_norms = squared_norms(centroids)
+    nearest = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), 4096):
+        distances = vectors[start: start + 4096] @ projection
+        distances += centroid_norms
+        nearest[start: start + 4096] = distances.argmin(axis=1)
+    return nearest
+
+
+def _kmeans(
+    vectors: np.ndarray, k: int, iterations: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Lloyd's k-means, returning the (k, dim) centroids."""
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = _nearest(vectors, centroids)
+        counts = np.bincount(assignments, minlength=k)
+        sums = np.stack(
+            [
+                np.bincount(assignments, weights=vectors[:, d], minlength=k)
+                for d in range(vectors.shape[1])
+            ],
+            axis=1,
+        )
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+    return centroids
@@ -0,0 +1,166 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from backend.config import settings
+
+_resume_cache = None
+_resume_cache_lock = threading.Lock()
+
+
+def file_hash(path: str, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's content, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ResumeCache:
+    """
+    Persistent store of processed resumes in a SQLite file: the extracted
+    text and the summary of each PDF, keyed by the hash of its content and
+    a version of the processing (summarizer prompt and model, extraction
+    limits), so a change of either is a cache miss. Beyond `max_entries`,
+    the least recently used resumes are evicted.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        """
+        Opens (and creates if needed) the cache file.
+
+        Parameters
+        ----------
+        path : str
+            Path to the SQLite file, e.g. "cache/resumes.sqlite".
+
+        max_entries : int
+            Maximum number of stored resumes.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resumes (
+                pdf_hash TEXT NOT NULL,
+                version TEXT NOT NULL,
+                text TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (pdf_hash, version)
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS resumes_last_access ON resumes (last_access)"
+        )
+
+    def get(self, pdf_hash: str, version: str) -> Optional[Tuple[str, str]]:
+        """
+        Looks up a processed resume.
+
+        Parameters
+        ----------
+        pdf_hash : str
+            Hash of the PDF content, see `file_hash`.
+
+        version : str
+            Version of the processing, see `resume_version`.
+
+        Returns
+        -------
+        Tuple[str, str], optional
+            The text and summary of the resume, or None if not cached.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT text, summary FROM resumes WHERE pdf_hash = ? AND version = ?",
+                (pdf_hash, version),
+            ).fetchone()
+            if row is not None:
+                self._connection.execute(
+                    "UPDATE resumes SET last_access = ? "
+                    "WHERE pdf_hash = ? AND version = ?",
+                    (time.time(), pdf_hash, version),
+                )
+        return row
+
+    def put(self, pdf_hash: str, version: str, text: str, summary: str) -> None:
+        """
+        Stores a processed resume, then evicts the least recently used
+        resumes beyond `max_entries`.
+
+        Parameters
+        ----------
+        pdf_hash : str
+            Hash of the PDF content, see `file_hash`.
+
+        version : str
+            Version of the processing, see `resume_version`.
+
+        text : str
+            Text extracted from the PDF.
+
+        summary : str
+            Summary of the resume.
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO resumes VALUES (?, ?, ?, ?, ?)",
+                (pdf_hash, version, text, summary, time.time()),
+            )
+            self._connection.execute(
+                """
+                DELETE FROM resumes WHERE rowid IN (
+                    SELECT rowid FROM resumes
+                    ORDER BY last_access DESC, rowid DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM resumes"
+            ).fetchone()
+        return count
+
+
+def resume_version(summarizer_version: str) -> str:
+    """
+    Version of the resume processing: the summarizer's, see
+    `resume_summarizer_version`, and the PDF extraction limits.
+    """
+    return f"{summarizer_version}:{settings.PDF_MAX_PAGES}:{settings.PDF_MAX_CHARS}"
+
+
+def get_resume_cache() -> Optional[ResumeCache]:
+    """
+    Returns the process-wide resume cache, or None unless
+    `settings.RESUME_CACHE_PATH` is set.
+    """
+    global _resume_cache
+    if not settings.RESUME_CACHE_PATH:
+        return None
+    if _resume_cache is None:
+        with _resume_cache_lock:
+            if _resume_cache is None:
+                _resume_cache = ResumeCache(
+                    settings.RESUME_CACHE_PATH,
+                    max_entries=settings.RESUME_CACHE_MAX_ENTRIES,
+                )
+    return _resume_cache
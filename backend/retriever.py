@@ -1,33 +1,798 @@
-from typing import List
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
 
 from langchain.schema.document import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
 from langchain_community.embeddings.sentence_transformer import (
     SentenceTransformerEmbeddings,
 )
 from langchain_community.vectorstores.chroma import Chroma
 
 from backend.config import settings
+from backend.embedding_cache import normalize_text, with_embedding_cache
+from backend.job_store import get_job_store, reset_job_store
+from backend.lexical_index import (
+    LEXICAL_INDEX_DIR,
+    LexicalIndex,
+    reciprocal_rank_fusion,
+)
+from backend.metadata_index import (
+    METADATA_INDEX_FILE,
+    FilterValue,
+    MetadataIndex,
+    exact_where,
+)
+from backend.numpy_store import NUMPY_STORE_DIR, NumpyVectorStore
 
 
-def load_vector_store() -> Chroma:
+def load_embeddings() -> Embeddings:
+    """Load the sentence transformer used to embed the queries."""
+    return with_embedding_cache(
+        SentenceTransformerEmbeddings(model_name=settings.EMBEDDINGS_MODEL),
+        settings.EMBEDDINGS_MODEL,
+        settings.EMBEDDING_CACHE_PATH,
+        settings.EMBEDDING_CACHE_MAX_MB,
+    )
+
+
+def load_vector_store(embeddings: Optional[Embeddings] = None) -> VectorStore:
     """Build a vector base on Chroma. As a embedding function, we use HuggingFaceEmbeddings"""
     print(settings.CHROMA_DB_PATH, settings.CHROMA_COLLECTION)
+    if settings.VECTOR_BACKEND == "numpy":
+        return NumpyVectorStore(
+            os.path.join(settings.CHROMA_DB_PATH, NUMPY_STORE_DIR),
+            embedding_function=embeddings or load_embeddings(),
+            mmap=settings.NUMPY_STORE_MMAP,
+            shortlist=settings.NUMPY_STORE_SHORTLIST,
+        )
     return Chroma(
         persist_directory=settings.CHROMA_DB_PATH,
         collection_name=settings.CHROMA_COLLECTION,
-        embedding_function=SentenceTransformerEmbeddings(
-            model_name=settings.EMBEDDINGS_MODEL
-        ),
+        embedding_function=embeddings or load_embeddings(),
     )
 
 
+class QueryEmbeddingCache:
+    """
+    Bounded in-memory LRU cache of query embeddings, keyed by model name and
+    normalised query, with an optional time to live. Safe to share between
+    threads.
+    """
+
+    def __init__(
+        self,
+        max_size: int = settings.QUERY_CACHE_SIZE,
+        ttl: Optional[float] = settings.QUERY_CACHE_TTL_SECONDS,
+    ):
+        """
+        Initialize the QueryEmbeddingCache class.
+
+        Parameters
+        ----------
+        max_size : int
+            Maximum number of cached embeddings; 0 disables the cache.
+
+        ttl : float, optional
+            Seconds after which an entry expires. If None, entries only
+            leave the cache when evicted.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, model: str, query: str) -> Optional[List[float]]:
+        """Returns the cached embedding of a query, or None on a miss."""
+        key = (model, normalize_text(query))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None:
+                if time.monotonic() - entry[0] > self.ttl:
+                    del self._entries[key]
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, model: str, query: str, embedding: List[float]) -> None:
+        """Caches the embedding of a query, evicting the least recently used."""
+        if self.max_size <= 0:
+            return
+        key = (model, normalize_text(query))
+        with self._lock:
+            self._entries[key] = (time.monotonic(), embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_or_embed(
+        self, model: str, query: str, embed_query: Callable[[str], List[float]]
+    ) -> List[float]:
+        """
+        Returns the embedding of a query, computing and caching it on a miss.
+
+        Parameters
+        ----------
+        model : str
+            Name of the embedding model, part of the cache key.
+
+        query : str
+            The query text.
+
+        embed_query : Callable[[str], List[float]]
+            Function embedding the query on a miss.
+
+        Returns
+        -------
+        List[float]
+            The query embedding.
+        """
+        embedding = self.get(model, query)
+        if embedding is None:
+            embedding = embed_query(query)
+            self.put(model, query, embedding)
+        return embedding
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters and current size of the cache."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+    def clear(self) -> None:
+        """Empties the cache and resets its counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Process-wide instances shared by every chat session, see `get_embeddings`,
+# `get_vector_store` and `get_query_cache`
+_embeddings = None
+_vector_store = None
+_query_cache = None
+_metadata_index = None
+_metadata_index_loaded = False
+_lexical_index = None
+_lexical_index_loaded = False
+_search_executor = None
+_shared_lock = threading.Lock()
+
+
+def get_embeddings() -> Embeddings:
+    """
+    Returns the process-wide embedding model, loading it on first use.
+
+    Returns
+    -------
+    Embeddings
+        The embedding model shared by all retrievers of this process.
+    """
+    global _embeddings
+    if _embeddings is None:
+        with _shared_lock:
+            if _embeddings is None:
+                _embeddings = load_embeddings()
+    return _embeddings
+
+
+def get_vector_store() -> VectorStore:
+    """
+    Returns the process-wide vector store, opening it on first use, so
+    chat sessions share one client and one loaded embedding model.
+
+    Returns
+    -------
+    VectorStore
+        The vector store shared by all retrievers of this process: the
+        Chroma collection, or its NumPy copy if `settings.VECTOR_BACKEND`
+        is "numpy".
+    """
+    global _vector_store
+    if _vector_store is None:
+        embeddings = get_embeddings()
+        with _shared_lock:
+            if _vector_store is None:
+                _vector_store = load_vector_store(embeddings)
+    return _vector_store
+
+
+def get_query_cache() -> QueryEmbeddingCache:
+    """Returns the process-wide query embedding cache."""
+    global _query_cache
+    if _query_cache is None:
+        with _shared_lock:
+            if _query_cache is None:
+                _query_cache = QueryEmbeddingCache()
+    return _query_cache
+
+
+def get_metadata_index() -> Optional[MetadataIndex]:
+    """
+    Returns the process-wide metadata index written by the ETL next to the
+    Chroma collection, loading it on first use.
+
+    Returns
+    -------
+    MetadataIndex, optional
+        The index, or None if the collection was built without one.
+    """
+    global _metadata_index, _metadata_index_loaded
+    if not _metadata_index_loaded:
+        with _shared_lock:
+            if not _metadata_index_loaded:
+                _metadata_index = MetadataIndex.load(
+                    os.path.join(settings.CHROMA_DB_PATH, METADATA_INDEX_FILE)
+                )
+                _metadata_index_loaded = True
+    return _metadata_index
+
+
+def get_lexical_index() -> Optional[LexicalIndex]:
+    """
+    Returns the process-wide BM25 index written by the ETL next to the
+    Chroma collection, opening it on first use.
+
+    Returns
+    -------
+    LexicalIndex, optional
+        The index, or None if the collection was built without one.
+    """
+    global _lexical_index, _lexical_index_loaded
+    if not _lexical_index_loaded:
+        with _shared_lock:
+            if not _lexical_index_loaded:
+                path = os.path.join(settings.CHROMA_DB_PATH, LEXICAL_INDEX_DIR)
+                if os.path.isdir(path):
+                    _lexical_index = LexicalIndex(path)
+                _lexical_index_loaded = True
+    return _lexical_index
+
+
+def get_search_executor() -> ThreadPoolExecutor:
+    """
+    Returns the process-wide pool of `settings.SEARCH_WORKERS` threads that
+    runs the async searches, so concurrent sessions can't start more
+    searches at once than the CPU can serve.
+    """
+    global _search_executor
+    if _search_executor is None:
+        with _shared_lock:
+            if _search_executor is None:
+                _search_executor = ThreadPoolExecutor(
+                    max_workers=settings.SEARCH_WORKERS,
+                    thread_name_prefix="search",
+                )
+    return _search_executor
+
+
+def reset_shared_resources() -> None:
+    """Drops the shared embedding model, stores, caches and indexes, e.g. after a re-index."""
+    global _embeddings, _vector_store, _query_cache
+    global _metadata_index, _metadata_index_loaded
+    global _lexical_index, _lexical_index_loaded
+    with _shared_lock:
+        _embeddings = None
+        _vector_store = None
+        _query_cache = None
+        _metadata_index = None
+        _metadata_index_loaded = False
+        _lexical_index = None
+        _lexical_index_loaded = False
+    reset_job_store()
+
+
+def combine_embeddings(
+    embeddings: List[List[float]], weights: List[float]
+) -> List[float]:
+    """
+    Combines embeddings into one search vector: the weighted sum of the
+    unit-normalised embeddings, normalised again, so each weight is the
+    share of its embedding whatever their norms.
+
+    Parameters
+    ----------
+    embeddings : List[List[float]]
+        Embeddings of the same model.
+
+    weights : List[float]
+        Weight of each embedding.
+
+    Returns
+    -------
+    List[float]
+        The combined unit embedding.
+    """
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    combined = np.asarray(weights, dtype=np.float32) @ (vectors / norms)
+    norm = np.linalg.norm(combined)
+    return (combined / norm if norm else combined).tolist()
+
+
+# Metadata field -> label of the compact job representation
+JOB_SUMMARY_FIELDS = {
+    "title": "Title",
+    "company": "Company",
+    "location": "Location",
+    "seniority_level": "Seniority level",
+    "employment_type": "Employment type",
+    "post_url": "URL",
+}
+
+
+def job_summary(metadata: Dict[str, object], excerpt: str) -> str:
+    """
+    Compact text representation of a job posting, as given to the LLM.
+
+    Parameters
+    ----------
+    metadata : Dict[str, object]
+        Metadata of a chunk of the posting.
+
+    excerpt : str
+        Most relevant chunk of the job description.
+
+    Returns
+    -------
+    str
+        One line per known metadata field, followed by the excerpt.
+    """
+    lines = [
+        f"{label}: {metadata[field]}"
+        for field, label in JOB_SUMMARY_FIELDS.items()
+        if metadata.get(field)
+    ]
+    lines.append(f"Excerpt: {excerpt}")
+    return "\n".join(lines)
+
+
 class Retriever:
     """Retriever class to search jobs into a Chroma vector store."""
 
-    def __init__(self):
-        self.vector_store = load_vector_store()
+    def __init__(
+        self,
+        vector_store: Optional[VectorStore] = None,
+        query_cache: Optional[QueryEmbeddingCache] = None,
+        metadata_index: Optional[MetadataIndex] = None,
+        lexical_index: Optional[LexicalIndex] = None,
+    ):
+        """
+        Initialize the Retriever class.
+
+        Parameters
+        ----------
+        vector_store : VectorStore, optional
+            Store to search. Defaults to the process-wide store returned
+            by `get_vector_store`.
+
+        query_cache : QueryEmbeddingCache, optional
+            Cache of query embeddings. Defaults to the process-wide cache
+            returned by `get_query_cache`.
+
+        metadata_index : MetadataIndex, optional
+            Index used to resolve search filters. Defaults to the index
+            returned by `get_metadata_index`; without one, filters match
+            metadata values exactly.
+
+        lexical_index : LexicalIndex, optional
+            BM25 index used by `hybrid_search`. Defaults to the index
+            returned by `get_lexical_index`, opened on the first hybrid
+            search.
+        """
+        if vector_store is None:
+            vector_store = get_vector_store()
+        if query_cache is None:
+            query_cache = get_query_cache()
+        if metadata_index is None:
+            metadata_index = get_metadata_index()
+        self.vector_store = vector_store
+        self.query_cache = query_cache
+        self.metadata_index = metadata_index
+        self._lexical_index = lexical_index
+
+    def embed_query(self, query: str) -> List[float]:
+        """Embeds a query, going through the query embedding cache."""
+        return self.query_cache.get_or_embed(
+            settings.EMBEDDINGS_MODEL, query, self.vector_store.embeddings.embed_query
+        )
 
-    def search(self, query: str, k: int = 4) -> List[Document]:
-        kits = self.vector_store.similarity_search(query=query, k=k)
+    def where(self, filters: Dict[str, FilterValue]) -> Optional[dict]:
+        """
+        Translates search filters into a Chroma `where` clause.
+
+        Parameters
+        ----------
+        filters : Dict[str, str or Iterable[str]]
+            Metadata field -> wanted value or set of accepted values, e.g.
+            `{"seniority_level": "Mid-Senior level", "location": "Berlin"}`.
+            Values are matched case-insensitively, and locations also by
+            any of their comma-separated parts.
+
+        Returns
+        -------
+        dict, optional
+            The `where` clause, or None if no job matches the filters.
+
+        Raises
+        ------
+        ValueError
+            If a filter is on a field that can't be filtered on.
+        """
+        if self.metadata_index is None:
+            return exact_where(filters)
+        return self.metadata_index.where(filters)
+
+    def search(
+        self,
+        query: str,
+        k: int = 4,
+        filters: Optional[Dict[str, FilterValue]] = None,
+    ) -> List[Document]:
+        where = None
+        if filters:
+            where = self.where(filters)
+            if where is None:
+                return []
+        kits = self.vector_store.similarity_search_by_vector(
+            self.embed_query(query), k=k, filter=where
+        )
 
         return kits
+
+    def search_jobs(
+        self,
+        query: str,
+        k: int = 4,
+        filters: Optional[Dict[str, FilterValue]] = None,
+        fetch_k: Optional[int] = None,
+        context_embedding: Optional[List[float]] = None,
+        context_weight: float = settings.RESUME_EMBEDDING_WEIGHT,
+    ) -> List[Document]:
+        """
+        Searches distinct jobs rather than chunks: fetches `fetch_k` chunks,
+        groups them by job `id` and ranks each job by its best chunk.
+
+        Parameters
+        ----------
+        query : str
+            The query text.
+
+        k : int, optional
+            Number of jobs to return. Default is 4.
+
+        filters : Dict[str, str or Iterable[str]], optional
+            Metadata filters, see `where`.
+
+        fetch_k : int, optional
+            Number of chunks to fetch. Defaults to
+            `k * settings.JOB_SEARCH_FETCH_FACTOR`.
+
+        context_embedding : List[float], optional
+            Embedding of a long, stable context, e.g. the user's resume
+            summary, embedded once by the caller and combined with the
+            query embedding with `combine_embeddings`.
+
+        context_weight : float, optional
+            Weight of the context embedding, that of the query being
+            `1 - context_weight`. Default is
+            `settings.RESUME_EMBEDDING_WEIGHT`.
+
+        Returns
+        -------
+        List[Document]
+            At most `k` jobs, best first. The page content is the compact
+            `job_summary` of the job with its best chunk as excerpt; the
+            metadata is that of the best chunk, plus its `score` (distance,
+            lower is closer) and the number of `matched_chunks`.
+        """
+        where = None
+        if filters:
+            where = self.where(filters)
+            if where is None:
+                return []
+        if fetch_k is None:
+            fetch_k = k * settings.JOB_SEARCH_FETCH_FACTOR
+        embedding = self.embed_query(query)
+        if context_embedding is not None:
+            embedding = combine_embeddings(
+                [embedding, context_embedding], [1 - context_weight, context_weight]
+            )
+        chunks = self.vector_store.similarity_search_by_vector_with_relevance_scores(
+            embedding, k=max(fetch_k, k), filter=where
+        )
+
+        # Chunks come best first, so the first chunk of a job is its best
+        jobs = {}
+        for chunk, score in chunks:
+            job_id = chunk.metadata.get("id")
+            if job_id in jobs:
+                jobs[job_id].metadata["matched_chunks"] += 1
+            elif len(jobs) < k:
+                jobs[job_id] = Document(
+                    page_content=job_summary(chunk.metadata, chunk.page_content),
+                    metadata={**chunk.metadata, "score": score, "matched_chunks": 1},
+                )
+        return list(jobs.values())
+
+    def hybrid_search(
+        self,
+        query: str,
+        k: int = 4,
+        filters: Optional[Dict[str, FilterValue]] = None,
+        candidates: int = settings.HYBRID_CANDIDATES,
+        lexical_weight: float = settings.HYBRID_LEXICAL_WEIGHT,
+    ) -> List[Document]:
+        """
+        Searches chunks by both keywords and meaning: the in-process BM25
+        index ranks the chunks sharing terms with the query, the vector
+        store ranks them by embedding distance, and both rankings are
+        fused by weighted reciprocal rank. This way exact keyword matches
+        (framework names, certifications, job codes) reach the results even
+        when their embeddings are not among the nearest.
+
+        Falls back to `search` if the collection has no lexical index.
+
+        Parameters
+        ----------
+        query : str
+            The query text.
+
+        k : int, optional
+            Number of documents to return. Default is 4.
+
+        filters : Dict[str, str or Iterable[str]], optional
+            Metadata filters, see `where`.
+
+        candidates : int, optional
+            Number of chunks taken from each ranking before fusing them.
+
+        lexical_weight : float, optional
+            Weight of the lexical ranking, between 0 and 1; the vector
+            ranking gets the rest.
+
+        Returns
+        -------
+        List[Document]
+            At most `k` documents, best first.
+        """
+        lexical_index = self._lexical_index or get_lexical_index()
+        if lexical_index is None:
+            return self.search(query, k=k, filters=filters)
+        where = None
+        if filters:
+            where = self.where(filters)
+            if where is None:
+                return []
+
+        lexical_ids = [
+            chunk_id for chunk_id, _ in lexical_index.search(query, candidates)
+        ]
+        results = self.vector_store._collection.query(
+            query_embeddings=[self.embed_query(query)],
+            n_results=candidates,
+            where=where,
+            include=["documents", "metadatas"],
+        )
+        documents = {
+            chunk_id: Document(page_content=text, metadata=metadata or {})
+            for chunk_id, text, metadata in zip(
+                results["ids"][0], results["documents"][0], results["metadatas"][0]
+            )
+        }
+        # Fetching the lexical-only matches also applies the filters to them
+        # and drops chunks deleted since the lexical index was built
+        missing = [chunk_id for chunk_id in lexical_ids if chunk_id not in documents]
+        if missing:
+            found = self.vector_store._collection.get(
+                ids=missing, where=where, include=["documents", "metadatas"]
+            )
+            for chunk_id, text, metadata in zip(
+                found["ids"], found["documents"], found["metadatas"]
+            ):
+                documents[chunk_id] = Document(
+                    page_content=text, metadata=metadata or {}
+                )
+
+        ranking = reciprocal_rank_fusion(
+            [
+                [chunk_id for chunk_id in lexical_ids if chunk_id in documents],
+                results["ids"][0],
+            ],
+            [lexical_weight, 1 - lexical_weight],
+        )
+        return [documents[chunk_id] for chunk_id in ranking[:k]]
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embeds several queries, encoding all cache misses in one batch.
+
+        Parameters
+        ----------
+        queries : List[str]
+            The query texts.
+
+        Returns
+        -------
+        List[List[float]]
+            One embedding per query, in order.
+        """
+        model = settings.EMBEDDINGS_MODEL
+        embeddings = [self.query_cache.get(model, query) for query in queries]
+        # Repeated queries in the batch are only encoded once
+        missing = {}
+        for i, embedding in enumerate(embeddings):
+            if embedding is None:
+                missing.setdefault(normalize_text(queries[i]), []).append(i)
+        if missing:
+            texts = list(missing)
+            computed = self.vector_store.embeddings.embed_documents(texts)
+            for text, embedding in zip(texts, computed):
+                self.query_cache.put(model, text, embedding)
+                for i in missing[text]:
+                    embeddings[i] = embedding
+        return embeddings
+
+    def search_many(
+        self,
+        queries: List[str],
+        k: int = 4,
+        filters: Optional[Dict[str, FilterValue]] = None,
+    ) -> List[List[Document]]:
+        """
+        Searches several queries with one batched embedding call and one
+        query to the index.
+
+        Parameters
+        ----------
+        queries : List[str]
+            The query texts.
+
+        k : int, optional
+            Number of documents to return per query. Default is 4.
+
+        filters : Dict[str, str or Iterable[str]], optional
+            Metadata filters applied to every query, see `where`.
+
+        Returns
+        -------
+        List[List[Document]]
+            The documents found for each query, in the order of `queries`.
+        """
+        where = None
+        if filters:
+            where = self.where(filters)
+            if where is None:
+                return [[] for _ in queries]
+        if not queries:
+            return []
+        results = self.vector_store._collection.query(
+            query_embeddings=self.embed_queries(queries),
+            n_results=k,
+            where=where,
+            include=["documents", "metadatas"],
+        )
+        return [
+            [
+                Document(page_content=text, metadata=metadata or {})
+                for text, metadata in zip(texts, metadatas)
+            ]
+            for texts, metadatas in zip(results["documents"], results["metadatas"])
+        ]
+
+    async def aembed_query(
+        self, query: str, timeout: Optional[float] = settings.SEARCH_TIMEOUT_SECONDS
+    ) -> List[float]:
+        """Async version of `embed_query`, see `asearch`."""
+        return await self._run_search(self.embed_query, query, timeout=timeout)
+
+    async def asearch(
+        self,
+        query: str,
+        k: int = 4,
+        filters: Optional[Dict[str, FilterValue]] = None,
+        timeout: Optional[float] = settings.SEARCH_TIMEOUT_SECONDS,
+    ) -> List[Document]:
+        """
+        Async version of `search`, run on the shared search threads so the
+        query embedding and index search don't block the event loop.
+
+        Parameters
+        ----------
+        query : str
+            The query text.
+
+        k : int, optional
+            Number of documents to return. Default is 4.
+
+        filters : Dict[str, str or Iterable[str]], optional
+            Metadata filters, see `where`.
+
+        timeout : float, optional
+            Seconds to wait for the search, queueing included. Default is
+            `settings.SEARCH_TIMEOUT_SECONDS` (None waits forever).
+
+        Returns
+        -------
+        List[Document]
+            The documents found.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If the search didn't finish in time.
+        """
+        return await self._run_search(self.search, query, k, filters, timeout=timeout)
+
+    async def asearch_jobs(
+        self,
+        query: str,
+        k: int = 4,
+        filters: Optional[Dict[str, FilterValue]] = None,
+        timeout: Optional[float] = settings.SEARCH_TIMEOUT_SECONDS,
+        context_embedding: Optional[List[float]] = None,
+        context_weight: float = settings.RESUME_EMBEDDING_WEIGHT,
+    ) -> List[Document]:
+        """Async version of `search_jobs`, see `asearch`."""
+        return await self._run_search(
+            self.search_jobs,
+            query,
+            k,
+            filters,
+            None,
+            context_embedding,
+            context_weight,
+            timeout=timeout,
+        )
+
+    @staticmethod
+    async def _run_search(function, *args, timeout: Optional[float]):
+        """
+        Runs a search on the shared search threads. On timeout or
+        cancellation, a search still queued is dropped; one already running
+        can't be interrupted and its result is discarded.
+        """
+        future = get_search_executor().submit(function, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        finally:
+            future.cancel()
+
+    def get_jobs(self, job_ids: Iterable[int]) -> List[Optional[Dict[str, str]]]:
+        """
+        Looks up the full job postings behind retrieved chunks, by their
+        `id` metadata, in the snapshot written by the ETL.
+
+        Parameters
+        ----------
+        job_ids : Iterable[int]
+            Job ids, e.g. `[doc.metadata["id"] for doc in documents]`.
+
+        Returns
+        -------
+        List[Optional[Dict[str, str]]]
+            One posting per id, or None where it is unknown or no snapshot
+            is configured (`settings.JOBS_SNAPSHOT_PATH`).
+        """
+        job_ids = list(job_ids)
+        job_store = get_job_store()
+        if job_store is None:
+            return [None] * len(job_ids)
+        return job_store.get_many(job_ids)
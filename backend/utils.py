@@ -1,9 +1,24 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
+from typing import List, Optional, Tuple, Union
 
 from pypdf import PdfReader
 
+from backend.config import settings
 
-def extract_text_from_pdf(pdf_bytes: BytesIO) -> str:
+_pdf_executor = None
+_pdf_executor_lock = threading.Lock()
+
+
+def extract_text_from_pdf(
+    pdf_bytes: BytesIO,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> str:
     """
     Extract text from a PDF file.
 
@@ -12,6 +27,12 @@ def extract_text_from_pdf(pdf_bytes: BytesIO) -> str:
     pdf_bytes : BytesIO
         The PDF file as a BytesIO object.
 
+    max_pages : int, optional
+        Only the first `max_pages` pages are read. Default is all of them.
+
+    max_chars : int, optional
+        The text is truncated to `max_chars` characters. Default is no limit.
+
     Returns
     -------
     pdf_text : str
@@ -36,6 +57,157 @@ def extract_text_from_pdf(pdf_bytes: BytesIO) -> str:
     """
     pdf_text = ""
     reader = PdfReader(pdf_bytes)
-    pdf_text = "".join((page.extract_text() or "") for page in reader.pages)
+    pages = reader.pages if max_pages is None else reader.pages[:max_pages]
+    pdf_text = "".join((page.extract_text() or "") for page in pages)
+
+    return pdf_text[:max_chars]
+
+
+def get_pdf_executor() -> ProcessPoolExecutor:
+    """
+    Returns the process-wide pool of `settings.PDF_WORKERS` processes that
+    extracts the text of uploaded PDFs, off the event loop and the GIL.
+    """
+    global _pdf_executor
+    if _pdf_executor is None:
+        with _pdf_executor_lock:
+            if _pdf_executor is None:
+                # Spawned, as forking a process running an event loop and
+                # threads is unsafe
+                _pdf_executor = ProcessPoolExecutor(
+                    max_workers=settings.PDF_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pdf_executor
+
+
+async def aextract_text_from_pdf(
+    pdf: Union[str, bytes],
+    max_pages: Optional[int] = settings.PDF_MAX_PAGES,
+    max_chars: Optional[int] = settings.PDF_MAX_CHARS,
+    timeout: Optional[float] = settings.PDF_TIMEOUT_SECONDS,
+) -> str:
+    """
+    Async version of `extract_text_from_pdf`, run on the PDF worker
+    processes. Large documents are split into ranges of
+    `settings.PDF_PAGES_PER_TASK` pages extracted in parallel; the text is
+    joined in page order, as `extract_text_from_pdf` returns it.
+
+    Parameters
+    ----------
+    pdf : str or bytes
+        Path or content of the PDF file. A path avoids copying the file to
+        every worker.
+
+    max_pages : int, optional
+        Only the first `max_pages` pages are read. Default is
+        `settings.PDF_MAX_PAGES` (None reads all of them).
+
+    max_chars : int, optional
+        The text is truncated to `max_chars` characters. Default is
+        `settings.PDF_MAX_CHARS` (None for no limit).
+
+    timeout : float, optional
+        Seconds to wait for the whole extraction, queueing included.
+        Default is `settings.PDF_TIMEOUT_SECONDS` (None waits forever).
+
+    Returns
+    -------
+    pdf_text : str
+        The extracted text from the PDF file.
+
+    Raises
+    ------
+    asyncio.TimeoutError
+        If the extraction didn't finish in time. The pool of PDF workers is
+        then replaced, as its processes may be stuck on the file.
+
+    BrokenProcessPool
+        If the pool was retired twice during the extraction, by the timeouts
+        of other extractions.
+    """
+    try:
+        pages = await _extract_on(get_pdf_executor(), pdf, max_pages, timeout)
+    except BrokenProcessPool:
+        # The pool was retired by the timeout of another extraction
+        pages = await _extract_on(get_pdf_executor(), pdf, max_pages, timeout)
+    pdf_text = "".join(pages)
+
+    return pdf_text[:max_chars]
+
+
+async def _extract_on(
+    executor: ProcessPoolExecutor,
+    pdf: Union[str, bytes],
+    max_pages: Optional[int],
+    timeout: Optional[float],
+) -> List[str]:
+    """
+    Extracts the text of each page on a pool, see `aextract_text_from_pdf`.
+    On timeout, the pool is retired, so workers stuck on a pathological
+    PDF don't hold on to it.
+    """
+    pages_per_task = settings.PDF_PAGES_PER_TASK
+    futures = []
+
+    def submit(start: int, end: int) -> None:
+        try:
+            futures.append(executor.submit(_extract_pages, pdf, start, end))
+        except RuntimeError as e:
+            # Shut down by the timeout of another extraction since the first
+            # range, which `BrokenProcessPool` stands for to the caller
+            raise BrokenProcessPool("The PDF pool was retired") from e
+
+    async def extract() -> List[str]:
+        # The first range also tells the number of pages
+        submit(0, pages_per_task)
+        first_pages, n_pages = await asyncio.wrap_future(futures[0])
+        if max_pages is not None:
+            n_pages = min(n_pages, max_pages)
+        for start in range(pages_per_task, n_pages, pages_per_task):
+            end = min(start + pages_per_task, n_pages)
+            submit(start, end)
+        ranges = await asyncio.gather(*map(asyncio.wrap_future, futures[1:]))
+        # The first range may go past `max_pages`
+        return first_pages[:n_pages] + [
+            page for pages, _ in ranges for page in pages
+        ]
+
+    try:
+        return await asyncio.wait_for(extract(), timeout)
+    except asyncio.TimeoutError:
+        _retire_pdf_executor(executor)
+        raise
+    finally:
+        # Drops the ranges still queued after a timeout or cancellation
+        for future in futures:
+            future.cancel()
+
+
+def _retire_pdf_executor(executor: ProcessPoolExecutor) -> None:
+    """
+    Shuts a PDF pool down and terminates its processes, as a running
+    extraction can't be cancelled otherwise; the next extraction starts a
+    fresh pool. The ranges of other sessions still on it aren't cancelled:
+    the dead processes break the pool, so they fail with `BrokenProcessPool`
+    and are retried on the fresh pool.
+    """
+    global _pdf_executor
+    with _pdf_executor_lock:
+        if _pdf_executor is executor:
+            _pdf_executor = None
+    # `shutdown` forgets the processes, and there is no public way to stop
+    # them before Python 3.14
+    processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False)
+    for process in processes:
+        process.terminate()
+
 
-    return pdf_text
+def _extract_pages(
+    pdf: Union[str, bytes], start: int, end: int
+) -> Tuple[List[str], int]:
+    """Text of the pages [start, end) of a PDF, and its number of pages."""
+    reader = PdfReader(BytesIO(pdf) if isinstance(pdf, bytes) else pdf)
+    pages = reader.pages[start:end]
+    return [page.extract_text() or "" for page in pages], len(reader.pages)
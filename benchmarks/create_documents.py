@@ -0,0 +1,81 @@
+"""
+Benchmarks `ETLProcessor.create_documents` against the previous row by row
+(`DataFrame.iterrows`) implementation on a synthetic jobs.csv.
+
+Usage: python -m benchmarks.create_documents --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import List
+
+import pandas as pd
+from langchain.docstore.document import Document
+
+from backend.etl import ETLProcessor, JOB_COLUMNS, job_hash
+from benchmarks.synthetic_jobs import write_jobs_csv
+
+
+def create_documents_iterrows(descriptions: pd.DataFrame) -> List[Document]:
+    """The `create_documents` implementation this benchmark compares with."""
+    output_documents = []
+    for idx, row in descriptions.iterrows():
+        metadata = {
+            "employment_type": row["Employment type"],
+            "seniority_level": row["Seniority level"],
+            "company": row["company"],
+            "location": row["location"],
+            "post_url": row["post_url"],
+            "title": row["title"],
+            "id": idx,
+            "job_hash": job_hash(row),
+        }
+        doc = Document(page_content=row["description"], metadata=metadata)
+        output_documents.append(doc)
+
+    return output_documents
+
+
+def create_documents_columnar(descriptions: pd.DataFrame) -> List[Document]:
+    # Same code path as ETLProcessor.create_documents, without loading the
+    # embedding model that the constructor requires
+    return list(ETLProcessor._frame_documents(descriptions))
+
+
+def timed(function, descriptions: pd.DataFrame):
+    start = time.perf_counter()
+    documents = function(descriptions)
+    return documents, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument(
+        "--dataset", help="Existing jobs.csv to use instead of a synthetic one."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dataset = args.dataset or write_jobs_csv(
+            os.path.join(tmp_dir, "jobs.csv"), args.rows
+        )
+        descriptions = pd.read_csv(dataset)[JOB_COLUMNS].dropna()
+
+    print(f"{len(descriptions)} rows")
+    results = {}
+    for name, function in [
+        ("iterrows", create_documents_iterrows),
+        ("columnar", create_documents_columnar),
+    ]:
+        documents, seconds = timed(function, descriptions)
+        results[name] = (documents, seconds)
+        print(f"{name}: {seconds:.2f}s ({len(documents) / seconds:,.0f} rows/sec)")
+
+    assert results["iterrows"][0] == results["columnar"][0]
+    print(f"speed-up: {results['iterrows'][1] / results['columnar'][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
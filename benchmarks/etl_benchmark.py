@@ -0,0 +1,188 @@
+"""
+Stage-by-stage benchmark of the ETL on a synthetic (or given) jobs.csv.
+
+Runs `load_data`, `create_documents`, `split_documents` and
+`process_batches` in isolation, then `run_etl` end to end on a fresh
+index, and reports rows/sec, chunks/sec, peak RSS and on-disk index size.
+
+Usage: python -m benchmarks.etl_benchmark --rows 100000 --fake-embedder
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+from typing import Dict, List
+from unittest.mock import patch
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from backend.etl import ETLProcessor
+from benchmarks.synthetic_jobs import write_jobs_csv
+
+# Output size of the default embedding model, paraphrase-MiniLM-L6-v2
+FAKE_EMBEDDING_SIZE = 384
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in megabytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def directory_size_mb(path: str) -> float:
+    """Total size of the files under a directory, in megabytes."""
+    size = 0
+    for root, _, files in os.walk(path):
+        size += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return size / (1024 * 1024)
+
+
+def timed(function):
+    """Calls `function`, returning its output and the elapsed seconds."""
+    start = time.perf_counter()
+    output = function()
+    return output, time.perf_counter() - start
+
+
+def record(stage: str, seconds: float, count: int, unit: str, **extra) -> Dict:
+    """Builds the result row of one stage."""
+    return {
+        "stage": stage,
+        "seconds": round(seconds, 3),
+        "count": count,
+        f"{unit}_per_sec": round(count / seconds if seconds else 0.0, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        **extra,
+    }
+
+
+def benchmark(args: argparse.Namespace, dataset: str, work_dir: str) -> List[Dict]:
+    """Runs every stage, then the whole ETL, and returns one row per run."""
+
+    def make_processor(persist_directory: str) -> ETLProcessor:
+        return ETLProcessor(
+            batch_size=args.batch_size,
+            chunk_size=args.chunk_size,
+            chunk_overlap=args.chunk_overlap,
+            dataset_path=dataset,
+            collection_name="benchmark",
+            persist_directory=persist_directory,
+            read_chunksize=args.chunksize,
+            split_workers=args.split_workers,
+            embedding_workers=args.workers,
+            write_batch_size=args.write_batch_size,
+            embedding_cache_path=None,
+            snapshot_path=None,
+        )
+
+    results = []
+    stages_dir = os.path.join(work_dir, "stages")
+    etl_processor = make_processor(stages_dir)
+
+    df, seconds = timed(etl_processor.load_data)
+    results.append(record("load_data", seconds, len(df), "rows"))
+
+    docs, seconds = timed(lambda: etl_processor.create_documents(df))
+    results.append(record("create_documents", seconds, len(docs), "rows"))
+    del df
+
+    if args.split_workers > 1:
+        splits, seconds = timed(lambda: list(etl_processor.iter_splits(docs)))
+    else:
+        splits, seconds = timed(lambda: etl_processor.split_documents(docs))
+    results.append(record("split_documents", seconds, len(splits), "chunks"))
+    del docs
+
+    if args.workers > 1:
+        _, seconds = timed(lambda: etl_processor.process_batches_parallel(splits))
+    else:
+        _, seconds = timed(lambda: etl_processor.process_batches(splits))
+    results.append(
+        record(
+            "process_batches",
+            seconds,
+            len(splits),
+            "chunks",
+            index_mb=round(directory_size_mb(stages_dir), 1),
+        )
+    )
+    n_chunks = len(splits)
+    del splits
+
+    end_to_end_dir = os.path.join(work_dir, "end_to_end")
+    _, seconds = timed(make_processor(end_to_end_dir).run_etl)
+    results.append(
+        record(
+            "run_etl",
+            seconds,
+            n_chunks,
+            "chunks",
+            index_mb=round(directory_size_mb(end_to_end_dir), 1),
+        )
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument(
+        "--dataset", help="Existing jobs.csv to use instead of a synthetic one."
+    )
+    parser.add_argument(
+        "--fake-embedder",
+        action="store_true",
+        help="Use a deterministic fake embedder, so the benchmark runs offline.",
+    )
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--chunk-overlap", type=int, default=100)
+    parser.add_argument("--chunksize", type=int, help="Stream the csv in chunks.")
+    parser.add_argument("--split-workers", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--write-batch-size", type=int, default=1000)
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args()
+
+    if args.fake_embedder and args.workers > 1:
+        parser.error("--fake-embedder needs in-process embedding (--workers 1)")
+
+    fake_embedder = (
+        patch(
+            "backend.etl.SentenceTransformerEmbeddings",
+            lambda model_name: DeterministicFakeEmbedding(size=FAKE_EMBEDDING_SIZE),
+        )
+        if args.fake_embedder
+        else nullcontext()
+    )
+    with tempfile.TemporaryDirectory() as work_dir, fake_embedder:
+        dataset = args.dataset or write_jobs_csv(
+            os.path.join(work_dir, "jobs.csv"), args.rows
+        )
+        results = benchmark(args, dataset, work_dir)
+
+    columns = [
+        "stage",
+        "seconds",
+        "count",
+        "rows_per_sec",
+        "chunks_per_sec",
+        "peak_rss_mb",
+        "index_mb",
+    ]
+    print(" | ".join(f"{column:>16}" for column in columns))
+    for result in results:
+        print(" | ".join(f"{str(result.get(column, '')):>16}" for column in columns))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Measures the memory and recall@k of the quantized NumPy stores (int8 and
+product quantization, with and without float re-scoring of a shortlist)
+against the exact float32 store, on clustered synthetic embeddings.
+
+Usage: python -m benchmarks.quantization --chunks 200000 --dim 384
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from backend.numpy_store import NumpyCollection, export_collection
+
+
+class ArrayCollection:
+    """Minimal in-memory stand-in for a Chroma collection, to export from."""
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = vectors
+
+    def count(self) -> int:
+        return len(self.vectors)
+
+    def get(self, limit: int, offset: int, include: List[str]) -> Dict[str, list]:
+        positions = range(offset, min(offset + limit, len(self.vectors)))
+        return {
+            "ids": [str(i) for i in positions],
+            "embeddings": self.vectors[offset: offset + limit],
+            "documents": [""] * len(positions),
+            "metadatas": [{"id": i} for i in positions],
+        }
+
+
+def clustered_vectors(
+    n: int, dim: int, n_clusters: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Unit vectors around random centres, shaped more like text embeddings."""
+    centres = rng.normal(size=(n_clusters, dim))
+    vectors = centres[rng.integers(n_clusters, size=n)] + 0.6 * rng.normal(
+        size=(n, dim)
+    )
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def search(collection: NumpyCollection, queries: np.ndarray, k: int):
+    """Runs every query, returning the ids found and the p50 latency in ms."""
+    ids, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        result = collection.query(query_embeddings=[query], n_results=k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        ids.append(set(result["ids"][0]))
+    return ids, float(np.percentile(latencies, 50))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--shortlist", type=int, default=100)
+    parser.add_argument("--pq-subvectors", type=int, default=48)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = clustered_vectors(args.chunks + args.queries, args.dim, 1000, rng)
+    vectors, queries = vectors[: args.chunks], vectors[args.chunks:]
+    collection = ArrayCollection(vectors)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        exact_path = os.path.join(tmp_dir, "exact")
+        export_collection(collection, exact_path)
+        exact = NumpyCollection(exact_path, mmap=False)
+        exact_ids, exact_ms = search(exact, queries, args.k)
+        print(f"{args.chunks} chunks of {args.dim} dimensions, recall@{args.k}")
+        print(
+            f"{'float32':>24}: {exact.embeddings.nbytes / 2**20:8.1f} MiB, "
+            f"recall 1.000, p50 {exact_ms:.2f} ms"
+        )
+
+        for quantization in ["int8", "pq"]:
+            path = os.path.join(tmp_dir, quantization)
+            start = time.perf_counter()
+            export_collection(
+                collection,
+                path,
+                quantization=quantization,
+                pq_subvectors=args.pq_subvectors,
+            )
+            build_seconds = time.perf_counter() - start
+            # A shortlist of k skips the re-scoring, showing the raw recall
+            for shortlist in [args.k, args.shortlist]:
+                quantized = NumpyCollection(path, shortlist=shortlist)
+                found, ms = search(quantized, queries, args.k)
+                recall = np.mean(
+                    [len(a & b) / args.k for a, b in zip(found, exact_ids)]
+                )
+                name = f"{quantization} shortlist={shortlist}"
+                print(
+                    f"{name:>24}: {quantized.quantized.nbytes / 2**20:8.1f} MiB, "
+                    f"recall {recall:.3f}, p50 {ms:.2f} ms "
+                    f"(built in {build_seconds:.1f}s)"
+                )
+
+
+if __name__ == "__main__":
+    main()
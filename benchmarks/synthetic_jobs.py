@@ -0,0 +1,155 @@
+"""
+Generator of synthetic job postings with the same columns as
+`dataset/jobs.csv`, used by the ETL benchmarks.
+"""
+import argparse
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+TITLES = [
+    "Software Engineer",
+    "Senior Data Engineer",
+    "Machine Learning Engineer",
+    "Backend Developer",
+    "Frontend Developer",
+    "DevOps Engineer",
+    "Product Manager",
+    "Data Scientist",
+    "QA Automation Engineer",
+    "Site Reliability Engineer",
+]
+COMPANIES = [f"Company {i}" for i in range(500)]
+LOCATIONS = [
+    "Berlin, Berlin, Germany",
+    "London, England, United Kingdom",
+    "New York, NY",
+    "San Francisco, CA",
+    "Buenos Aires, Argentina",
+    "Madrid, Community of Madrid, Spain",
+    "Toronto, ON, Canada",
+    "Remote",
+]
+EMPLOYMENT_TYPES = ["Full-time", "Part-time", "Contract", "Internship"]
+SENIORITY_LEVELS = [
+    "Entry level",
+    "Associate",
+    "Mid-Senior level",
+    "Director",
+    "Not Applicable",
+]
+SENTENCES = [
+    "We are looking for a motivated engineer to join our growing team.",
+    "You will design, build and maintain scalable backend services in Python.",
+    "Experience with Kubernetes, Docker and cloud platforms such as AWS or GCP is a plus.",
+    "Strong knowledge of SQL and data modelling is required.",
+    "You will collaborate with product managers, designers and other engineers.",
+    "Familiarity with React, TypeScript and modern frontend tooling is appreciated.",
+    "We offer flexible working hours, remote options and a learning budget.",
+    "You have at least three years of professional software development experience.",
+    "Knowledge of machine learning frameworks such as PyTorch or TensorFlow is desirable.",
+    "You care about code quality, testing and continuous delivery.",
+    "Our stack includes Spark, Airflow, Kafka and dbt.",
+    "Fluent English is required; Spanish or German is a plus.",
+    "You will mentor junior team members and take part in code reviews.",
+    "We value diversity and encourage candidates of all backgrounds to apply.",
+    "The role includes on-call rotations for production incidents.",
+    "Certifications such as AWS Solutions Architect or CKA are welcome.",
+]
+
+
+def generate_jobs(
+    n_rows: int,
+    seed: int = 0,
+    sentences_per_job: Tuple[int, int] = (3, 12),
+    missing_rate: float = 0.01,
+) -> pd.DataFrame:
+    """
+    Generates a DataFrame of synthetic job postings.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of job postings to generate.
+
+    seed : int, optional
+        Seed of the random generator. Default is 0.
+
+    sentences_per_job : Tuple[int, int], optional
+        Minimum and maximum number of sentences in each description.
+        Default is (3, 12), i.e. roughly 200 to 900 characters.
+
+    missing_rate : float, optional
+        Fraction of rows with a missing "Employment type", which the ETL
+        drops. Default is 0.01.
+
+    Returns
+    -------
+    pd.DataFrame
+        Job postings with the columns of `dataset/jobs.csv`, plus an extra
+        "date" column that the ETL ignores.
+    """
+    rng = np.random.default_rng(seed)
+    n_sentences = rng.integers(*sentences_per_job, endpoint=True, size=n_rows)
+    sentence_ids = rng.integers(len(SENTENCES), size=n_sentences.sum())
+    offsets = np.concatenate([[0], np.cumsum(n_sentences)])
+    descriptions = [
+        " ".join(SENTENCES[j] for j in sentence_ids[offsets[i]: offsets[i + 1]])
+        for i in range(n_rows)
+    ]
+
+    employment_type = np.array(EMPLOYMENT_TYPES, dtype=object)[
+        rng.integers(len(EMPLOYMENT_TYPES), size=n_rows)
+    ]
+    employment_type[rng.random(n_rows) < missing_rate] = None
+
+    def pick(values):
+        return np.array(values, dtype=object)[rng.integers(len(values), size=n_rows)]
+
+    return pd.DataFrame(
+        {
+            "description": descriptions,
+            "Employment type": employment_type,
+            "Seniority level": pick(SENIORITY_LEVELS),
+            "company": pick(COMPANIES),
+            "location": pick(LOCATIONS),
+            "post_url": [f"https://jobs.example.com/view/{i}" for i in range(n_rows)],
+            "title": pick(TITLES),
+            "date": "2024-01-01",
+        }
+    )
+
+
+def write_jobs_csv(path: str, n_rows: int, seed: int = 0) -> str:
+    """
+    Writes `n_rows` synthetic job postings to a csv file.
+
+    Parameters
+    ----------
+    path : str
+        Destination csv file.
+
+    n_rows : int
+        Number of job postings to generate.
+
+    seed : int, optional
+        Seed of the random generator. Default is 0.
+
+    Returns
+    -------
+    str
+        The path of the written file.
+    """
+    generate_jobs(n_rows, seed=seed).to_csv(path, index=False)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic jobs.csv.")
+    parser.add_argument("output", help="Destination csv file.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    write_jobs_csv(args.output, args.rows, seed=args.seed)
@@ -0,0 +1,79 @@
+"""
+Compares the query latency of the Chroma and NumPy vector backends on
+random embeddings.
+
+Usage: python -m benchmarks.vector_backends --chunks 100000 --dim 384
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+import chromadb
+import numpy as np
+
+from backend.numpy_store import NumpyCollection, export_collection
+
+
+def latencies_ms(
+    search: Callable[[np.ndarray], object], queries: np.ndarray
+) -> List[float]:
+    """Times one search per query, in milliseconds."""
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(args.chunks, args.dim)).astype(np.float32)
+    queries = rng.normal(size=(args.queries, args.dim)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        client = chromadb.PersistentClient(path=tmp_dir)
+        collection = client.create_collection("benchmark")
+        batch_size = client.get_max_batch_size()
+        for start in range(0, args.chunks, batch_size):
+            end = min(start + batch_size, args.chunks)
+            collection.add(
+                ids=[str(i) for i in range(start, end)],
+                embeddings=vectors[start:end],
+                documents=[f"chunk {i}" for i in range(start, end)],
+                metadatas=[{"id": i} for i in range(start, end)],
+            )
+        numpy_path = os.path.join(tmp_dir, "numpy_store")
+        export_collection(collection, numpy_path, dtype=args.dtype)
+        numpy_collection = NumpyCollection(numpy_path)
+
+        backends = {
+            "chroma": lambda query: collection.query(
+                query_embeddings=[query], n_results=args.k
+            ),
+            "numpy": lambda query: numpy_collection.query(
+                query_embeddings=[query], n_results=args.k
+            ),
+        }
+        print(f"{args.chunks} chunks of {args.dim} dimensions, k={args.k}")
+        for name, search in backends.items():
+            search(queries[0])
+            latencies = latencies_ms(search, queries)
+            print(
+                f"{name}: p50 {np.percentile(latencies, 50):.2f} ms, "
+                f"p95 {np.percentile(latencies, 95):.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
 from langchain.chains import LLMChain
 from langchain.memory import ConversationBufferWindowMemory
 from langchain.prompts import PromptTemplate
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
 from langchain_openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
 
@@ -38,4 +43,26 @@ def test_structure_chat_assistant():
     assert chat_assistant.model.prompt == chat_assistant.prompt
     assert chat_assistant.model.verbose == settings.LANGCHAIN_VERBOSE
     assert chat_assistant.model.memory.k == 2
-    assert chat_assistant.model.memory.k == 2
\ No newline at end of file
+    assert chat_assistant.model.memory.k == 2
+
+
+def test_chat_assistant_apredict():
+    chat_assistant = ChatAssistant(llm_model="gpt-3.5-turbo", api_key="api_key")
+    chat_assistant.model = MagicMock()
+    chat_assistant.model.ainvoke = AsyncMock(return_value={"text": "answer"})
+
+    assert asyncio.run(chat_assistant.apredict("question")) == "answer"
+    chat_assistant.model.ainvoke.assert_awaited_once_with({"human_input": "question"})
+    chat_assistant.model.invoke.assert_not_called()
+
+
+def test_chat_assistant_astream():
+    chat_assistant = ChatAssistant(llm_model="gpt-3.5-turbo", api_key="api_key")
+    chat_assistant.model.llm = GenericFakeChatModel(
+        messages=iter([AIMessage(content="42 of course")])
+    )
+
+    async def collect():
+        return [token async for token in chat_assistant.astream("question")]
+
+    assert "".join(asyncio.run(collect())) == "42 of course"
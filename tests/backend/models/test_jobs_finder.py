@@ -1,6 +1,11 @@
-from unittest.mock import MagicMock, patch
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
 
 from langchain.agents import AgentExecutor
+from langchain.schema.document import Document
 from langchain_openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
 
@@ -46,4 +51,88 @@ def test_jobs_finder_agent(resume_summarizer_chain_mock):
     assert job_finder_agent.agent_executor.tools[0].name == "jobs_finder"
     assert (
         job_finder_agent.agent_executor.tools[1].name == "cover_letter_writing"
-    )
\ No newline at end of file
+    )
+
+
+@patch("backend.models.jobs_finder.Retriever")
+@patch("backend.models.jobs_finder.resume_summarizer")
+def test_jobs_finder_summarizes_resume_in_background(
+    resume_summarizer_mock, retriever_mock
+):
+    summarize = threading.Event()
+    resume_summarizer_mock.invoke.side_effect = lambda resume: (
+        summarize.wait(5) and {"text": f"summary of {resume}"}
+    )
+    retriever = retriever_mock.return_value
+    retriever.embed_query.return_value = [1.0]
+    retriever.asearch_jobs = AsyncMock(return_value=[Document(page_content="job")])
+
+    # The session starts before the resume is summarized
+    jobs_finder = JobsFinderAssistant(
+        resume="resume", llm_model="gpt-3.5-turbo", api_key="api_key"
+    )
+    assert not jobs_finder.resume_summary_future.done()
+
+    jobs_finder.model = MagicMock()
+    jobs_finder.model.ainvoke = AsyncMock(return_value={"text": "answer"})
+    summarize.set()
+    assert asyncio.run(jobs_finder.apredict("python jobs")) == "answer"
+
+    # The summary and its embedding were computed once, in the background
+    assert jobs_finder.resume_summary == "summary of resume"
+    retriever.embed_query.assert_called_once_with("summary of resume")
+    retriever.asearch_jobs.assert_awaited_once_with(
+        "python jobs", context_embedding=[1.0]
+    )
+    assert jobs_finder.model.ainvoke.call_args.args[0]["resume_summary"] == (
+        "summary of resume"
+    )
+
+
+@patch("backend.models.jobs_finder.Retriever")
+@patch("backend.models.jobs_finder.resume_summarizer")
+def test_jobs_finder_with_resume_summary(resume_summarizer_mock, retriever_mock):
+    jobs_finder = JobsFinderAssistant(
+        resume="resume",
+        llm_model="gpt-3.5-turbo",
+        api_key="api_key",
+        resume_summary="cached summary",
+    )
+
+    assert jobs_finder.resume_summary == "cached summary"
+    resume_summarizer_mock.invoke.assert_not_called()
+
+
+@patch("backend.models.jobs_finder.Retriever")
+@patch("backend.models.jobs_finder.resume_summarizer")
+def test_jobs_finder_embeds_resume_again_after_background_failure(
+    resume_summarizer_mock, retriever_mock, caplog
+):
+    retriever = retriever_mock.return_value
+    retriever.embed_query.side_effect = RuntimeError("embeddings unavailable")
+    retriever.aembed_query = AsyncMock(return_value=[1.0])
+    retriever.asearch_jobs = AsyncMock(return_value=[Document(page_content="job")])
+
+    jobs_finder = JobsFinderAssistant(
+        resume="resume",
+        llm_model="gpt-3.5-turbo",
+        api_key="api_key",
+        resume_summary="cached summary",
+    )
+    jobs_finder.model = MagicMock()
+    jobs_finder.model.ainvoke = AsyncMock(return_value={"text": "answer"})
+    jobs_finder.resume_summary_future.result()
+    assert "embeddings unavailable" in caplog.text
+
+    # The background failure is logged, and the first search embeds again
+    assert asyncio.run(jobs_finder.apredict("python jobs")) == "answer"
+    retriever.aembed_query.assert_awaited_once_with("cached summary")
+    retriever.asearch_jobs.assert_awaited_once_with(
+        "python jobs", context_embedding=[1.0]
+    )
+
+    # Only a fresh failure reaches the user
+    jobs_finder._resume_embedding = None
+    retriever.aembed_query.side_effect = RuntimeError("still unavailable")
+    with pytest.raises(RuntimeError, match="still unavailable"):
+        asyncio.run(jobs_finder.apredict("python jobs"))
@@ -1,12 +1,14 @@
+import asyncio
 from unittest.mock import MagicMock, patch
 
 from langchain.agents import AgentExecutor
+from langchain_core.messages import AIMessageChunk
 from langchain_openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 from backend.config import settings
 from backend.models.jobs_finder import JobsFinderAssistant
-from backend.models.jobs_finder_agent import JobsFinderAgent
+from backend.models.jobs_finder_agent import AGENT_LLM_TAG, JobsFinderAgent
 
 
 @patch("backend.models.jobs_finder.resume_summarizer")
@@ -46,4 +48,103 @@ def test_jobs_finder_agent(resume_summarizer_chain_mock):
     assert job_finder_agent.agent_executor.tools[0].name == "jobs_finder"
     assert (
         job_finder_agent.agent_executor.tools[1].name == "cover_letter_writing"
-    )
\ No newline at end of file
+    )
+
+
+def test_final_answer_token():
+    texts = {}
+    tokens = ["Thought: done\nFinal", " Answer", ":", " ", "Two", " jobs"]
+
+    streamed = [
+        JobsFinderAgent._final_answer_token(texts, "run", token) for token in tokens
+    ]
+
+    assert streamed == ["", "", "", "", "Two", " jobs"]
+    assert JobsFinderAgent._final_answer_token(texts, "other", "Thought:") == ""
+
+
+def agent_llm_events(run_id, chunks):
+    tags = [AGENT_LLM_TAG]
+    for chunk in chunks:
+        yield {
+            "event": "on_chat_model_stream",
+            "run_id": run_id,
+            "tags": tags,
+            "parent_ids": ["agent"],
+            "data": {"chunk": chunk},
+        }
+    yield {
+        "event": "on_chat_model_end",
+        "run_id": run_id,
+        "tags": tags,
+        "parent_ids": ["agent"],
+        "data": {},
+    }
+
+
+def test_astream_openai_skips_tool_calling_messages(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "openai")
+    tool_call = {"name": "jobs_finder", "args": "", "id": "call", "index": 0}
+    events = [
+        # Content in the same message as a tool call
+        *agent_llm_events(
+            "tool run",
+            [
+                AIMessageChunk(content="", tool_call_chunks=[tool_call]),
+                AIMessageChunk(content="Let me search"),
+            ],
+        ),
+        *agent_llm_events(
+            "function run",
+            [
+                AIMessageChunk(
+                    content="Searching",
+                    additional_kwargs={"function_call": {"name": "jobs_finder"}},
+                ),
+                AIMessageChunk(content=" jobs"),
+            ],
+        ),
+        # An LLM call of a tool
+        {
+            "event": "on_chat_model_stream",
+            "run_id": "tool llm",
+            "tags": [],
+            "parent_ids": ["agent", "tool"],
+            "data": {"chunk": AIMessageChunk(content="job list")},
+        },
+        *agent_llm_events(
+            "answer run",
+            [
+                AIMessageChunk(content="Two"),
+                AIMessageChunk(content=" jobs"),
+                AIMessageChunk(content=" found"),
+            ],
+        ),
+        {
+            "event": "on_chain_end",
+            "run_id": "agent",
+            "tags": [],
+            "parent_ids": [],
+            "data": {"output": {"output": "Two jobs found"}},
+        },
+    ]
+
+    async def astream_events(inputs, version):
+        for event in events:
+            yield event
+
+    agent = JobsFinderAgent.__new__(JobsFinderAgent)
+    agent.agent_executor = MagicMock()
+    agent.agent_executor.astream_events = astream_events
+    agent.agent_memory = []
+    agent.history_length = 2
+
+    async def collect():
+        return [token async for token in agent.astream("python jobs")]
+
+    # The final answer is streamed token by token
+    assert asyncio.run(collect()) == ["Two", " jobs", " found"]
+    assert [message.content for message in agent.agent_memory] == [
+        "python jobs",
+        "Two jobs found",
+    ]
@@ -1,7 +1,11 @@
 from unittest.mock import MagicMock, patch
 
 from backend.config import settings
-from backend.models.resume_summarizer_chain import get_resume_summarizer_chain, template
+from backend.models.resume_summarizer_chain import (
+    get_resume_summarizer_chain,
+    resume_summarizer_version,
+    template,
+)
 
 
 @patch("backend.models.resume_summarizer_chain.PromptTemplate")
@@ -42,4 +46,15 @@ def test_get_resume_summarizer_chain(
     )
 
     # Assert that the get_resume_summarizer_chain function returns the expected result
-    assert resume_summarizer_chain == llm_chain_mock
\ No newline at end of file
+    assert resume_summarizer_chain == llm_chain_mock
+
+
+def test_resume_summarizer_version(monkeypatch):
+    version = resume_summarizer_version()
+    assert resume_summarizer_version() == version
+
+    monkeypatch.setattr(settings, "LLM_PROVIDER", "openai")
+    monkeypatch.setattr(settings, "OPENAI_LLM_MODEL", "model-a")
+    version_a = resume_summarizer_version()
+    monkeypatch.setattr(settings, "OPENAI_LLM_MODEL", "model-b")
+    assert resume_summarizer_version() != version_a
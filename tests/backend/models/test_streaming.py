@@ -0,0 +1,34 @@
+import asyncio
+
+from langchain.chains import LLMChain
+from langchain.memory import ConversationBufferWindowMemory
+from langchain.prompts import PromptTemplate
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from backend.models.streaming import astream_chain
+
+
+async def collect(tokens):
+    return [token async for token in tokens]
+
+
+def test_astream_chain():
+    llm = GenericFakeChatModel(
+        messages=iter([AIMessage(content="Hello there"), AIMessage(content="Again")])
+    )
+    chain = LLMChain(
+        llm=llm,
+        prompt=PromptTemplate.from_template("{history}\nHuman: {human_input}"),
+        memory=ConversationBufferWindowMemory(k=2),
+    )
+
+    tokens = asyncio.run(collect(astream_chain(chain, {"human_input": "Hi"})))
+
+    assert tokens == ["Hello", " ", "there"]
+    # The turn is saved to memory, and used by the next prompt
+    assert chain.memory.load_memory_variables({})["history"] == (
+        "Human: Hi\nAI: Hello there"
+    )
+    asyncio.run(collect(astream_chain(chain, {"human_input": "Bye"})))
+    assert "AI: Again" in chain.memory.load_memory_variables({})["history"]
@@ -0,0 +1,54 @@
+from unittest.mock import MagicMock
+
+from backend.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+def test_embedding_cache_get_put(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite"), max_bytes=1024)
+
+    cache.put_many("model", ["python  developer"], [[1.0, 2.0]])
+
+    assert cache.get_many("model", ["python developer", "java developer"]) == [
+        [1.0, 2.0],
+        None,
+    ]
+    assert cache.get_many("other-model", ["python developer"]) == [None]
+
+    # The cache persists across instances
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite"), max_bytes=1024)
+    assert cache.get_many("model", ["python developer"]) == [[1.0, 2.0]]
+
+
+def test_embedding_cache_evicts_least_recently_used(tmp_path):
+    # Room for 4 vectors of 4 float32 values
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite"), max_bytes=64)
+    for i in range(4):
+        cache.put_many("model", [f"text {i}"], [[float(i)] * 4])
+    cache.get_many("model", ["text 0"])
+
+    cache.put_many("model", ["text 4"], [[4.0] * 4])
+
+    assert cache.size_bytes() <= 64
+    assert cache.get_many("model", ["text 0"]) == [[0.0] * 4]
+    assert cache.get_many("model", ["text 1"]) == [None]
+    assert cache.get_many("model", ["text 4"]) == [[4.0] * 4]
+
+
+def test_cached_embeddings(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite"), max_bytes=1024)
+    embeddings_mock = MagicMock()
+    embeddings_mock.embed_documents.side_effect = lambda texts: [
+        [float(len(text))] for text in texts
+    ]
+    embeddings_mock.embed_query.side_effect = lambda text: [float(len(text))]
+    embeddings = CachedEmbeddings(embeddings_mock, cache, "model")
+
+    assert embeddings.embed_documents(["a", "bb"]) == [[1.0], [2.0]]
+    assert embeddings.embed_documents(["bb", "ccc"]) == [[2.0], [3.0]]
+    assert embeddings.embed_query("ccc") == [3.0]
+    assert embeddings.embed_query("dddd") == [4.0]
+
+    assert [
+        call.args[0] for call in embeddings_mock.embed_documents.call_args_list
+    ] == [["a", "bb"], ["ccc"]]
+    embeddings_mock.embed_query.assert_called_once_with("dddd")
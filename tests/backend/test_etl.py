@@ -1,11 +1,16 @@
-from unittest.mock import MagicMock, patch
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
 import pandas as pd
+import pytest
+from langchain.docstore.document import Document
 
-from backend.etl import ETLProcessor
+from backend.etl import ETLProcessor, chunk_id, job_hash, job_hashes
+from backend.lexical_index import LEXICAL_INDEX_DIR, LexicalIndex
+from backend.metadata_index import METADATA_INDEX_FILE, MetadataIndex
 
 
-@patch("backend.etl.Chroma.from_documents")
+@patch("backend.etl.Chroma")
 @patch("backend.etl.SentenceTransformerEmbeddings")
 @patch("backend.etl.RecursiveCharacterTextSplitter")
 @patch("backend.etl.pd.read_csv")
@@ -14,6 +19,7 @@ def test_run_etl(
     text_splitter_mock,
     sentence_transformer_mock,
     chroma_mock,
+    tmp_path,
 ):
     # Mock the necessary dependencies
     pd_read_csv_mock.return_value = pd.DataFrame(
@@ -27,10 +33,22 @@ def test_run_etl(
             "title": ["title 1", "title 2"],
         }
     )
-    text_splitter_mock.return_value.split_documents.return_value = [
-        MagicMock(),
-        MagicMock(),
+    splits = [
+        Document(
+            page_content="description 1",
+            metadata={"id": 0, "job_hash": "hash1", "start_index": 0},
+        ),
+        Document(
+            page_content="description 2",
+            metadata={"id": 1, "job_hash": "hash2", "start_index": 0},
+        ),
     ]
+    text_splitter_mock.return_value.split_documents.return_value = splits
+    sentence_transformer_mock.return_value.embed_documents.return_value = [
+        [0.1],
+        [0.2],
+    ]
+    chroma_mock.return_value._client.get_max_batch_size.return_value = 5461
 
     # Create an instance of ETLProcessor
     etl_processor = ETLProcessor(
@@ -40,7 +58,7 @@ def test_run_etl(
         dataset_path="test_dataset.csv",
         embedding_model="test_model",
         collection_name="test_collection",
-        persist_directory="test_directory",
+        persist_directory=str(tmp_path),
     )
 
     # Run the ETL process
@@ -56,8 +74,366 @@ def test_run_etl(
     )
     sentence_transformer_mock.assert_called_once_with(model_name="test_model")
     chroma_mock.assert_called_once_with(
-        text_splitter_mock.return_value.split_documents.return_value,
-        embedding=sentence_transformer_mock.return_value,
         collection_name="test_collection",
-        persist_directory="test_directory",
+        embedding_function=sentence_transformer_mock.return_value,
+        persist_directory=str(tmp_path),
+    )
+    chroma_mock.return_value._collection.upsert.assert_called_once_with(
+        ids=["hash1-0", "hash2-0"],
+        embeddings=[[0.1], [0.2]],
+        metadatas=[splits[0].metadata, splits[1].metadata],
+        documents=["description 1", "description 2"],
+    )
+
+
+def test_chunk_id_is_deterministic():
+    row = {
+        "description": "description 1",
+        "Employment type": "type 1",
+        "Seniority level": "level 1",
+        "company": "company 1",
+        "location": "location 1",
+        "post_url": "url 1",
+        "title": "title 1",
+    }
+    doc = Document(
+        page_content="description 1",
+        metadata={"job_hash": job_hash(row), "start_index": 400},
+    )
+
+    assert chunk_id(doc) == f"{job_hash(dict(row))}-400"
+    assert job_hash(row) != job_hash({**row, "title": "title 2"})
+
+
+@patch("backend.etl.SentenceTransformerEmbeddings")
+def test_create_documents(sentence_transformer_mock):
+    descriptions = pd.DataFrame(
+        {
+            "description": ["description 1", "description 2"],
+            "Employment type": ["type 1", "type 2"],
+            "Seniority level": ["level 1", "level 2"],
+            "company": ["company 1", "company 2"],
+            "location": ["location 1", "location 2"],
+            "post_url": ["url 1", "url 2"],
+            "title": ["title 1", "title 2"],
+        },
+        index=[3, 7],
+    )
+
+    etl_processor = ETLProcessor(batch_size=32, chunk_size=500, chunk_overlap=100)
+    documents = etl_processor.create_documents(descriptions)
+
+    assert job_hashes(descriptions) == [
+        job_hash(row) for _, row in descriptions.iterrows()
+    ]
+    assert documents[1] == Document(
+        page_content="description 2",
+        metadata={
+            "employment_type": "type 2",
+            "seniority_level": "level 2",
+            "company": "company 2",
+            "location": "location 2",
+            "post_url": "url 2",
+            "title": "title 2",
+            "id": 7,
+            "job_hash": job_hash(descriptions.loc[7]),
+        },
+    )
+
+
+@patch("backend.etl.Chroma")
+@patch("backend.etl.SentenceTransformerEmbeddings")
+def test_sync_index(sentence_transformer_mock, chroma_mock):
+    vector_store_mock = chroma_mock.return_value
+    vector_store_mock.get.return_value = {
+        "ids": ["kept-0", "moved-0", "removed-0"],
+        "metadatas": [{"id": 0}, {"id": 1}, {"id": 2}],
+    }
+    splits = [
+        Document(
+            page_content="kept",
+            metadata={"id": 0, "job_hash": "kept", "start_index": 0},
+        ),
+        Document(
+            page_content="moved",
+            metadata={"id": 5, "job_hash": "moved", "start_index": 0},
+        ),
+        Document(
+            page_content="new",
+            metadata={"id": 6, "job_hash": "new", "start_index": 0},
+        ),
+    ]
+
+    etl_processor = ETLProcessor(
+        batch_size=32,
+        chunk_size=500,
+        chunk_overlap=100,
+        incremental=True,
+    )
+    new_splits = list(etl_processor.sync_index(splits))
+
+    assert new_splits == [splits[2]]
+    vector_store_mock.delete.assert_called_once_with(ids=["removed-0"])
+    vector_store_mock._collection.update.assert_called_once_with(
+        ids=["moved-0"], metadatas=[splits[1].metadata]
     )
+
+
+@patch("backend.etl.Chroma")
+@patch("backend.etl.SentenceTransformerEmbeddings")
+def test_run_etl_streaming(sentence_transformer_mock, chroma_mock, tmp_path):
+    sentence_transformer_mock.return_value.embed_documents.side_effect = (
+        lambda texts: [[0.0] for _ in texts]
+    )
+    chroma_mock.return_value._client.get_max_batch_size.return_value = 5461
+    dataset_path = tmp_path / "jobs.csv"
+    pd.DataFrame(
+        {
+            "description": [f"description {i}" for i in range(5)],
+            "Employment type": ["type", None, "type", "type", "type"],
+            "Seniority level": ["level"] * 5,
+            "company": ["company"] * 5,
+            "location": ["location"] * 5,
+            "post_url": [f"url {i}" for i in range(5)],
+            "title": ["title"] * 5,
+            "extra column": ["ignored"] * 5,
+        }
+    ).to_csv(dataset_path, index=False)
+
+    etl_processor = ETLProcessor(
+        batch_size=3,
+        chunk_size=500,
+        chunk_overlap=100,
+        dataset_path=str(dataset_path),
+        persist_directory=str(tmp_path),
+        read_chunksize=2,
+    )
+    streamed = list(
+        etl_processor.iter_splits(
+            etl_processor.iter_documents(etl_processor.iter_data())
+        )
+    )
+    loaded = etl_processor.split_documents(
+        etl_processor.create_documents(etl_processor.load_data())
+    )
+    assert streamed == loaded
+    assert [doc.metadata["id"] for doc in streamed] == [0, 2, 3, 4]
+
+    etl_processor.run_etl(limit=3)
+
+    upsert_calls = chroma_mock.return_value._collection.upsert.call_args_list
+    assert len(upsert_calls) == 1
+    assert [
+        metadata["id"] for metadata in upsert_calls[0].kwargs["metadatas"]
+    ] == [0, 2, 3]
+    lexical_index = LexicalIndex(str(tmp_path / LEXICAL_INDEX_DIR))
+    assert len(lexical_index) == 3
+    assert lexical_index.search("description 3", k=1)[0][0] == chunk_id(streamed[2])
+    metadata_index = MetadataIndex.load(str(tmp_path / METADATA_INDEX_FILE))
+    assert metadata_index.where({"employment_type": "TYPE"}) == {
+        "employment_type": {"$in": ["type"]}
+    }
+
+
+@patch("backend.etl.Chroma")
+@patch("backend.etl.SentenceTransformerEmbeddings")
+def test_run_etl_without_lexical_index(
+    sentence_transformer_mock, chroma_mock, tmp_path
+):
+    sentence_transformer_mock.return_value.embed_documents.side_effect = (
+        lambda texts: [[0.0] for _ in texts]
+    )
+    chroma_mock.return_value._client.get_max_batch_size.return_value = 5461
+    dataset_path = tmp_path / "jobs.csv"
+    pd.DataFrame(
+        {
+            "description": ["description 1"],
+            "Employment type": ["type"],
+            "Seniority level": ["level"],
+            "company": ["company"],
+            "location": ["location"],
+            "post_url": ["url"],
+            "title": ["title"],
+        }
+    ).to_csv(dataset_path, index=False)
+    # Left by an earlier run, it no longer matches the collection
+    (tmp_path / LEXICAL_INDEX_DIR).mkdir()
+
+    ETLProcessor(
+        batch_size=3,
+        chunk_size=500,
+        chunk_overlap=100,
+        dataset_path=str(dataset_path),
+        persist_directory=str(tmp_path),
+        read_chunksize=2,
+        lexical_index=False,
+    ).run_etl()
+
+    assert chroma_mock.return_value._collection.upsert.call_count == 1
+    assert not (tmp_path / LEXICAL_INDEX_DIR).exists()
+
+
+def in_thread_pool(max_workers, mp_context, initializer, initargs):
+    # Runs the embedding workers as threads so the mocks apply to them
+    initializer(*initargs)
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+@patch("backend.etl.ProcessPoolExecutor", in_thread_pool)
+@patch("backend.etl.Chroma")
+@patch("backend.etl.SentenceTransformerEmbeddings")
+def test_process_batches_parallel(sentence_transformer_mock, chroma_mock):
+    sentence_transformer_mock.return_value.embed_documents.side_effect = (
+        lambda texts: [[float(len(text))] for text in texts]
+    )
+    chroma_mock.return_value._client.get_max_batch_size.return_value = 5461
+    splits = [
+        Document(
+            page_content=f"chunk {i}",
+            metadata={"id": i, "job_hash": f"hash{i}", "start_index": 0},
+        )
+        for i in range(5)
+    ]
+
+    etl_processor = ETLProcessor(
+        batch_size=2,
+        chunk_size=500,
+        chunk_overlap=100,
+        embedding_workers=2,
+        write_batch_size=3,
+    )
+    etl_processor.process_batches_parallel(splits)
+
+    upsert_calls = chroma_mock.return_value._collection.upsert.call_args_list
+    assert [call.kwargs["ids"] for call in upsert_calls] == [
+        ["hash0-0", "hash1-0", "hash2-0"],
+        ["hash3-0", "hash4-0"],
+    ]
+    assert upsert_calls[0].kwargs["embeddings"] == [[7.0], [7.0], [7.0]]
+    assert upsert_calls[1].kwargs["documents"] == ["chunk 3", "chunk 4"]
+    chroma_mock.assert_called_once()
+    assert chroma_mock.call_args.kwargs["embedding_function"] is None
+    # Only the embedding worker loads the model, not the parent process
+    sentence_transformer_mock.assert_called_once_with(
+        model_name=etl_processor.embedding_model
+    )
+
+
+@patch("backend.etl.ProcessPoolExecutor", in_thread_pool)
+@patch("backend.etl.SentenceTransformerEmbeddings")
+def test_iter_splits_parallel(sentence_transformer_mock):
+    documents = [
+        Document(
+            page_content=" ".join(f"word{i}-{j}" for j in range(200)),
+            metadata={"id": i, "job_hash": f"hash{i}"},
+        )
+        for i in range(150)
+    ]
+
+    etl_processor = ETLProcessor(
+        batch_size=32,
+        chunk_size=500,
+        chunk_overlap=100,
+        split_workers=3,
+    )
+    splits = list(etl_processor.iter_splits(iter(documents)))
+
+    assert splits == etl_processor.split_documents(documents)
+    assert all("start_index" in doc.metadata for doc in splits)
+
+
+@patch("backend.etl.Chroma")
+@patch("backend.etl.SentenceTransformerEmbeddings")
+def test_run_etl_resume(sentence_transformer_mock, chroma_mock, tmp_path):
+    dataset_path = tmp_path / "jobs.csv"
+    pd.DataFrame(
+        {
+            "description": [f"description {i}" for i in range(5)],
+            "Employment type": ["type"] * 5,
+            "Seniority level": ["level"] * 5,
+            "company": ["company"] * 5,
+            "location": ["location"] * 5,
+            "post_url": [f"url {i}" for i in range(5)],
+            "title": ["title"] * 5,
+        }
+    ).to_csv(dataset_path, index=False)
+    checkpoint_path = tmp_path / "checkpoint.json"
+    chroma_mock.return_value._client.get_max_batch_size.return_value = 5461
+    embedded = []
+
+    def embed_documents(texts):
+        if texts == ["description 4"]:
+            raise RuntimeError("preempted")
+        embedded.extend(texts)
+        return [[0.0] for _ in texts]
+
+    sentence_transformer_mock.return_value.embed_documents.side_effect = (
+        embed_documents
+    )
+    etl_kwargs = dict(
+        batch_size=2,
+        chunk_size=500,
+        chunk_overlap=100,
+        dataset_path=str(dataset_path),
+        persist_directory=str(tmp_path),
+        checkpoint_path=str(checkpoint_path),
+        checkpoint_every=1,
+    )
+
+    with pytest.raises(RuntimeError):
+        ETLProcessor(**etl_kwargs).run_etl()
+    etl_processor = ETLProcessor(**etl_kwargs)
+    assert etl_processor.load_checkpoint()["committed_batches"] == 2
+    assert not etl_processor.load_checkpoint()["completed"]
+
+    embedded.clear()
+    sentence_transformer_mock.return_value.embed_documents.side_effect = (
+        lambda texts: embedded.extend(texts) or [[0.0] for _ in texts]
+    )
+    etl_processor.run_etl(resume=True)
+
+    assert embedded == ["description 4"]
+    assert etl_processor.load_checkpoint()["committed_batches"] == 3
+    assert etl_processor.load_checkpoint()["completed"]
+
+    with pytest.raises(ValueError):
+        ETLProcessor(**{**etl_kwargs, "chunk_size": 400}).run_etl(resume=True)
+
+
+@patch("backend.etl.SentenceTransformerEmbeddings")
+def test_load_data_snapshot(sentence_transformer_mock, tmp_path):
+    dataset_path = tmp_path / "jobs.csv"
+    snapshot_path = tmp_path / "jobs.arrow"
+    pd.DataFrame(
+        {
+            "description": [f"description {i}" for i in range(5)],
+            "Employment type": ["type", None, "type", "type", "type"],
+            "Seniority level": ["level"] * 5,
+            "company": ["company"] * 5,
+            "location": ["location"] * 5,
+            "post_url": [f"url {i}" for i in range(5)],
+            "title": ["title"] * 5,
+        }
+    ).to_csv(dataset_path, index=False)
+    etl_processor = ETLProcessor(
+        batch_size=32,
+        chunk_size=500,
+        chunk_overlap=100,
+        dataset_path=str(dataset_path),
+        read_chunksize=2,
+        snapshot_path=str(snapshot_path),
+    )
+
+    # A partially consumed stream doesn't leave a snapshot behind
+    next(etl_processor.iter_data())
+    assert not snapshot_path.exists()
+
+    from_csv = list(etl_processor.iter_documents(etl_processor.iter_data()))
+    assert snapshot_path.exists()
+
+    with patch("backend.etl.pd.read_csv") as read_csv_mock:
+        from_snapshot = list(etl_processor.iter_documents(etl_processor.iter_data()))
+        loaded = etl_processor.create_documents(etl_processor.load_data())
+        read_csv_mock.assert_not_called()
+    assert from_snapshot == from_csv
+    assert loaded == from_csv
@@ -0,0 +1,53 @@
+import pandas as pd
+
+from backend.job_store import (
+    JobStore,
+    SnapshotWriter,
+    open_snapshot,
+    snapshot_fingerprint,
+    snapshot_frame,
+)
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "jobs.arrow")
+    df = pd.DataFrame(
+        {"title": ["title 1", "title 2", "title 3"], "company": ["a", "b", "c"]},
+        index=[0, 2, 5],
+    )
+
+    snapshot = SnapshotWriter(path, ["title", "company"], {"sha256": "abc"})
+    snapshot.write(df.iloc[:2])
+    snapshot.write(df.iloc[2:])
+    snapshot.commit()
+
+    assert snapshot_fingerprint(path) == {"sha256": "abc"}
+    pd.testing.assert_frame_equal(snapshot_frame(open_snapshot(path)), df)
+
+
+def test_snapshot_abort(tmp_path):
+    path = tmp_path / "jobs.arrow"
+
+    snapshot = SnapshotWriter(str(path), ["title"], {"sha256": "abc"})
+    snapshot.write(pd.DataFrame({"title": ["title 1"]}))
+    snapshot.abort()
+
+    assert list(tmp_path.iterdir()) == []
+    assert snapshot_fingerprint(str(path)) is None
+
+
+def test_job_store(tmp_path):
+    path = str(tmp_path / "jobs.arrow")
+    snapshot = SnapshotWriter(path, ["title"], {})
+    snapshot.write(pd.DataFrame({"title": ["title 7", "title 3"]}, index=[7, 3]))
+    snapshot.commit()
+
+    job_store = JobStore(path)
+
+    assert len(job_store) == 2
+    assert job_store.get(3) == {"id": 3, "title": "title 3"}
+    assert job_store.get_many([7, 4, 10]) == [
+        {"id": 7, "title": "title 7"},
+        None,
+        None,
+    ]
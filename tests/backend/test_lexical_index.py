@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+from langchain.docstore.document import Document
+
+from backend import lexical_index as lexical_index_module
+from backend.lexical_index import (
+    LexicalIndex,
+    LexicalIndexBuilder,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+
+
+def test_tokenize():
+    assert tokenize("Senior C++ / Node.js dev, AWS-certified (ISO-27001).") == [
+        "senior",
+        "c++",
+        "node.js",
+        "dev",
+        "aws-certified",
+        "iso-27001",
+    ]
+
+
+@pytest.mark.parametrize("segment_size", [1, 2, 100])
+def test_lexical_index_search(tmp_path, segment_size):
+    # A segment of 1 or 2 chunks spills the postings to disk, merged by save
+    builder = LexicalIndexBuilder(segment_size=segment_size)
+    documents = [
+        Document(page_content="Python and Django backend", metadata={"title": "Dev"}),
+        Document(page_content="Java backend, Kubernetes", metadata={"title": "Dev"}),
+        Document(page_content="Kubernetes Kubernetes CKA", metadata={"title": "SRE"}),
+    ]
+    ids = ["a", "b", "c"]
+    indexed = list(builder.indexed(documents, lambda doc: ids.pop(0)))
+    assert indexed == documents
+
+    path = str(tmp_path / "lexical_index")
+    builder.save(path)
+    lexical_index = LexicalIndex(path)
+
+    assert len(lexical_index) == 3
+    assert list(lexical_index.chunk_ids) == ["a", "b", "c"]
+    assert [chunk_id for chunk_id, _ in lexical_index.search("kubernetes", 5)] == [
+        "c",
+        "b",
+    ]
+    # Rare terms in short chunks score highest
+    assert [chunk_id for chunk_id, _ in lexical_index.search("cka python", 1)] == [
+        "c"
+    ]
+    assert lexical_index.search("golang", 5) == []
+    assert lexical_index.search("sre", 5)[0][0] == "c"
+
+
+def test_reciprocal_rank_fusion():
+    assert reciprocal_rank_fusion([["a", "b"], ["b", "c"]], [0.5, 0.5]) == [
+        "b",
+        "a",
+        "c",
+    ]
+    assert reciprocal_rank_fusion([["a", "b"], ["b", "c"]], [1.0, 0.0])[0] == "a"
+
+
+def test_lexical_index_segments_match_in_memory_build(tmp_path):
+    texts = [f"job {i} python {'senior ' * (i % 3)}team{i % 5}" for i in range(50)]
+    for segment_size in [7, 1000]:
+        builder = LexicalIndexBuilder(segment_size=segment_size)
+        for i, text in enumerate(texts):
+            builder.add(f"chunk-{i}", text)
+        builder.save(str(tmp_path / str(segment_size)))
+
+    spilled = LexicalIndex(str(tmp_path / "7"))
+    in_memory = LexicalIndex(str(tmp_path / "1000"))
+    assert spilled.terms == in_memory.terms
+    for name in ["offsets", "chunks", "frequencies", "lengths", "chunk_ids"]:
+        assert np.array_equal(getattr(spilled, name), getattr(in_memory, name))
+
+
+def test_lexical_index_empty(tmp_path):
+    builder = LexicalIndexBuilder()
+    builder.save(str(tmp_path / "lexical_index"))
+
+    assert LexicalIndex(str(tmp_path / "lexical_index")).search("python", 5) == []
+
+
+@pytest.mark.parametrize("segment_size", [1, 2, 100])
+def test_lexical_index_skips_duplicate_ids(tmp_path, segment_size):
+    # Chunks of duplicate CSV rows, in the same segment or in later ones
+    chunks = [
+        ("a", "python backend"),
+        ("b", "java backend"),
+        ("a", "python backend"),
+        ("c", "kubernetes"),
+        ("b", "java backend"),
+    ]
+    builder = LexicalIndexBuilder(segment_size=segment_size)
+    for chunk_id, text in chunks:
+        builder.add(chunk_id, text)
+    builder.save(str(tmp_path / "duplicates"))
+    unique = LexicalIndexBuilder(segment_size=segment_size)
+    for chunk_id, text in chunks[:2] + chunks[3:4]:
+        unique.add(chunk_id, text)
+    unique.save(str(tmp_path / "unique"))
+
+    lexical_index = LexicalIndex(str(tmp_path / "duplicates"))
+    expected = LexicalIndex(str(tmp_path / "unique"))
+    assert list(lexical_index.chunk_ids) == ["a", "b", "c"]
+    for name in ["offsets", "chunks", "frequencies", "lengths"]:
+        assert np.array_equal(getattr(lexical_index, name), getattr(expected, name))
+    assert [chunk_id for chunk_id, _ in lexical_index.search("backend", 5)] == [
+        "a",
+        "b",
+    ]
+
+
+def test_lexical_index_of_empty_chunks(tmp_path):
+    builder = LexicalIndexBuilder()
+    builder.add("a", "")
+    builder.add("b", "...")
+    builder.save(str(tmp_path / "lexical_index"))
+
+    lexical_index = LexicalIndex(str(tmp_path / "lexical_index"))
+    assert lexical_index.average_length == 0
+    assert lexical_index.search("python", 5) == []
+
+
+def test_lexical_index_keeps_distinct_ids_sharing_a_hash(tmp_path, monkeypatch):
+    monkeypatch.setattr(lexical_index_module, "_id_hash", lambda chunk_id: 0)
+    builder = LexicalIndexBuilder(segment_size=2)
+    for chunk_id in ["a", "b", "a", "c"]:
+        builder.add(chunk_id, f"job {chunk_id}")
+    builder.save(str(tmp_path / "lexical_index"))
+
+    assert list(LexicalIndex(str(tmp_path / "lexical_index")).chunk_ids) == [
+        "a",
+        "b",
+        "c",
+    ]
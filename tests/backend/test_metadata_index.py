@@ -0,0 +1,50 @@
+import pytest
+
+from backend.metadata_index import MetadataIndex, exact_where, value_keys
+
+
+def test_value_keys():
+    assert value_keys("location", "Berlin, Berlin, Germany") == [
+        "berlin, berlin, germany",
+        "berlin",
+        "germany",
+    ]
+    assert value_keys("company", "Acme  Corp") == ["acme corp"]
+
+
+def test_metadata_index_where(tmp_path):
+    metadata_index = MetadataIndex()
+    metadata_index.add(
+        {
+            "location": "Berlin, Berlin, Germany",
+            "seniority_level": "Mid-Senior level",
+            "company": "Acme",
+        }
+    )
+    metadata_index.add({"location": "Munich, Bavaria, Germany", "company": "Beta"})
+
+    assert metadata_index.where({"location": "germany"}) == {
+        "location": {"$in": ["Berlin, Berlin, Germany", "Munich, Bavaria, Germany"]}
+    }
+    assert metadata_index.where(
+        {"company": ["acme", "Gamma"], "seniority_level": "mid-senior level"}
+    ) == {
+        "$and": [
+            {"company": {"$in": ["Acme"]}},
+            {"seniority_level": {"$in": ["Mid-Senior level"]}},
+        ]
+    }
+    assert metadata_index.where({"location": "Paris"}) is None
+    with pytest.raises(ValueError):
+        metadata_index.where({"description": "python"})
+
+    path = str(tmp_path / "metadata_index.json")
+    metadata_index.save(path)
+    assert MetadataIndex.load(path).values == metadata_index.values
+    assert MetadataIndex.load(str(tmp_path / "missing.json")) is None
+
+
+def test_exact_where():
+    assert exact_where({"company": "Acme"}) == {"company": {"$in": ["Acme"]}}
+    with pytest.raises(ValueError):
+        exact_where({"post_url": "url"})
@@ -0,0 +1,156 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from backend.numpy_store import (
+    NumpyCollection,
+    NumpyVectorStore,
+    export_collection,
+    where_mask,
+)
+from backend.retriever import load_vector_store
+
+
+def fake_collection(vectors, metadatas):
+    # Mimics the paging of chromadb's Collection.get
+    ids = [f"chunk-{i}" for i in range(len(vectors))]
+    documents = [f"text {i}" for i in range(len(vectors))]
+
+    def get(limit, offset, include):
+        page = slice(offset, offset + limit)
+        return {
+            "ids": ids[page],
+            "embeddings": vectors[page],
+            "documents": documents[page],
+            "metadatas": metadatas[page],
+        }
+
+    collection = MagicMock()
+    collection.count.return_value = len(vectors)
+    collection.get.side_effect = get
+    return collection
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    metadatas = [
+        {"id": i // 2, "location": "Berlin" if i % 5 else "Paris"} for i in range(50)
+    ]
+    path = str(tmp_path / "numpy_store")
+    exported = export_collection(fake_collection(vectors, metadatas), path, page_size=7)
+    assert exported == 50
+    return path, vectors
+
+
+def test_numpy_collection_query(store_path):
+    path, vectors = store_path
+    collection = NumpyCollection(path)
+    queries = vectors[[3, 10]] + 0.01
+
+    results = collection.query(query_embeddings=queries, n_results=4)
+
+    for query, ids, distances in zip(queries, results["ids"], results["distances"]):
+        exact = ((vectors - query) ** 2).sum(axis=1)
+        assert ids == [f"chunk-{i}" for i in np.argsort(exact)[:4]]
+        np.testing.assert_allclose(distances, np.sort(exact)[:4], rtol=1e-4, atol=1e-4)
+    assert results["ids"][0][0] == "chunk-3"
+    assert results["documents"][0][0] == "text 3"
+    assert results["metadatas"][0][0] == {"id": 1, "location": "Berlin"}
+
+
+def test_numpy_collection_filters(store_path):
+    path, vectors = store_path
+    collection = NumpyCollection(path)
+
+    results = collection.query(
+        query_embeddings=[vectors[3]],
+        n_results=100,
+        where={"location": {"$in": ["Paris"]}},
+    )
+    assert results["ids"][0] and all(
+        metadata["location"] == "Paris" for metadata in results["metadatas"][0]
+    )
+    assert len(results["ids"][0]) == 10
+
+    found = collection.get(
+        ids=["chunk-0", "chunk-1", "missing"], where={"location": "Berlin"}
+    )
+    assert found["ids"] == ["chunk-1"]
+    with pytest.raises(ValueError):
+        collection.get(where={"id": {"$gt": 3}})
+
+
+def test_where_mask():
+    columns = {"a": np.array(["x", "y", "z"], dtype=object), "b": np.array([1, 2, 1])}
+    where = {"$and": [{"a": {"$in": ["x", "z"]}}, {"b": 1}]}
+    assert where_mask(columns, where, 3).tolist() == [True, False, True]
+    assert where_mask(columns, {"c": "x"}, 3).tolist() == [False, False, False]
+
+
+def test_numpy_vector_store_float16(tmp_path):
+    embedding = DeterministicFakeEmbedding(size=16)
+    texts = [f"job {i}" for i in range(20)]
+    vectors = np.asarray(embedding.embed_documents(texts), dtype=np.float32)
+    path = str(tmp_path / "numpy_store")
+    export_collection(
+        fake_collection(vectors, [{"id": i} for i in range(20)]), path, dtype="float16"
+    )
+    store = NumpyVectorStore(path, embedding_function=embedding, mmap=False)
+
+    assert store._collection.embeddings.dtype == np.float16
+    documents = store.similarity_search_by_vector(vectors[7].tolist(), k=2)
+    assert documents[0].metadata == {"id": 7}
+    scored = store.similarity_search_by_vector_with_relevance_scores(
+        vectors[7].tolist(), k=1, filter={"id": {"$in": [3]}}
+    )
+    assert [document.metadata for document, _ in scored] == [{"id": 3}]
+    assert scored[0][1] > 0
+
+
+@pytest.mark.parametrize("quantization", ["int8", "pq"])
+def test_numpy_collection_quantized(tmp_path, quantization):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(300, 16)).astype(np.float32)
+    path = str(tmp_path / "numpy_store")
+    export_collection(
+        fake_collection(vectors, [{"id": i} for i in range(300)]),
+        path,
+        quantization=quantization,
+        pq_subvectors=4,
+    )
+    exact = NumpyCollection(path, shortlist=300)
+    assert exact.quantized is not None
+    assert isinstance(exact.embeddings, np.memmap)
+
+    # Re-scoring a shortlist of every chunk gives the exact results
+    queries = rng.normal(size=(5, 16)).astype(np.float32)
+    results = exact.query(query_embeddings=queries, n_results=5)
+    for query, ids, distances in zip(queries, results["ids"], results["distances"]):
+        expected = ((vectors - query) ** 2).sum(axis=1)
+        assert ids == [f"chunk-{i}" for i in np.argsort(expected)[:5]]
+        np.testing.assert_allclose(distances, np.sort(expected)[:5], rtol=1e-4)
+
+    # Filters apply before the quantized pass
+    filtered = NumpyCollection(path, shortlist=10).query(
+        query_embeddings=queries[:1], n_results=3, where={"id": {"$in": [1, 2, 3]}}
+    )
+    assert sorted(filtered["ids"][0]) == ["chunk-1", "chunk-2", "chunk-3"]
+
+
+@patch("backend.retriever.settings")
+def test_load_vector_store_numpy(settings_mock, store_path):
+    path, _ = store_path
+    settings_mock.VECTOR_BACKEND = "numpy"
+    settings_mock.CHROMA_DB_PATH = path.rsplit("/", 1)[0]
+    settings_mock.NUMPY_STORE_SHORTLIST = 100
+    embeddings = MagicMock()
+
+    vector_store = load_vector_store(embeddings)
+
+    assert isinstance(vector_store, NumpyVectorStore)
+    assert vector_store.embeddings is embeddings
+    assert vector_store._collection.count() == 50
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from backend.quantization import (
+    Int8Index,
+    ProductQuantizationIndex,
+    build_quantized_index,
+    load_quantized_index,
+    squared_norms,
+)
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(1000, 32)).astype(np.float32)
+
+
+def test_int8_index(vectors, tmp_path):
+    index = Int8Index.build(vectors)
+
+    assert index.codes.dtype == np.int8
+    assert index.nbytes < vectors.nbytes / 3
+    reconstructed = index.codes * index.scales[:, None]
+    assert np.abs(reconstructed - vectors).max() <= index.scales.max() / 2 + 1e-6
+
+    queries = vectors[:3] + 0.01
+    exact = squared_norms(vectors)[None, :] - 2 * queries @ vectors.T
+    exact += squared_norms(queries)[:, None]
+    approximate = index.distances(queries, squared_norms(vectors))
+    np.testing.assert_allclose(approximate, exact, atol=1.0)
+    rows = np.array([5, 1])
+    np.testing.assert_allclose(
+        index.distances(queries, squared_norms(vectors[rows]), rows),
+        approximate[:, rows],
+        rtol=1e-5,
+    )
+
+    index.save(str(tmp_path))
+    loaded = load_quantized_index(str(tmp_path))
+    assert isinstance(loaded, Int8Index)
+    np.testing.assert_array_equal(loaded.codes, index.codes)
+
+
+def test_int8_index_zero_vector():
+    index = Int8Index.build(np.zeros((2, 4), dtype=np.float32))
+    assert not index.codes.any()
+    assert np.isfinite(index.scales).all()
+
+
+def test_product_quantization_index(vectors, tmp_path):
+    index = ProductQuantizationIndex.build(
+        vectors, n_subvectors=8, n_centroids=16, iterations=5
+    )
+
+    assert index.codes.shape == (1000, 8)
+    assert index.centroids.shape == (8, 16, 4)
+    assert index.codes.nbytes == vectors.nbytes / 16
+
+    # The distance to a stored vector is the distance to its reconstruction
+    reconstructed = np.concatenate(
+        [index.centroids[m, index.codes[:, m]] for m in range(8)], axis=1
+    )
+    queries = vectors[:2]
+    expected = ((queries[:, None, :] - reconstructed[None]) ** 2).sum(axis=-1)
+    np.testing.assert_allclose(index.distances(queries), expected, rtol=1e-4)
+
+    index.save(str(tmp_path))
+    loaded = load_quantized_index(str(tmp_path))
+    assert isinstance(loaded, ProductQuantizationIndex)
+    np.testing.assert_array_equal(loaded.codes, index.codes)
+
+
+def test_product_quantization_errors(vectors):
+    with pytest.raises(ValueError):
+        ProductQuantizationIndex.build(vectors, n_subvectors=5)
+    with pytest.raises(ValueError):
+        ProductQuantizationIndex.build(vectors, n_subvectors=8, n_centroids=300)
+
+
+def test_build_quantized_index(vectors, tmp_path):
+    assert build_quantized_index(vectors, "none", 8) is None
+    assert isinstance(build_quantized_index(vectors, "int8", 8), Int8Index)
+    assert load_quantized_index(str(tmp_path)) is None
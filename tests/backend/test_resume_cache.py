@@ -0,0 +1,45 @@
+from backend.resume_cache import ResumeCache, file_hash
+
+
+def test_resume_cache_get_put(tmp_path):
+    cache = ResumeCache(str(tmp_path / "resumes.sqlite"), max_entries=10)
+
+    cache.put("hash", "v1", "resume text", "summary")
+
+    assert cache.get("hash", "v1") == ("resume text", "summary")
+    # Another summarizer version or PDF is a miss
+    assert cache.get("hash", "v2") is None
+    assert cache.get("other", "v1") is None
+
+    # The cache persists across instances
+    cache = ResumeCache(str(tmp_path / "resumes.sqlite"), max_entries=10)
+    assert cache.get("hash", "v1") == ("resume text", "summary")
+
+
+def test_resume_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("backend.resume_cache.time.time", lambda: now[0])
+    cache = ResumeCache(str(tmp_path / "resumes.sqlite"), max_entries=2)
+    for i in range(2):
+        now[0] += 1
+        cache.put(f"hash {i}", "v1", f"text {i}", f"summary {i}")
+    now[0] += 1
+    cache.get("hash 0", "v1")
+
+    now[0] += 1
+    cache.put("hash 2", "v1", "text 2", "summary 2")
+
+    assert len(cache) == 2
+    assert cache.get("hash 1", "v1") is None
+    assert cache.get("hash 0", "v1") == ("text 0", "summary 0")
+
+
+def test_file_hash(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(b"%PDF-1.7 resume")
+    copy = tmp_path / "copy.pdf"
+    copy.write_bytes(b"%PDF-1.7 resume")
+
+    assert file_hash(str(path), block_size=4) == file_hash(str(copy))
+    copy.write_bytes(b"%PDF-1.7 other")
+    assert file_hash(str(path)) != file_hash(str(copy))
@@ -1,19 +1,37 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
-from backend.retriever import Retriever
+import pandas as pd
+import pytest
 
+from langchain.schema.document import Document
 
-@patch("backend.retriever.load_vector_store")
-def test_retriever_search(load_vector_store_mock):
+from backend.config import settings
+from backend.job_store import SnapshotWriter, get_job_store
+from backend.metadata_index import MetadataIndex
+from backend.retriever import (
+    QueryEmbeddingCache,
+    Retriever,
+    combine_embeddings,
+    get_vector_store,
+    reset_shared_resources,
+)
+
+
+@patch("backend.retriever.get_vector_store")
+def test_retriever_search(get_vector_store_mock):
     # Mock the vector store
     vector_store_mock = MagicMock()
-    load_vector_store_mock.return_value = vector_store_mock
+    get_vector_store_mock.return_value = vector_store_mock
 
     # Create an instance of the Retriever class
-    retriever = Retriever()
+    retriever = Retriever(query_cache=QueryEmbeddingCache())
 
-    # Mock the similarity_search method of the vector store
-    vector_store_mock.similarity_search.return_value = [
+    # Mock the query embedding and the search by vector of the vector store
+    vector_store_mock.embeddings.embed_query.return_value = [0.1, 0.2]
+    vector_store_mock.similarity_search_by_vector.return_value = [
         "document1",
         "document2",
         "document3",
@@ -22,10 +40,303 @@ def test_retriever_search(load_vector_store_mock):
     # Call the search method of the Retriever class
     results = retriever.search("query", k=3)
 
-    # Assert that the similarity_search method was called with the correct arguments
-    vector_store_mock.similarity_search.assert_called_once_with(
-        query="query", k=3
+    # Assert that the search was called with the query embedding
+    vector_store_mock.similarity_search_by_vector.assert_called_once_with(
+        [0.1, 0.2], k=3, filter=None
     )
 
     # Assert that the search method returns the expected results
     assert results == ["document1", "document2", "document3"]
+
+    # A repeated query is served from the cache
+    retriever.search("  query ", k=3)
+    vector_store_mock.embeddings.embed_query.assert_called_once_with("query")
+    assert retriever.query_cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+@patch("backend.retriever.get_vector_store")
+def test_retriever_search_many(get_vector_store_mock):
+    vector_store_mock = get_vector_store_mock.return_value
+    retriever = Retriever(query_cache=QueryEmbeddingCache())
+    retriever.query_cache.put(settings.EMBEDDINGS_MODEL, "cached", [0.0])
+    vector_store_mock.embeddings.embed_documents.return_value = [[1.0], [2.0]]
+    vector_store_mock._collection.query.return_value = {
+        "documents": [["a"], ["b"], ["c"], ["d"]],
+        "metadatas": [[{"id": 1}], [None], [{"id": 3}], [{"id": 4}]],
+    }
+
+    results = retriever.search_many(["first", "cached", "second", "first "], k=1)
+
+    # Only the distinct cache misses are embedded, in a single batch
+    vector_store_mock.embeddings.embed_documents.assert_called_once_with(
+        ["first", "second"]
+    )
+    vector_store_mock._collection.query.assert_called_once_with(
+        query_embeddings=[[1.0], [0.0], [2.0], [1.0]],
+        n_results=1,
+        where=None,
+        include=["documents", "metadatas"],
+    )
+    assert [[doc.page_content for doc in docs] for docs in results] == [
+        ["a"],
+        ["b"],
+        ["c"],
+        ["d"],
+    ]
+    assert results[1][0].metadata == {}
+    assert retriever.search_many([], k=1) == []
+
+
+@patch("backend.retriever.get_vector_store")
+def test_retriever_search_filters(get_vector_store_mock):
+    vector_store_mock = get_vector_store_mock.return_value
+    vector_store_mock.embeddings.embed_query.return_value = [0.1]
+    metadata_index = MetadataIndex()
+    metadata_index.add({"location": "Berlin, Berlin, Germany", "company": "Acme"})
+    retriever = Retriever(
+        query_cache=QueryEmbeddingCache(), metadata_index=metadata_index
+    )
+
+    retriever.search("query", k=2, filters={"location": "berlin"})
+    vector_store_mock.similarity_search_by_vector.assert_called_once_with(
+        [0.1],
+        k=2,
+        filter={"location": {"$in": ["Berlin, Berlin, Germany"]}},
+    )
+
+    # Filters matching no job don't reach the vector store
+    vector_store_mock.reset_mock()
+    assert retriever.search("query", filters={"location": "Paris"}) == []
+    assert retriever.search_many(["a", "b"], filters={"company": "Other"}) == [
+        [],
+        [],
+    ]
+    vector_store_mock.similarity_search_by_vector.assert_not_called()
+    vector_store_mock._collection.query.assert_not_called()
+
+
+@patch("backend.retriever.get_vector_store")
+def test_retriever_search_jobs(get_vector_store_mock):
+    vector_store_mock = get_vector_store_mock.return_value
+    vector_store_mock.embeddings.embed_query.return_value = [0.1]
+    search_mock = vector_store_mock.similarity_search_by_vector_with_relevance_scores
+    search_mock.return_value = [
+        (Document(page_content="a1", metadata={"id": 1, "title": "A"}), 0.1),
+        (Document(page_content="b1", metadata={"id": 2, "title": "B"}), 0.2),
+        (Document(page_content="a2", metadata={"id": 1, "title": "A"}), 0.3),
+        (Document(page_content="c1", metadata={"id": 3, "title": "C"}), 0.4),
+    ]
+    retriever = Retriever(query_cache=QueryEmbeddingCache())
+
+    jobs = retriever.search_jobs("query", k=2)
+
+    search_mock.assert_called_once_with(
+        [0.1], k=2 * settings.JOB_SEARCH_FETCH_FACTOR, filter=None
+    )
+    assert [job.page_content for job in jobs] == [
+        "Title: A\nExcerpt: a1",
+        "Title: B\nExcerpt: b1",
+    ]
+    assert jobs[0].metadata == {
+        "id": 1,
+        "title": "A",
+        "score": 0.1,
+        "matched_chunks": 2,
+    }
+    assert jobs[1].metadata["matched_chunks"] == 1
+
+
+@patch("backend.retriever.get_vector_store")
+def test_retriever_search_jobs_with_context(get_vector_store_mock):
+    vector_store_mock = get_vector_store_mock.return_value
+    vector_store_mock.embeddings.embed_query.return_value = [2.0, 0.0]
+    search_mock = vector_store_mock.similarity_search_by_vector_with_relevance_scores
+    search_mock.return_value = []
+    retriever = Retriever(query_cache=QueryEmbeddingCache())
+
+    retriever.search_jobs(
+        "query", k=1, fetch_k=3, context_embedding=[0.0, 1.0], context_weight=0.5
+    )
+
+    # Only the query is embedded, the context embedding is reused
+    vector_store_mock.embeddings.embed_query.assert_called_once_with("query")
+    embedding = search_mock.call_args.args[0]
+    assert embedding == pytest.approx([0.5**0.5, 0.5**0.5])
+
+
+def test_combine_embeddings():
+    assert combine_embeddings([[3.0, 0.0], [0.0, 0.5]], [0.75, 0.25]) == (
+        pytest.approx([0.948683, 0.316228], rel=1e-5)
+    )
+    assert combine_embeddings([[1.0, 0.0], [0.0, 1.0]], [1.0, 0.0]) == [1.0, 0.0]
+
+
+@patch("backend.retriever.get_vector_store")
+def test_retriever_hybrid_search(get_vector_store_mock):
+    vector_store_mock = get_vector_store_mock.return_value
+    vector_store_mock.embeddings.embed_query.return_value = [0.1]
+    vector_store_mock._collection.query.return_value = {
+        "ids": [["v1", "both"]],
+        "documents": [["vector 1", "both"]],
+        "metadatas": [[{}, {}]],
+    }
+    # "gone" was deleted from the collection since the lexical index was built
+    vector_store_mock._collection.get.return_value = {
+        "ids": ["l1"],
+        "documents": ["lexical 1"],
+        "metadatas": [None],
+    }
+    lexical_index = MagicMock()
+    lexical_index.search.return_value = [("both", 3.0), ("gone", 2.0), ("l1", 1.0)]
+    retriever = Retriever(
+        query_cache=QueryEmbeddingCache(), lexical_index=lexical_index
+    )
+
+    results = retriever.hybrid_search("query", k=3, candidates=10)
+
+    lexical_index.search.assert_called_once_with("query", 10)
+    vector_store_mock._collection.get.assert_called_once_with(
+        ids=["gone", "l1"], where=None, include=["documents", "metadatas"]
+    )
+    assert [doc.page_content for doc in results] == ["both", "vector 1", "lexical 1"]
+
+
+@patch("backend.retriever.get_lexical_index")
+@patch("backend.retriever.get_vector_store")
+def test_retriever_hybrid_search_without_index(
+    get_vector_store_mock, get_lexical_index_mock
+):
+    get_lexical_index_mock.return_value = None
+    retriever = Retriever(query_cache=QueryEmbeddingCache())
+    retriever.search = MagicMock()
+
+    retriever.hybrid_search("query", k=2)
+
+    retriever.search.assert_called_once_with("query", k=2, filters=None)
+
+
+@patch("backend.retriever.get_vector_store")
+def test_retriever_asearch(get_vector_store_mock):
+    retriever = Retriever(query_cache=QueryEmbeddingCache())
+    main_thread = threading.get_ident()
+    search_threads = []
+
+    def search(query, k, filters):
+        search_threads.append(threading.get_ident())
+        return [query, k, filters]
+
+    retriever.search = search
+    retriever.search_jobs = lambda query, *args: ["job"]
+
+    assert asyncio.run(retriever.asearch("query", k=2)) == ["query", 2, None]
+    assert asyncio.run(retriever.asearch_jobs("query")) == ["job"]
+    retriever.embed_query = lambda query: [0.1]
+    assert asyncio.run(retriever.aembed_query("query")) == [0.1]
+    assert search_threads and search_threads[0] != main_thread
+
+
+@patch("backend.retriever.get_search_executor")
+@patch("backend.retriever.get_vector_store")
+def test_retriever_asearch_timeout(get_vector_store_mock, get_search_executor_mock):
+    # A single busy worker: the second search stays queued
+    executor = ThreadPoolExecutor(max_workers=1)
+    get_search_executor_mock.return_value = executor
+    release = threading.Event()
+    calls = []
+
+    def search(query, k, filters):
+        calls.append(query)
+        release.wait(5)
+        return [query]
+
+    retriever = Retriever(query_cache=QueryEmbeddingCache())
+    retriever.search = search
+
+    async def run():
+        blocking = asyncio.ensure_future(retriever.asearch("first", timeout=None))
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.TimeoutError):
+            await retriever.asearch("second", timeout=0.05)
+        release.set()
+        return await blocking
+
+    assert asyncio.run(run()) == ["first"]
+    executor.shutdown(wait=True)
+    # The timed out search was dropped from the queue
+    assert calls == ["first"]
+
+
+@patch("backend.retriever.get_job_store")
+@patch("backend.retriever.get_vector_store")
+def test_retriever_get_jobs(get_vector_store_mock, get_job_store_mock):
+    retriever = Retriever()
+
+    get_job_store_mock.return_value = None
+    assert retriever.get_jobs([1, 2]) == [None, None]
+
+    get_job_store_mock.return_value = MagicMock()
+    get_job_store_mock.return_value.get_many.return_value = [{"id": 1}, None]
+    assert retriever.get_jobs([1, 2]) == [{"id": 1}, None]
+    get_job_store_mock.return_value.get_many.assert_called_once_with([1, 2])
+
+
+@patch("backend.retriever.load_embeddings")
+@patch("backend.retriever.load_vector_store")
+def test_vector_store_is_shared(
+    load_vector_store_mock, load_embeddings_mock, tmp_path, monkeypatch
+):
+    def write_snapshot(title):
+        snapshot = SnapshotWriter(path, ["title"], {})
+        snapshot.write(pd.DataFrame({"title": [title]}, index=[1]))
+        snapshot.commit()
+
+    path = str(tmp_path / "jobs.arrow")
+    monkeypatch.setattr(settings, "JOBS_SNAPSHOT_PATH", path)
+    write_snapshot("old title")
+    reset_shared_resources()
+    try:
+        first, second = Retriever(), Retriever()
+
+        assert first.vector_store is second.vector_store is get_vector_store()
+        load_embeddings_mock.assert_called_once_with()
+        load_vector_store_mock.assert_called_once_with(
+            load_embeddings_mock.return_value
+        )
+        assert first.get_jobs([1]) == [{"id": 1, "title": "old title"}]
+
+        # A re-index replaces the snapshot; the reset opens the new one
+        write_snapshot("new title")
+        job_store = get_job_store()
+        reset_shared_resources()
+        assert get_job_store() is not job_store
+        assert first.get_jobs([1]) == [{"id": 1, "title": "new title"}]
+    finally:
+        reset_shared_resources()
+
+
+def test_query_embedding_cache_lru():
+    cache = QueryEmbeddingCache(max_size=2)
+    cache.put("model", "a", [1.0])
+    cache.put("model", "b", [2.0])
+    assert cache.get("model", "a") == [1.0]
+
+    # "b" is now the least recently used entry
+    cache.put("model", "c", [3.0])
+    assert cache.get("model", "b") is None
+    assert cache.get("model", "a") == [1.0]
+    assert cache.get("other-model", "a") is None
+    assert cache.stats() == {"hits": 2, "misses": 2, "size": 2}
+
+
+@patch("backend.retriever.time.monotonic")
+def test_query_embedding_cache_ttl(monotonic_mock):
+    cache = QueryEmbeddingCache(max_size=10, ttl=60)
+    monotonic_mock.return_value = 0
+    cache.put("model", "query", [1.0])
+
+    monotonic_mock.return_value = 59
+    assert cache.get("model", "query") == [1.0]
+
+    monotonic_mock.return_value = 61
+    assert cache.get("model", "query") is None
+    assert len(cache) == 0
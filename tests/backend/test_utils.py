@@ -1,9 +1,15 @@
+import asyncio
+import time
 from io import BytesIO
 
+import pytest
+
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 
-from backend.utils import extract_text_from_pdf
+from backend.config import settings
+from backend import utils
+from backend.utils import aextract_text_from_pdf, extract_text_from_pdf
 
 
 def generate_pdf_bytes():
@@ -40,3 +46,107 @@ pdf_bytes = generate_pdf_bytes()
 def test_extract_text_from_pdf():
     pdf_bytes = generate_pdf_bytes()
     assert extract_text_from_pdf(pdf_bytes).strip() == "Hello, World!"
+
+
+def generate_pages_pdf_bytes(n_pages):
+    pdf_buffer = BytesIO()
+    c = canvas.Canvas(pdf_buffer, pagesize=letter)
+    for page in range(n_pages):
+        c.drawString(100, 100, f"Page {page}.")
+        c.showPage()
+    c.save()
+    return pdf_buffer.getvalue()
+
+
+def test_extract_text_from_pdf_limits():
+    pdf_bytes = BytesIO(generate_pages_pdf_bytes(3))
+    assert extract_text_from_pdf(pdf_bytes, max_pages=2) == "Page 0.\nPage 1.\n"
+    assert extract_text_from_pdf(pdf_bytes, max_chars=10) == "Page 0.\nPa"
+
+
+def test_aextract_text_from_pdf(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PDF_PAGES_PER_TASK", 2)
+    pdf_data = generate_pages_pdf_bytes(7)
+    pdf_path = tmp_path / "resume.pdf"
+    pdf_path.write_bytes(pdf_data)
+
+    # Same text, in the same order, as the serial extraction
+    text = asyncio.run(aextract_text_from_pdf(str(pdf_path), max_pages=None))
+    assert text == extract_text_from_pdf(BytesIO(pdf_data))
+    assert asyncio.run(aextract_text_from_pdf(pdf_data, max_pages=1)) == "Page 0.\n"
+    assert asyncio.run(
+        aextract_text_from_pdf(pdf_data, max_pages=5, max_chars=34)
+    ) == "Page 0.\nPage 1.\nPage 2.\nPage 3.\nPa"
+
+
+def hang(pdf, start, end):
+    # Stands for a page that pypdf never finishes extracting
+    time.sleep(60)
+
+
+def test_aextract_text_from_pdf_timeout_replaces_workers(monkeypatch):
+    pdf_data = generate_pages_pdf_bytes(1)
+    monkeypatch.setattr(utils, "_extract_pages", hang)
+    executor = utils.get_pdf_executor()
+
+    processes = []
+
+    async def extract_hanging():
+        # As many stuck extractions as workers
+        extractions = asyncio.gather(
+            *(
+                aextract_text_from_pdf(pdf_data, timeout=1)
+                for _ in range(settings.PDF_WORKERS)
+            )
+        )
+        await asyncio.sleep(0.5)
+        processes.extend(executor._processes.values())
+        await extractions
+
+    start = time.perf_counter()
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(extract_hanging())
+    assert time.perf_counter() - start < 30
+
+    # The stuck workers are terminated, and later uploads get a new pool
+    assert processes
+    for process in processes:
+        process.join(5)
+        assert not process.is_alive()
+    assert utils.get_pdf_executor() is not executor
+    monkeypatch.undo()
+    assert asyncio.run(aextract_text_from_pdf(pdf_data, timeout=30)) == "Page 0.\n"
+
+
+extract_pages = utils._extract_pages
+
+
+def hang_on_empty_pdf(pdf, start, end):
+    # Hangs on the stuck upload, extracts the others
+    if pdf == b"":
+        time.sleep(60)
+    return extract_pages(pdf, start, end)
+
+
+def test_aextract_text_from_pdf_timeout_spares_other_extractions(monkeypatch):
+    monkeypatch.setattr(settings, "PDF_WORKERS", 1)
+    monkeypatch.setattr(settings, "PDF_PAGES_PER_TASK", 1)
+    monkeypatch.setattr(utils, "_pdf_executor", None)
+    monkeypatch.setattr(utils, "_extract_pages", hang_on_empty_pdf)
+    pdf_data = generate_pages_pdf_bytes(3)
+
+    async def extract_concurrently():
+        # The other uploads queue behind the stuck one on the single worker
+        stuck = asyncio.ensure_future(aextract_text_from_pdf(b"", timeout=2))
+        await asyncio.sleep(0)
+        others = [
+            asyncio.ensure_future(aextract_text_from_pdf(pdf_data, timeout=60))
+            for _ in range(4)
+        ]
+        with pytest.raises(asyncio.TimeoutError):
+            await stuck
+        return await asyncio.gather(*others)
+
+    # They are retried on the fresh pool rather than cancelled
+    texts = asyncio.run(extract_concurrently())
+    assert texts == ["Page 0.\nPage 1.\nPage 2.\n"] * 4